@@ -0,0 +1,64 @@
+"""
+Benchmark loading block trees from the fake Notion API with network latency.
+
+A synthetic tree of toggles is served by FakeNotion with a latency per request
+and loaded with TreeLoader at several concurrencies, reporting the wall clock
+time and the number of requests made. With --rate the fake throttles requests
+and they are sent through a Scheduler at the same rate. No network or
+workspace is needed.
+
+    python benchmarks/bench_fake_api.py --blocks 2000 --latency 0.05
+"""
+
+import asyncio
+import sys
+import time
+from argparse import ArgumentParser
+
+import httpx
+from bench_models import Generator
+from notion_client import AsyncClient
+
+from notion_data.fake_server import FakeNotion
+from notion_data.loader import TreeLoader
+from notion_data.scheduler import AsyncRateLimitTransport, Scheduler
+
+PAGE_ID = "00000000-0000-4000-8000-000000000001"
+
+
+def main(args=None) -> int:
+    parser = ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--blocks", type=int, default=1000)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--rate", type=float, default=None, help="requests/second")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    args = parser.parse_args(args)
+
+    fake = FakeNotion(latency=args.latency, rate=args.rate, burst=10)
+    fake.pages[PAGE_ID] = {"object": "page", "id": PAGE_ID, "properties": {}}
+    for block in Generator().block_tree(args.blocks):
+        fake.add(block, PAGE_ID)
+
+    for concurrency in args.concurrency:
+        fake.calls.clear()
+        client = fake.async_client()
+        if args.rate:
+            scheduler = Scheduler(rate=args.rate, burst=10)
+            transport = AsyncRateLimitTransport(scheduler, fake.async_transport())
+            client = AsyncClient(
+                client=httpx.AsyncClient(transport=transport), retry=False
+            )
+        loader = TreeLoader(client, concurrency=concurrency)
+        start = time.perf_counter()
+        asyncio.run(loader.load(PAGE_ID))
+        elapsed = time.perf_counter() - start
+        requests = sum(fake.calls.values())
+        print(
+            f"concurrency {concurrency:<4} {elapsed:8.2f} s "
+            f"{requests:6} requests {requests / elapsed:8.1f} requests/s"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,75 @@
+"""
+Memory benchmark for validating block trees with and without a LeanValidator.
+
+A synthetic tree of toggles and paragraphs is validated from json and the
+memory still allocated while the models are held is reported for both modes.
+The run exits non-zero if lean mode saves less than --min-saving of the memory.
+
+    python benchmarks/bench_memory.py
+"""
+
+import gc
+import json
+import sys
+import tracemalloc
+from argparse import ArgumentParser
+
+from bench_models import Generator
+
+from notion_data.block import Blocks
+from notion_data.lean import LeanValidator
+
+
+def _held_memory(data: bytes, lean: bool) -> int:
+    """Bytes allocated by validation that are still held by the models"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        if lean:
+            blocks = LeanValidator().validate(Blocks, data)
+        else:
+            blocks = Blocks.model_validate_json(data)
+        gc.collect()
+        held = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del blocks
+    return held
+
+
+def main(args=None) -> int:
+    parser = ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--blocks", type=int, default=10_000)
+    parser.add_argument(
+        "--min-saving",
+        type=float,
+        default=0.2,
+        help="required fractional saving of lean mode (default 0.2)",
+    )
+    args = parser.parse_args(args)
+
+    tree = Generator().block_tree(args.blocks)
+    # blocks listed from the api carry the same users and timestamps
+    sample = Generator().blocks_flat(1)[0]
+    for toggle in tree:
+        for block in [toggle, *toggle["toggle"]["children"]]:
+            for field in ("created_by", "last_edited_by", "created_time"):
+                block[field] = sample[field]
+    data = json.dumps({"results": tree}).encode()
+
+    # validate once first so that building the models is not measured
+    Blocks.model_validate_json(data)
+    normal = _held_memory(data, lean=False)
+    lean = _held_memory(data, lean=True)
+    saving = 1 - lean / normal
+    print(f"{'normal':<8} {normal / 1024:>12,.0f} KiB")
+    print(f"{'lean':<8} {lean / 1024:>12,.0f} KiB")
+    print(f"saving   {saving:>12.0%}")
+    if saving < args.min_saving:
+        print(f"REGRESSION saving below {args.min_saving:.0%}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
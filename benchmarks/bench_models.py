@@ -0,0 +1,300 @@
+"""
+Offline benchmarks for validating and serializing the notion-data models.
+
+Synthetic pages and block trees are generated at several sizes from the example
+json in tests/data. Each benchmark reports items per second for its fastest
+call and the peak memory traced while processing the largest size. The suite is
+timed in several interleaved rounds, so that a burst of load on the machine
+slows down every call of a benchmark only if it lasts the whole run, and with a
+reference workload of plain Python that measures how fast the machine is during
+the run.
+Results are compared with benchmarks/baseline.json and the run exits non-zero if
+any benchmark is slower, relative to the reference, or uses more memory than the
+baseline by more than the tolerance. Slow benchmarks are timed again before being
+reported.
+
+    python benchmarks/bench_models.py             # compare with the baseline
+    python benchmarks/bench_models.py --save      # record a new baseline
+
+Baselines are machine specific and are not committed. Record one on the machine
+that compares, from the tree before the change being measured.
+"""
+
+import copy
+import json
+import math
+import random
+import sys
+import time
+import tracemalloc
+import uuid
+from argparse import ArgumentParser
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from pydantic import TypeAdapter
+
+from notion_data.block import Block, Blocks, BlocksList
+from notion_data.dynamic import dict_model_instance
+from notion_data.page import Page, PropertyUnion
+from notion_data.root import notion_json
+
+DATA = Path(__file__).parents[1] / "tests" / "data"
+BASELINE = Path(__file__).parent / "baseline.json"
+SIZES = (10, 100, 1000)
+BLOCK_FILES = ("block", "bookmark", "code", "file", "synced_to", "table")
+# minimum time to spend timing each benchmark per round and the number of rounds
+MIN_TIME = 0.2
+ROUNDS = 5
+# the timing of a plain Python workload that scales the baseline to the machine
+REFERENCE = "reference"
+# times to re-time a slow benchmark before reporting it as a regression
+RETRIES = 2
+
+
+def _load(name: str) -> dict:
+    return json.loads((DATA / f"{name}.json").read_text())
+
+
+class Generator:
+    """Make synthetic Notion json shaped like the examples in tests/data"""
+
+    def __init__(self, seed: int = 0) -> None:
+        self.random = random.Random(seed)
+        self.page = _load("page2")
+        self.blocks = [_load(name) for name in BLOCK_FILES]
+        self.heading = _load("block")
+
+    def id(self) -> str:
+        return str(uuid.UUID(int=self.random.getrandbits(128), version=4))
+
+    def text(self) -> str:
+        return " ".join(
+            self.random.choice(("kale", "chard", "leek", "bean", "pea"))
+            for _ in range(self.random.randint(1, 12))
+        )
+
+    def pages(self, count: int) -> list[dict]:
+        pages = []
+        for _ in range(count):
+            page = copy.deepcopy(self.page)
+            page["id"] = self.id()
+            title = page["properties"]["Title"]["title"][0]
+            title["text"]["content"] = title["plain_text"] = self.text()
+            pages.append(page)
+        return pages
+
+    def blocks_flat(self, count: int) -> list[dict]:
+        blocks = []
+        for i in range(count):
+            block = copy.deepcopy(self.blocks[i % len(self.blocks)])
+            block["id"] = self.id()
+            blocks.append(block)
+        return blocks
+
+    def block_tree(self, count: int) -> list[dict]:
+        """count blocks as toggles that each hold four paragraphs"""
+        rich_text = self.heading["heading_2"]["rich_text"]
+        blocks: list[dict] = []
+        for i in range(count):
+            text = copy.deepcopy(rich_text)
+            text[0]["text"]["content"] = text[0]["plain_text"] = self.text()
+            if i % 5 == 0:
+                toggle = {
+                    "object": "block",
+                    "id": self.id(),
+                    "has_children": True,
+                    "type": "toggle",
+                    "toggle": {"rich_text": text, "children": []},
+                }
+                blocks.append(toggle)
+            else:
+                blocks[-1]["toggle"]["children"].append(
+                    {
+                        "object": "block",
+                        "id": self.id(),
+                        "type": "paragraph",
+                        "paragraph": {"rich_text": text},
+                    }
+                )
+        return blocks
+
+
+def _time(func: Callable[[], Any], count: int) -> float:
+    """Items per second for the fastest call of func, which processes count items"""
+    fastest = math.inf
+    start = time.perf_counter()
+    while True:
+        call = time.perf_counter()
+        func()
+        end = time.perf_counter()
+        fastest = min(fastest, end - call)
+        if end - start >= MIN_TIME:
+            return count / fastest
+
+
+def _peak_memory(func: Callable[[], Any]) -> int:
+    """Peak bytes allocated while calling func"""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def benchmarks(size: int, generator: Generator) -> dict[str, Callable[[], Any]]:
+    """Make the benchmark functions for one size, each processing size items"""
+    pages = generator.pages(size)
+    pages_json = [json.dumps(page).encode() for page in pages]
+    page_models = [Page.model_validate(page) for page in pages]
+    properties = TypeAdapter(dict[str, PropertyUnion])
+    page_properties = [properties.validate_python(p["properties"]) for p in pages]
+
+    blocks = generator.blocks_flat(size)
+    blocks_json = [json.dumps(block).encode() for block in blocks]
+
+    tree = generator.block_tree(size)
+    tree_json = json.dumps({"results": tree}).encode()
+    tree_model = Blocks.model_validate({"results": tree})
+    list_json = json.dumps(tree).encode()
+    list_model = BlocksList.model_validate(tree)
+
+    return {
+        "Page.validate_python": lambda: [Page.model_validate(p) for p in pages],
+        "Page.validate_json": lambda: [Page.model_validate_json(p) for p in pages_json],
+        "Page.model_dump": lambda: [
+            p.model_dump(by_alias=True, exclude_unset=True) for p in page_models
+        ],
+        "Page.notion_json": lambda: [notion_json(p) for p in page_models],
+        "dict_model_instance": lambda: [
+            dict_model_instance("properties", p) for p in page_properties
+        ],
+        "Block.validate_python": lambda: [Block.validate_python(b) for b in blocks],
+        "Block.validate_json": lambda: [Block.validate_json(b) for b in blocks_json],
+        "Blocks.validate_python": lambda: Blocks.model_validate({"results": tree}),
+        "Blocks.validate_json": lambda: Blocks.model_validate_json(tree_json),
+        "Blocks.model_dump": lambda: tree_model.model_dump(
+            by_alias=True, exclude_unset=True
+        ),
+        "BlocksList.validate_python": lambda: BlocksList.model_validate(tree),
+        "BlocksList.validate_json": lambda: BlocksList.model_validate_json(list_json),
+        "BlocksList.model_dump": lambda: list_model.model_dump(
+            by_alias=True, exclude_unset=True
+        ),
+        "BlocksList.model_dump_json": lambda: list_model.model_dump_json(
+            by_alias=True, exclude_unset=True
+        ),
+        "BlocksList.notion_json": lambda: notion_json(list_model),
+    }
+
+
+def run(only: set[str] | None = None) -> dict[str, dict[str, float]]:
+    """Time every benchmark, or just the timings named in only"""
+    generator = Generator()
+    suite = {
+        f"{name}[{size}]": (func, size)
+        for size in SIZES
+        for name, func in benchmarks(size, generator).items()
+        if only is None or f"{name}[{size}]" in only
+    }
+    page = generator.page
+    suite[REFERENCE] = (lambda: [copy.deepcopy(page) for _ in range(10)], 10)
+    rates = dict.fromkeys(suite, 0.0)
+    for _ in range(ROUNDS):
+        for name, (func, size) in suite.items():
+            rates[name] = max(rates[name], _time(func, size))
+    results: dict[str, dict[str, float]] = {}
+    for name, ops in rates.items():
+        results[name] = {"ops_per_sec": ops}
+        print(f"{name:<34} {ops:>14,.0f} ops/sec")
+    if only is not None:
+        return results
+
+    for name, (func, size) in suite.items():
+        if size == SIZES[-1] and name != REFERENCE:
+            peak = _peak_memory(func)
+            results[name]["peak_bytes"] = peak
+            print(f"{name:<34} {peak / 1024:>14,.0f} KiB peak")
+    return results
+
+
+def compare(
+    results: dict[str, dict[str, float]],
+    baseline: dict[str, dict[str, float]],
+    tolerance: float,
+) -> list[tuple[str, str]]:
+    """Name and describe every result that has regressed from the baseline"""
+    # how much faster the machine ran than when the baseline was recorded
+    speed = 1.0
+    if REFERENCE in baseline:
+        speed = results[REFERENCE]["ops_per_sec"] / baseline[REFERENCE]["ops_per_sec"]
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name, {})
+        if "ops_per_sec" in base and name != REFERENCE:
+            expected = base["ops_per_sec"] * speed
+            if result["ops_per_sec"] < expected * (1 - tolerance):
+                regressions.append(
+                    (
+                        name,
+                        f"{name}: {result['ops_per_sec']:,.0f} ops/sec, "
+                        f"baseline {expected:,.0f} at this machine speed",
+                    )
+                )
+        if "peak_bytes" in base and "peak_bytes" in result:
+            if result["peak_bytes"] > base["peak_bytes"] * (1 + tolerance):
+                regressions.append(
+                    (
+                        name,
+                        f"{name}: {result['peak_bytes']:,.0f} peak bytes, "
+                        f"baseline {base['peak_bytes']:,.0f}",
+                    )
+                )
+    return regressions
+
+
+def main(args=None) -> int:
+    parser = ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--save", action="store_true", help="record a new baseline")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.3,
+        help="allowed fractional slow down or memory growth (default 0.3)",
+    )
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    args = parser.parse_args(args)
+
+    results = run()
+    if args.save:
+        args.baseline.write_text(json.dumps(results, indent=4) + "\n")
+        print(f"saved baseline to {args.baseline}")
+        return 0
+    if not args.baseline.exists():
+        print(f"no baseline at {args.baseline}, record one with --save")
+        return 0
+
+    baseline = json.loads(args.baseline.read_text())
+    regressions = compare(results, baseline, args.tolerance)
+    for _ in range(RETRIES):
+        if not regressions:
+            break
+        print("timing the slow benchmarks again")
+        retimed = run({name for name, _ in regressions})
+        for name, result in retimed.items():
+            results[name].update(result)
+        slow = {name for name, _ in regressions}
+        regressions = [
+            regression
+            for regression in compare(results, baseline, args.tolerance)
+            if regression[0] in slow
+        ]
+    for _, regression in regressions:
+        print(f"REGRESSION {regression}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
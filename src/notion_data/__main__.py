@@ -1,14 +1,90 @@
+import os
+import sys
 from argparse import ArgumentParser
+from pathlib import Path
 
 from . import __version__
 
 __all__ = ["main"]
 
 
+def _client():
+    from notion_client import Client
+
+    return Client(auth=os.getenv("NOTION_SECRET"))
+
+
+def export(args):
+    from .ndjson import export_pages
+
+    count = export_pages(_client(), args.page_ids, args.output, args.checkpoint)
+    print(f"exported {count} records to {args.output}")
+
+
+def import_(args):
+    from .ndjson import import_pages
+
+    count = import_pages(_client(), args.input, args.parent, args.checkpoint)
+    print(f"imported {count} pages and blocks from {args.input}")
+
+
+def validate(args):
+    from .bulk import validate_dump
+
+    valid = invalid = 0
+    for result in validate_dump(args.input, args.jobs, keep_models=False):
+        if result.errors:
+            invalid += 1
+            where = "file" if args.input.is_dir() else "line"
+            print(f"{where} {result.position + 1}: {'; '.join(result.errors)}")
+        else:
+            valid += 1
+    print(f"{valid} valid, {invalid} invalid")
+    if invalid:
+        sys.exit(1)
+
+
 def main(args=None):
     parser = ArgumentParser()
     parser.add_argument("-v", "--version", action="version", version=__version__)
+    subparsers = parser.add_subparsers()
+
+    export_parser = subparsers.add_parser(
+        "export",
+        help="export pages and their blocks to ndjson, gzipped if the file ends .gz",
+    )
+    export_parser.add_argument("page_ids", nargs="+", help="ids of pages to export")
+    export_parser.add_argument("-o", "--output", type=Path, required=True)
+    export_parser.add_argument(
+        "-c", "--checkpoint", type=Path, help="file to record progress for resuming"
+    )
+    export_parser.set_defaults(func=export)
+
+    import_parser = subparsers.add_parser(
+        "import", help="recreate the pages and blocks of an ndjson export"
+    )
+    import_parser.add_argument("input", type=Path)
+    import_parser.add_argument(
+        "-p", "--parent", help="id of a page to create the pages under"
+    )
+    import_parser.add_argument(
+        "-c", "--checkpoint", type=Path, help="file to record progress for resuming"
+    )
+    import_parser.set_defaults(func=import_)
+
+    validate_parser = subparsers.add_parser(
+        "validate",
+        help="validate an ndjson export or a directory of json files in parallel",
+    )
+    validate_parser.add_argument("input", type=Path)
+    validate_parser.add_argument(
+        "-j", "--jobs", type=int, help="worker processes (default: number of CPUs)"
+    )
+    validate_parser.set_defaults(func=validate)
+
     args = parser.parse_args(args)
+    if hasattr(args, "func"):
+        args.func(args)
 
 
 # test with: python -m notion_data
@@ -11,40 +11,44 @@ https://developers.notion.com/reference/block
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Annotated, Literal, TypeAlias, Union
+from typing import Annotated, Any, Literal, TypeAlias, Union
 
 from pydantic import (
+    ConfigDict,
     Field,
+    GetCoreSchemaHandler,
     RootModel,
+    SerializationInfo,
     TypeAdapter,
     field_serializer,
     model_validator,
 )
+from pydantic_core import CoreSchema, core_schema
 
 from .enums import Color, Language
 from .file import FileUnion
 from .identify import NotionUser
 from .parent import _ParentUnion
-from .regex import ID
+from .regex import ID, NotionId
 from .rich_text import RichText, Url
-from .root import Root, format_datetime
+from .root import OPTIONAL, Root, format_datetime
 
 
 class _BlockCommon(Root):
     """A block in Notion"""
 
-    object: Literal["block"] | None = None
-    id: str | None = ID
-    parent: _ParentUnion | None = None
-    created_time: datetime | None = None
-    last_edited_time: datetime | None = None
+    object: Literal["block"] | None = OPTIONAL
+    id: NotionId | None = ID
+    parent: _ParentUnion | None = OPTIONAL
+    created_time: datetime | None = OPTIONAL
+    last_edited_time: datetime | None = OPTIONAL
 
-    created_by: NotionUser | None = None
-    last_edited_by: NotionUser | None = None
+    created_by: NotionUser | None = OPTIONAL
+    last_edited_by: NotionUser | None = OPTIONAL
     has_children: bool = False
     archived: bool = False
     in_trash: bool = False
-    request_id: str | None = ID
+    request_id: NotionId | None = ID
 
     @field_serializer("last_edited_time", "created_time")
     def validate_time(self, time: datetime, _info):
@@ -83,17 +87,18 @@ class BulletedListItem(_BlockCommon):
     class _BulletedData(Root):
         rich_text: list[RichText]
         color: Color = Color.DEFAULT
-        children: list[BlockUnion] | None = None
+        children: list[BlockUnion] | None = OPTIONAL
 
     type: Literal["bulleted_list_item"]
-    bulleted_list_item: list[RichText]
+    bulleted_list_item: _BulletedData
 
 
 class Callout(_BlockCommon):
     class _CalloutData(Root):
         rich_text: list[RichText]
-        icon: str | None = None
+        icon: str | None = OPTIONAL
         color: Color = Color.DEFAULT
+        children: list[BlockUnion] | None = OPTIONAL
 
     type: Literal["callout"]
     callout: _CalloutData
@@ -200,7 +205,7 @@ class NumberedListItem(_BlockCommon):
     class _NumberedListItemData(Root):
         rich_text: list[RichText]
         color: Color = Color.DEFAULT
-        children: list[BlockUnion] | None = None
+        children: list[BlockUnion] | None = OPTIONAL
 
     type: Literal["numbered_list_item"]
     numbered_list_item: _NumberedListItemData
@@ -210,7 +215,7 @@ class Paragraph(_BlockCommon):
     class _ParagraphData(Root):
         rich_text: list[RichText]
         color: Color = Color.DEFAULT
-        children: list[BlockUnion] | None = None
+        children: list[BlockUnion] | None = OPTIONAL
 
     type: Literal["paragraph"] = "paragraph"
     paragraph: _ParagraphData
@@ -220,7 +225,7 @@ class Quote(_BlockCommon):
     class _QuoteData(Root):
         rich_text: list[RichText]
         color: Color = Color.DEFAULT
-        children: list[BlockUnion] | None = None
+        children: list[BlockUnion] | None = OPTIONAL
 
     type: Literal["quote"]
     quote: _QuoteData
@@ -229,10 +234,10 @@ class Quote(_BlockCommon):
 class SyncedBlock(_BlockCommon):
     class _SyncedBlockData(Root):
         class _SyncedFrom(Root):
-            block_id: str = ID
+            block_id: NotionId = ID
 
         synced_from: _SyncedFrom | None
-        children: list[BlockUnion] | None = None
+        children: list[BlockUnion] | None = OPTIONAL
 
     type: Literal["synced_block"]
     synced_block: _SyncedBlockData
@@ -243,6 +248,7 @@ class Table(_BlockCommon):
         table_width: int
         has_column_header: bool
         has_row_header: bool
+        children: list[BlockUnion] | None = OPTIONAL
 
     type: Literal["table"]
     table: _TableData
@@ -261,7 +267,7 @@ class Todo(_BlockCommon):
         rich_text: list[RichText]
         checked: bool = False
         color: Color = Color.DEFAULT
-        children: list[BlockUnion] | None = None
+        children: list[BlockUnion] | None = OPTIONAL
 
     type: Literal["to_do"]
     to_do: TodoData
@@ -271,7 +277,7 @@ class Toggle(_BlockCommon):
     class _ToggleData(Root):
         rich_text: list[RichText]
         color: Color = Color.DEFAULT
-        children: list[BlockUnion] | None = None
+        children: list[BlockUnion] | None = OPTIONAL
 
     type: Literal["toggle"]
     toggle: _ToggleData
@@ -292,7 +298,56 @@ BlockUnion: TypeAlias = Annotated[  # type: ignore
 ]
 
 
-Block = TypeAdapter(BlockUnion)
+# schema construction is deferred to the first validation to speed up imports
+Block = TypeAdapter(BlockUnion, config=ConfigDict(defer_build=True))
+
+READ_ONLY_BLOCK_TYPES = {
+    "child_database",
+    "child_page",
+    "link_preview",
+    "template",
+    "unsupported",
+}
+""" Block types that are returned by the API but cannot be appended """
+
+INLINE_CHILDREN_TYPES = {"column", "column_list", "table"}
+""" Block types that the API only creates together with their children """
+
+
+def block_from_json_bytes(data: bytes | str) -> BlockUnion:
+    """
+    Validate a raw json block from the Notion API into the matching block type
+    """
+    return Block.validate_json(data)
+
+
+def get_children(block: BlockUnion) -> list[BlockUnion] | None:
+    """
+    Return the child blocks held in a block's data, or None if it has none
+    """
+    data = getattr(block, block.type)
+    if isinstance(data, dict):
+        return data.get("children")
+    return getattr(data, "children", None)
+
+
+def set_children(block: BlockUnion, children: list[BlockUnion]) -> bool:
+    """
+    Place child blocks in a block's data.
+
+    Blocks with an empty dict for data (column_list, column) take a children
+    key as in the blocks.children.append payload.
+
+    returns: False if this type of block cannot hold children
+    """
+    data = getattr(block, block.type)
+    if isinstance(data, dict):
+        data["children"] = children
+    elif "children" in type(data).model_fields:
+        data.children = children
+    else:
+        return False
+    return True
 
 
 class Blocks(Root):
@@ -301,8 +356,8 @@ class Blocks(Root):
     object: Literal["list"] = "list"
     type: Literal["block"] = "block"
     results: list[BlockUnion]
-    next_cursor: str | None = None
-    request_id: str = ID
+    next_cursor: str | None = OPTIONAL
+    request_id: NotionId = ID
     block: BlockUnion | dict = {}
     has_more: bool = False
 
@@ -310,4 +365,110 @@ class Blocks(Root):
 class BlocksList(RootModel):
     """A list of blocks to pass to api call blocks.children.append"""
 
+    model_config = ConfigDict(defer_build=True)
+
     root: list[BlockUnion]
+
+    @classmethod
+    def from_json_bytes(cls, data: bytes | str) -> BlocksList:
+        """
+        Validate a raw json list of blocks without building an intermediate list
+        """
+        return cls.model_validate_json(data)
+
+
+class LazyBlock:
+    """
+    A block that keeps its raw json and only validates it on first use.
+
+    The header fields id, type, object and has_children are read straight from
+    the raw json. Accessing any other attribute validates the whole block with
+    the Block TypeAdapter and delegates to the resulting model.
+    """
+
+    __slots__ = ("raw", "_block")
+
+    def __init__(self, raw: dict) -> None:
+        self.raw = raw
+        self._block: BlockUnion | None = None
+
+    @property
+    def id(self) -> str | None:
+        return self.raw.get("id")
+
+    @property
+    def type(self) -> str:
+        return self.raw["type"]
+
+    @property
+    def object(self) -> str | None:
+        return self.raw.get("object")
+
+    @property
+    def has_children(self) -> bool:
+        return self.raw.get("has_children", False)
+
+    @property
+    def is_validated(self) -> bool:
+        return self._block is not None
+
+    @property
+    def block(self) -> BlockUnion:
+        """The validated block model"""
+        if self._block is None:
+            self._block = Block.validate_python(self.raw)
+        return self._block
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return getattr(self.block, name)
+
+    def __repr__(self) -> str:
+        return f"LazyBlock(type={self.type!r}, id={self.id!r})"
+
+    @classmethod
+    def __get_pydantic_core_schema__(
+        cls, source: Any, handler: GetCoreSchemaHandler
+    ) -> CoreSchema:
+        return core_schema.no_info_plain_validator_function(
+            cls._validate,
+            serialization=core_schema.plain_serializer_function_ser_schema(
+                cls._serialize, info_arg=True
+            ),
+        )
+
+    @classmethod
+    def _validate(cls, value: Any) -> LazyBlock:
+        if isinstance(value, LazyBlock):
+            return value
+        if isinstance(value, _BlockCommon):
+            lazy = cls(value.model_dump(by_alias=True, exclude_unset=True))
+            lazy._block = value  # type: ignore
+            return lazy
+        if isinstance(value, dict) and "type" in value:
+            return cls(value)
+        raise ValueError("a block must be a dict with a type or a block model")
+
+    @staticmethod
+    def _serialize(value: LazyBlock, info: SerializationInfo) -> Any:
+        if value._block is None:
+            return value.raw
+        return value._block.model_dump(
+            mode=info.mode,
+            by_alias=info.by_alias,
+            exclude_unset=info.exclude_unset,
+            exclude_defaults=info.exclude_defaults,
+            exclude_none=info.exclude_none,
+        )
+
+
+class LazyBlocks(Blocks):
+    """
+    A lazy version of Blocks where results hold LazyBlock wrappers.
+
+    Useful for scanning large responses for block ids and types, as only the
+    blocks whose data is accessed pay for full validation.
+    """
+
+    results: list[LazyBlock]  # type: ignore
@@ -0,0 +1,166 @@
+"""
+Validate large json dumps into models across a pool of processes.
+
+Input is either an ndjson export, as written by ndjson.export_pages, or a
+directory of .json files each holding a page, a block or a list response from
+the API. The parent process only reads lines or lists files; parsing and
+validation happen in the workers, each of which builds its TypeAdapters once
+when it starts.
+"""
+
+import json
+import os
+from collections.abc import Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from pydantic import TypeAdapter, ValidationError
+
+from .block import Block
+from .ndjson import open_text
+from .page import Page
+
+# the number of lines or files sent to a worker at once
+CHUNK_SIZE = 500
+
+_adapters: dict[str, TypeAdapter] = {}
+
+
+class Validated(NamedTuple):
+    """The result of validating one page or block of a dump"""
+
+    # the line of the ndjson export or the number of the file in the directory
+    position: int
+    # the position in the results of a list response, otherwise 0
+    item: int
+    kind: str
+    # the model, unless it was invalid or models were not kept
+    model: Any = None
+    # a one line description of each validation error
+    errors: list[str] | None = None
+
+
+def _warm() -> None:
+    """Build the adapters for this worker process"""
+    _adapters["page"] = TypeAdapter(Page)
+    _adapters["block"] = Block
+    for adapter in _adapters.values():
+        adapter.rebuild()
+
+
+def _describe(error: ValidationError) -> list[str]:
+    return [
+        f"{'.'.join(str(item) for item in detail['loc'])}: {detail['msg']}"
+        for detail in error.errors(include_url=False)
+    ]
+
+
+def _object(value: Any) -> dict:
+    if not isinstance(value, dict):
+        raise ValueError(f"expected a json object, not {type(value).__name__}")
+    return value
+
+
+def _records(source: str | Path) -> list[tuple[str, Any]]:
+    """
+    (kind, json) for each page or block in a line of ndjson or a json file
+
+    raises: ValueError or KeyError if the source is not json of that shape
+    """
+    if isinstance(source, str):
+        record = _object(json.loads(source))
+        return [(record["kind"], record["data"])]
+    data = _object(json.loads(source.read_bytes()))
+    items = data["results"] if data.get("object") == "list" else [data]
+    if not isinstance(items, list):
+        raise ValueError("expected a list of results")
+    return [(_object(item).get("object", "block"), item) for item in items]
+
+
+def _validate_chunk(
+    chunk: list[tuple[int, str | Path]], keep_models: bool
+) -> list[Validated]:
+    if not _adapters:
+        _warm()
+    results = []
+    for position, source in chunk:
+        try:
+            records = _records(source)
+        except (ValueError, KeyError) as error:
+            results.append(
+                Validated(position, 0, "", errors=[f"invalid json: {error}"])
+            )
+            continue
+        for item, (kind, data) in enumerate(records):
+            adapter = _adapters.get(kind) if isinstance(kind, str) else None
+            if adapter is None:
+                errors = [f"unknown kind {kind!r}"]
+                results.append(Validated(position, item, kind, errors=errors))
+                continue
+            try:
+                model = adapter.validate_python(data)
+            except ValidationError as error:
+                results.append(Validated(position, item, kind, errors=_describe(error)))
+            else:
+                model = model if keep_models else None
+                results.append(Validated(position, item, kind, model))
+    return results
+
+
+def _chunks(path: Path, size: int) -> Iterator[list[tuple[int, str | Path]]]:
+    chunk: list[tuple[int, str | Path]] = []
+
+    def sources() -> Iterator[str | Path]:
+        if path.is_dir():
+            yield from sorted(path.glob("*.json"))
+        else:
+            with open_text(path, "rt") as stream:
+                yield from stream
+
+    for position, source in enumerate(sources()):
+        if isinstance(source, str) and not source.strip():
+            continue
+        chunk.append((position, source))
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _drain(pending: list[Future], ordered: bool, keep: int) -> Iterator[Validated]:
+    """Yield the results of pending chunks until at most keep are left"""
+    while len(pending) > keep:
+        if ordered:
+            yield from pending.pop(0).result()
+        else:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                pending.remove(future)
+                yield from future.result()
+
+
+def validate_dump(
+    path: Path,
+    workers: int | None = None,
+    ordered: bool = True,
+    keep_models: bool = True,
+    chunk_size: int = CHUNK_SIZE,
+) -> Iterator[Validated]:
+    """
+    Validate every page and block of a dump using a pool of worker processes.
+
+    workers defaults to the number of CPUs. With ordered the results are
+    yielded in the order of the dump, otherwise as each chunk completes.
+    Without keep_models only the errors are sent back from the workers, which
+    saves pickling every model when checking that a dump is valid.
+    """
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers, initializer=_warm) as executor:
+        pending: list[Future] = []
+        for chunk in _chunks(path, chunk_size):
+            pending.append(executor.submit(_validate_chunk, chunk, keep_models))
+            # queue a couple of chunks for each worker rather than the whole dump
+            yield from _drain(pending, ordered, 2 * workers)
+        yield from _drain(pending, ordered, 0)
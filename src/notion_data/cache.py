@@ -0,0 +1,208 @@
+"""
+A persistent local cache of pages and block trees.
+
+Entries are validated models stored as json in a SQLite database along with
+the last_edited_time of the page or block they came from. CachedReader serves
+repeat reads from the cache and only fetches a page's blocks again when the
+page's last_edited_time has changed. Notion rounds last_edited_time to the
+minute, so an edit made within a minute of the cached read may be missed
+until the page is next edited.
+"""
+
+import sqlite3
+import time
+from datetime import datetime
+from pathlib import Path
+
+from pydantic import BaseModel
+
+from .block import Block, BlocksList, BlockUnion, set_children
+from .loader import SKIP_TYPES
+from .page import Page
+from .paginate import iter_blocks
+from .regex import parse_id
+
+# the default limit on the total size of the cached json
+MAX_CACHE_BYTES = 64 * 1024 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    edited TEXT,
+    data BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    fetched REAL NOT NULL,
+    used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_used ON entries (used);
+"""
+
+
+def _edited(time: datetime | None) -> str | None:
+    return None if time is None else time.isoformat()
+
+
+class ModelCache:
+    """
+    Pages, blocks and lists of child blocks stored by id in SQLite.
+
+    When the total size of the stored json passes max_bytes the least
+    recently used entries are evicted.
+    """
+
+    def __init__(self, path: Path | str, max_bytes: int = MAX_CACHE_BYTES) -> None:
+        self.max_bytes = max_bytes
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(_SCHEMA)
+        self.size = self.connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()[0]
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def _get(self, key: str) -> tuple[bytes, str | None, float] | None:
+        row = self.connection.execute(
+            "SELECT data, edited, fetched FROM entries WHERE key = ?", (key,)
+        ).fetchone()
+        if row is not None:
+            with self.connection:
+                self.connection.execute(
+                    "UPDATE entries SET used = ? WHERE key = ?", (time.time(), key)
+                )
+        return row
+
+    def _put(self, key: str, edited: datetime | None, model: BaseModel) -> None:
+        data = model.model_dump_json(by_alias=True, exclude_unset=True).encode()
+        now = time.time()
+        with self.connection:
+            old = self.connection.execute(
+                "SELECT size FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            self.connection.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?)",
+                (key, _edited(edited), data, len(data), now, now),
+            )
+        self.size += len(data) - (old[0] if old else 0)
+        self.evict()
+
+    def edited(self, id: str) -> str | None:
+        """The last_edited_time of a cached page or block, without validating it"""
+        row = self.connection.execute(
+            "SELECT edited FROM entries WHERE key = ?", (id,)
+        ).fetchone()
+        return None if row is None else row[0]
+
+    def is_current(self, id: str, last_edited_time: datetime | None) -> bool:
+        """True if the entry for id was cached at last_edited_time"""
+        edited = self.edited(parse_id(id))
+        return edited is not None and edited == _edited(last_edited_time)
+
+    def _fresh(self, key: str, max_age: float | None) -> bytes | None:
+        row = self._get(key)
+        if row is None or (max_age is not None and time.time() - row[2] >= max_age):
+            return None
+        return row[0]
+
+    def page(self, id: str, max_age: float | None = None) -> Page | None:
+        """The cached page, if there is one cached less than max_age seconds ago"""
+        data = self._fresh(parse_id(id), max_age)
+        return None if data is None else Page.from_json_bytes(data)
+
+    def block(self, id: str, max_age: float | None = None) -> BlockUnion | None:
+        """The cached block, if there is one cached less than max_age seconds ago"""
+        data = self._fresh(parse_id(id), max_age)
+        return None if data is None else Block.validate_json(data)
+
+    def put(self, model: Page | BlockUnion) -> bool:
+        """
+        Cache a page or block.
+
+        returns: True if it was not cached at its current last_edited_time
+        """
+        if self.is_current(model.id, model.last_edited_time):  # type: ignore
+            with self.connection:
+                self.connection.execute(
+                    "UPDATE entries SET fetched = ? WHERE key = ?",
+                    (time.time(), model.id),
+                )
+            return False
+        self._put(model.id, model.last_edited_time, model)  # type: ignore
+        return True
+
+    def children(self, parent: Page | BlockUnion) -> BlocksList | None:
+        """
+        The cached child blocks of parent, if they were cached at the parent's
+        current last_edited_time
+        """
+        row = self._get(f"children/{parent.id}")
+        if row is None or row[1] != _edited(parent.last_edited_time):
+            return None
+        return BlocksList.from_json_bytes(row[0])
+
+    def put_children(self, parent: Page | BlockUnion, blocks: BlocksList) -> None:
+        """Cache the child blocks of parent as of its last_edited_time"""
+        self._put(f"children/{parent.id}", parent.last_edited_time, blocks)
+
+    def evict(self) -> int:
+        """
+        Delete the least recently used entries until the cache fits max_bytes
+
+        returns: the number of entries deleted
+        """
+        deleted = 0
+        while self.size > self.max_bytes:
+            rows = self.connection.execute(
+                "SELECT key, size FROM entries ORDER BY used LIMIT 100"
+            ).fetchall()
+            if not rows:
+                break
+            with self.connection:
+                for key, size in rows:
+                    if self.size <= self.max_bytes:
+                        break
+                    self.connection.execute("DELETE FROM entries WHERE key = ?", (key,))
+                    self.size -= size
+                    deleted += 1
+        return deleted
+
+
+class CachedReader:
+    """
+    Read pages and their block trees with a notion_client.Client, through a
+    ModelCache.
+
+    Pages read less than max_age seconds ago are served from the cache without
+    any api call. Otherwise the page is fetched and its blocks are only
+    fetched again if the page's last_edited_time has changed.
+    """
+
+    def __init__(self, client, cache: ModelCache, max_age: float = 0.0) -> None:
+        self.client = client
+        self.cache = cache
+        self.max_age = max_age
+
+    def page(self, page_id: str) -> Page:
+        """A page, fetching it if it was cached more than max_age seconds ago"""
+        page = self.cache.page(page_id, self.max_age)
+        if page is not None:
+            return page
+        page = Page(**self.client.pages.retrieve(page_id=page_id))
+        self.cache.put(page)
+        return page
+
+    def blocks(self, page_id: str) -> BlocksList:
+        """The block tree of a page, fetching it only if the page has changed"""
+        page = self.page(page_id)
+        blocks = self.cache.children(page)
+        if blocks is None:
+            blocks = BlocksList(self._tree(page.id))
+            self.cache.put_children(page, blocks)
+        return blocks
+
+    def _tree(self, block_id: str) -> list[BlockUnion]:
+        blocks = list(iter_blocks(self.client, block_id))
+        for block in blocks:
+            if block.has_children and block.type not in SKIP_TYPES:
+                set_children(block, self._tree(block.id))  # type: ignore
+        return blocks
@@ -0,0 +1,33 @@
+"""
+Notion clients that return raw json bytes for validation by the models.
+
+Use these with the from_json_bytes entry points of the models so that api
+responses are parsed straight from the socket bytes into models, e.g.
+
+    client = RawClient(auth=os.getenv("NOTION_SECRET"))
+    page = Page.from_json_bytes(client.pages.retrieve(page_id=page_id))
+"""
+
+from typing import Any
+
+from httpx import Response
+from notion_client import AsyncClient, Client
+
+
+class RawClient(Client):
+    """A notion_client.Client whose api calls return the raw response bytes"""
+
+    def _parse_response(self, response: Response) -> Any:
+        if response.is_error:
+            # let notion_client raise its usual errors
+            return super()._parse_response(response)
+        return response.content
+
+
+class AsyncRawClient(AsyncClient):
+    """A notion_client.AsyncClient whose api calls return the raw response bytes"""
+
+    def _parse_response(self, response: Response) -> Any:
+        if response.is_error:
+            return super()._parse_response(response)
+        return response.content
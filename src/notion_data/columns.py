@@ -0,0 +1,200 @@
+"""
+Extract the properties of database rows into NumPy columns for analysis.
+
+Each property of the rows becomes one column, extracted in a single pass over
+the rows:
+
+- Number: float64, NaN when empty
+- Checkbox: bool
+- Date, CreatedTime and LastEditedTime: datetime64[us] in UTC, NaT when empty;
+  for a Date this is the start of the range
+- Status: Categories, an int32 code per row indexing the names of the options,
+  -1 when empty
+- MultiSelect: MultiCategories, a bool matrix with a row per page and a column
+  per option
+- TitleClass: strings, the plain text of the title
+
+Properties of other types are left out. numpy is an optional dependency:
+pip install notion-data[numpy]
+"""
+
+from collections.abc import Callable, Iterable
+from datetime import datetime, timezone
+from typing import Any, NamedTuple
+
+try:
+    import numpy as np
+except ImportError as error:  # pragma: no cover
+    raise ImportError(
+        "notion_data.columns requires numpy: pip install notion-data[numpy]"
+    ) from error
+
+from .page import (
+    Checkbox,
+    CreatedTime,
+    Date,
+    LastEditedTime,
+    MultiSelect,
+    Number,
+    Page,
+    Status,
+    TitleClass,
+)
+
+
+class Categories(NamedTuple):
+    """A categorical column: codes index categories, -1 for an empty value"""
+
+    codes: np.ndarray
+    categories: list[str]
+
+
+class MultiCategories(NamedTuple):
+    """
+    A multi valued categorical column: members[row, i] is True when the row
+    has categories[i]
+    """
+
+    members: np.ndarray
+    categories: list[str]
+
+
+def _utc(time: datetime | None) -> datetime | None:
+    """time as a naive datetime in UTC, naive times are taken to be UTC"""
+    if time is None or time.tzinfo is None:
+        return time
+    return time.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _strings(values: list[str]) -> np.ndarray:
+    # variable width strings where numpy has them, rather than padding every
+    # title to the length of the longest
+    dtype = getattr(np.dtypes, "StringDType", None)
+    return np.array(values, dtype=dtype() if dtype else object)
+
+
+def _numbers(values: list) -> np.ndarray:
+    return np.array(
+        [np.nan if value is None else value.number for value in values],
+        dtype=np.float64,
+    )
+
+
+def _checkboxes(values: list) -> np.ndarray:
+    return np.array(
+        [value is not None and value.checkbox for value in values], dtype=np.bool_
+    )
+
+
+def _times(values: list[datetime | None]) -> np.ndarray:
+    return np.array([_utc(value) for value in values], dtype="datetime64[us]")
+
+
+def _dates(values: list) -> np.ndarray:
+    return _times([None if value is None else value.date.start for value in values])
+
+
+def _created(values: list) -> np.ndarray:
+    return _times([None if value is None else value.created_time for value in values])
+
+
+def _edited(values: list) -> np.ndarray:
+    return _times(
+        [None if value is None else value.last_edited_time for value in values]
+    )
+
+
+def _status(values: list) -> Categories:
+    names = [None if value is None else value.status.name for value in values]
+    categories = sorted({name for name in names if name is not None})
+    index = {name: code for code, name in enumerate(categories)}
+    index[None] = -1
+    return Categories(np.array([index[name] for name in names], np.int32), categories)
+
+
+def _multi_select(values: list) -> MultiCategories:
+    rows = [[] if value is None else value.multi_select for value in values]
+    categories = sorted({option.name for row in rows for option in row})
+    index = {name: code for code, name in enumerate(categories)}
+    # the (row, category) coordinate of every selected option, set in one go
+    pairs = [
+        (row, index[option.name]) for row, opts in enumerate(rows) for option in opts
+    ]
+    members = np.zeros((len(rows), len(categories)), dtype=np.bool_)
+    if pairs:
+        coordinates = np.array(pairs, dtype=np.intp)
+        members[coordinates[:, 0], coordinates[:, 1]] = True
+    return MultiCategories(members, categories)
+
+
+def _titles(values: list) -> np.ndarray:
+    return _strings(
+        [
+            ""
+            if value is None
+            else "".join(text.plain_text or "" for text in value.title)
+            for value in values
+        ]
+    )
+
+
+EXTRACTORS: dict[type, Callable[[list], Any]] = {
+    Number: _numbers,
+    Checkbox: _checkboxes,
+    Date: _dates,
+    CreatedTime: _created,
+    LastEditedTime: _edited,
+    Status: _status,
+    MultiSelect: _multi_select,
+    TitleClass: _titles,
+}
+""" The function that extracts a column for each type of property """
+
+
+def _names(properties: Any) -> dict[str, str]:
+    """Map the property names of a row to the attributes that hold them"""
+    if isinstance(properties, dict):
+        return {key: key for key in properties}
+    return {
+        field.alias or name: name
+        for name, field in type(properties).model_fields.items()
+    }
+
+
+def _value(properties: Any, attribute: str) -> Any:
+    if isinstance(properties, dict):
+        return properties.get(attribute)
+    return getattr(properties, attribute, None)
+
+
+def page_columns(
+    pages: Iterable[Page], names: Iterable[str] | None = None
+) -> dict[str, Any]:
+    """
+    Extract the properties of pages from one database into columns.
+
+    pages is a list or iterator of the database's rows. names selects the
+    properties to extract, by default all those of a supported type in the
+    first row.
+
+    returns: a dict of property name to numpy array, Categories or
+    MultiCategories, in the order of the properties of the first row
+    """
+    rows = [page.properties for page in pages]
+    if not rows:
+        return {}
+    attributes = _names(rows[0])
+    if names is not None:
+        attributes = {name: attributes[name] for name in names}
+
+    columns = {}
+    for name, attribute in attributes.items():
+        values = [_value(row, attribute) for row in rows]
+        kind = next((type(value) for value in values if value is not None), None)
+        extract = EXTRACTORS.get(kind) if kind else None
+        if extract is None:
+            if names is not None:
+                raise ValueError(f"property {name!r} has no column type")
+            continue
+        columns[name] = extract(values)
+    return columns
@@ -0,0 +1,101 @@
+"""
+Make the smallest update payloads that turn one page or block into another.
+
+https://developers.notion.com/reference/patch-page
+https://developers.notion.com/reference/update-a-block
+
+Compare a fetched model with an edited copy of it to get the arguments for
+pages.update or blocks.update. Only changed fields are sent, and properties
+and blocks that Notion computes itself are left out, e.g.
+
+    page = Page(**client.pages.retrieve(page_id=page_id))
+    edited = page.model_copy(deep=True)
+    edited.properties.Name.title[0].text.content = "New name"
+    client.pages.update(page_id=page.id, **page_update(page, edited))
+"""
+
+from typing import Any
+
+from pydantic import BaseModel
+
+from .block import READ_ONLY_BLOCK_TYPES, BlockUnion
+from .page import READ_ONLY_PROPERTY_TYPES, Page
+
+# fields outside properties and block data that an update can change
+PAGE_FIELDS = ("icon", "cover", "archived", "in_trash")
+BLOCK_FIELDS = ("archived", "in_trash")
+
+
+def _dump(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json", by_alias=True, exclude_unset=True)
+    if isinstance(value, dict):
+        return {key: _dump(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_dump(item) for item in value]
+    return value
+
+
+def _fields(old: BaseModel, new: BaseModel, names: tuple[str, ...]) -> dict:
+    return {
+        name: _dump(getattr(new, name))
+        for name in names
+        if _dump(getattr(old, name)) != _dump(getattr(new, name))
+    }
+
+
+def property_changes(old: Page, new: Page) -> dict[str, Any]:
+    """
+    The properties of new that differ from old and can be written.
+
+    returns: property json by name, without the read only property ids
+    """
+    old_properties = _dump(old.properties)
+    changes = {}
+    for name, value in _dump(new.properties).items():
+        if value.get("type") in READ_ONLY_PROPERTY_TYPES:
+            continue
+        value = {key: item for key, item in value.items() if key != "id"}
+        previous = old_properties.get(name, {})
+        if value != {key: item for key, item in previous.items() if key != "id"}:
+            changes[name] = value
+    return changes
+
+
+def page_update(old: Page, new: Page) -> dict[str, Any]:
+    """
+    The arguments for api call pages.update that turn page old into new.
+
+    Unchanged properties and fields are left out, so an unchanged page gives
+    an empty dict.
+    """
+    payload = _fields(old, new, PAGE_FIELDS)
+    properties = property_changes(old, new)
+    if properties:
+        payload["properties"] = properties
+    return payload
+
+
+def block_update(old: BlockUnion, new: BlockUnion) -> dict[str, Any]:
+    """
+    The arguments for api call blocks.update that turn block old into new.
+
+    Only the changed keys of the block's data are sent. Children are not
+    updated by blocks.update so they are ignored; use blocks.children.append
+    to add to them.
+    """
+    if old.type != new.type:
+        raise ValueError(f"cannot change a {old.type} block into a {new.type}")
+    payload = _fields(old, new, BLOCK_FIELDS)
+    if new.type in READ_ONLY_BLOCK_TYPES:
+        return payload
+
+    old_data = _dump(getattr(old, old.type))
+    data = {
+        key: value
+        for key, value in _dump(getattr(new, new.type)).items()
+        if key != "children" and old_data.get(key) != value
+    }
+    if data:
+        payload[new.type] = data
+    return payload
@@ -1,30 +1,89 @@
-from typing import Annotated
+from functools import lru_cache
+from typing import Annotated, ClassVar
 
 from pydantic import create_model
 from pydantic.fields import Field
 
+from .profile import profiled
 from .root import Root
 
+# the maximum number of distinct property schemas to keep compiled models for
+MODEL_CACHE_SIZE = 256
 
-def dict_model_instance(name: str, dict_def: dict) -> Root:
+
+def field_name(key: str) -> str:
     """
-    Because database child pages have dynamic property names, we need to create
-    a model at runtime for them
+    Convert a Notion property name into a model field name
     """
     # replace spaces as they make illegal variable names - but really we need more
     # robust handling of this as other illegal characters are possible.
-    aliased_dict = {key.replace(" ", "_"): value for key, value in dict_def.items()}
+    return key.replace(" ", "_")
+
+
+class DynamicModel(Root):
+    """
+    Base for the models created at runtime, which pickle by their schema as
+    the classes themselves cannot be imported by name
+    """
+
+    __notion_schema__: ClassVar[tuple[tuple[str, type], ...]] = ()
+
+    def __reduce__(self):
+        cls = type(self)
+        return _restore, (cls.__name__, cls.__notion_schema__, self.__getstate__())
+
+
+def _restore(name: str, schema: tuple[tuple[str, type], ...], state: dict) -> Root:
+    model = _cached_model(name, schema)
+    instance = model.__new__(model)
+    instance.__setstate__(state)
+    return instance
+
+
+@lru_cache(maxsize=MODEL_CACHE_SIZE)
+def _cached_model(name: str, schema: tuple[tuple[str, type], ...]) -> type[Root]:
+    """
+    Create a model for a property schema, a tuple of (name, type) pairs.
+
+    Pages from the same database share a schema and therefore share a model.
+    """
     fields = {
-        key: Annotated[
-            type(value),
+        field_name(key): Annotated[
+            value_type,
             Field(
                 description=key,
-                alias=key.replace("_", " "),
+                alias=key,
             ),
         ]
-        for key, value in aliased_dict.items()
+        for key, value_type in schema
     }
 
-    model = create_model(name, **fields, __base__=Root)  # type: ignore
-    instance = model(**dict_def)
+    model = create_model(name, **fields, __base__=DynamicModel)  # type: ignore
+    model.__notion_schema__ = schema
+    return model
+
+
+def dict_model_instance(name: str, dict_def: dict) -> Root:
+    """
+    Because database child pages have dynamic property names, we need to create
+    a model at runtime for them
+    """
+    schema = tuple((key, type(value)) for key, value in dict_def.items())
+    model = _cached_model(name, schema)
+    with profiled(name):
+        instance = model(**dict_def)
     return instance
+
+
+def model_cache_info():
+    """
+    Return the hits, misses, maxsize and currsize of the dynamic model cache
+    """
+    return _cached_model.cache_info()
+
+
+def model_cache_clear():
+    """
+    Discard all cached dynamic models and reset the hit/miss counters
+    """
+    _cached_model.cache_clear()
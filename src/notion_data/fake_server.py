@@ -0,0 +1,516 @@
+"""
+An in-process stand-in for the Notion API, for load tests and benchmarks.
+
+FakeNotion serves pages, blocks, databases and their children from memory,
+e.g. loaded from json files like those in tests/data. It answers the api calls
+that this package makes:
+
+- pages: retrieve, create and update
+- blocks: retrieve, update, delete, list children and append children
+- databases: retrieve and query
+- data sources: query, with filters and sorts on created_time and
+  last_edited_time as for databases
+
+Plug it into notion_client without any network through an httpx transport
+
+    fake = FakeNotion.from_folder(Path("tests/data"), latency=0.05, rate=3)
+    client = fake.client()
+    page = client.pages.retrieve(page_id=page_id)
+
+or run it as a local http server with serve() and point base_url at it.
+
+Responses follow the API's pagination (page_size up to 100 and an opaque
+next_cursor) and its errors, so notion_client raises its usual exceptions.
+Each request can be delayed by a latency, throttled by a token bucket with 429
+and Retry-After as Notion does, or failed with server errors, either at random
+with error_rate or on demand with fail_next.
+"""
+
+import asyncio
+import copy
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from collections import Counter, deque
+from collections.abc import Callable
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+
+import httpx
+from notion_client import AsyncClient, Client
+
+from .block import INLINE_CHILDREN_TYPES
+from .markdown import MAX_NESTING
+from .paginate import MAX_PAGE_SIZE
+from .regex import parse_id
+
+# the statuses chosen from for errors injected at random
+ERROR_STATUSES = (500, 502, 503)
+
+_CODES = {
+    400: "validation_error",
+    404: "object_not_found",
+    429: "rate_limited",
+    500: "internal_server_error",
+    502: "bad_gateway",
+    503: "service_unavailable",
+}
+
+_TIMESTAMPS = ("created_time", "last_edited_time")
+
+
+class ApiError(Exception):
+    """An error response of the fake api"""
+
+    def __init__(self, status: int, message: str, headers: dict | None = None):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+        self.headers = headers or {}
+
+    def response(self) -> httpx.Response:
+        body = {
+            "object": "error",
+            "status": self.status,
+            "code": _CODES.get(self.status, "internal_server_error"),
+            "message": self.message,
+        }
+        return httpx.Response(self.status, json=body, headers=self.headers)
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+
+
+def _id(value: str) -> str:
+    try:
+        return parse_id(value)
+    except ValueError as error:
+        raise ApiError(400, str(error)) from error
+
+
+class FakeNotion:
+    """
+    An in memory Notion workspace that answers api requests.
+
+    latency is the delay in seconds before each response, plus up to jitter
+    more chosen at random. rate and burst configure a token bucket of requests
+    per second, beyond which requests are answered with 429; None disables
+    rate limiting. error_rate is the fraction of requests answered with one of
+    ERROR_STATUSES. seed makes the random choices and generated ids repeatable.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        rate: float | None = None,
+        burst: int = 3,
+        error_rate: float = 0.0,
+        seed: int | None = 0,
+    ) -> None:
+        self.latency = latency
+        self.jitter = jitter
+        self.rate = rate
+        self.burst = burst
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.pages: dict[str, dict] = {}
+        self.blocks: dict[str, dict] = {}
+        self.databases: dict[str, dict] = {}
+        # the ids of the child blocks of each page or block, in order
+        self.children: dict[str, list[str]] = {}
+        # the number of requests answered for each route, e.g. "GET pages/{id}"
+        self.calls: Counter[str] = Counter()
+        self.statuses: Counter[int] = Counter()
+        self._faults: deque[int] = deque()
+        self._tokens = float(burst)
+        self._refilled = time.monotonic()
+        self._lock = threading.Lock()
+        self._routes = [
+            (
+                method,
+                re.compile(route.replace("{id}", "(?P<id>[^/]+)") + "$"),
+                route,
+                handler,
+            )
+            for method, route, handler in (
+                ("GET", "pages/{id}", self._retrieve_page),
+                ("POST", "pages", self._create_page),
+                ("PATCH", "pages/{id}", self._update_page),
+                ("GET", "blocks/{id}", self._retrieve_block),
+                ("PATCH", "blocks/{id}", self._update_block),
+                ("DELETE", "blocks/{id}", self._delete_block),
+                ("GET", "blocks/{id}/children", self._list_children),
+                ("PATCH", "blocks/{id}/children", self._append_children),
+                ("GET", "databases/{id}", self._retrieve_database),
+                ("POST", "databases/{id}/query", self._query_database),
+                ("POST", "data_sources/{id}/query", self._query_data_source),
+            )
+        ]
+
+    @classmethod
+    def from_folder(cls, folder: Path, **kwargs) -> "FakeNotion":
+        """
+        Serve the pages, blocks, databases and list responses in the json files
+        of a folder. Files holding other objects are skipped.
+        """
+        fake = cls(**kwargs)
+        for path in sorted(folder.glob("*.json")):
+            data = json.loads(path.read_text())
+            if data.get("object") in ("page", "block", "database", "list"):
+                fake.add(data)
+        return fake
+
+    def new_id(self) -> str:
+        return str(uuid.UUID(int=self.random.getrandbits(128), version=4))
+
+    def add(self, data: dict, parent: str | None = None) -> str:
+        """
+        Add the json of a page, block, database or list response.
+
+        Blocks are added as the last child of parent, by default the page or
+        block named in their parent field, and their nested children are added
+        too. Objects without an id are given one.
+
+        returns: the id of the object, or of the last object in a list
+        """
+        if data.get("object") == "list":
+            id = ""
+            for item in data["results"]:
+                id = self.add(item, parent)
+            return id
+        data = copy.deepcopy(data)
+        data["id"] = _id(data["id"]) if data.get("id") else self.new_id()
+        if data.get("object") == "page":
+            self.pages[data["id"]] = data
+        elif data.get("object") == "database":
+            self.databases[data["id"]] = data
+        else:
+            self._add_block(data, parent)
+        return data["id"]
+
+    def _add_block(self, block: dict, parent: str | None) -> None:
+        block.setdefault("object", "block")
+        if parent is None:
+            link = block.get("parent") or {}
+            parent = link.get("page_id") or link.get("block_id")
+        if parent is None:
+            raise ValueError(f"block {block['id']} has no parent")
+        parent = _id(parent)
+        kind = "block_id" if parent in self.blocks else "page_id"
+        block["parent"] = {"type": kind, kind: parent}
+        now = _now()
+        block.setdefault("created_time", now)
+        block.setdefault("last_edited_time", now)
+        data = block.get(block.get("type", ""))
+        nested = data.pop("children", None) if isinstance(data, dict) else None
+        block["has_children"] = bool(nested) or bool(self.children.get(block["id"]))
+        self.blocks[block["id"]] = block
+        self.children.setdefault(parent, []).append(block["id"])
+        if parent in self.blocks:
+            self.blocks[parent]["has_children"] = True
+        for child in nested or []:
+            self.add(child, block["id"])
+
+    def fail_next(self, status: int = 500, count: int = 1) -> None:
+        """Answer the next count requests with an error of status"""
+        self._faults.extend([status] * count)
+
+    def respond(self, request: httpx.Request) -> httpx.Response:
+        """Answer a request without the latency"""
+        path = request.url.path.split("/v1/", 1)[-1].strip("/")
+        with self._lock:
+            try:
+                self._limit()
+                route, handler, args = self._route(request.method, path)
+                self.calls[f"{request.method} {route}"] += 1
+                body = json.loads(request.content) if request.content else {}
+                params = dict(request.url.params)
+                response = httpx.Response(200, json=handler(body, params, **args))
+            except ApiError as error:
+                response = error.response()
+            self.statuses[response.status_code] += 1
+            return response
+
+    def _route(self, method: str, path: str) -> tuple[str, Callable, dict]:
+        for route_method, pattern, route, handler in self._routes:
+            match = pattern.match(path)
+            if match and method == route_method:
+                return route, handler, match.groupdict()
+        raise ApiError(404, f"no route for {method} {path}")
+
+    def _limit(self) -> None:
+        """Raise the rate limit and injected errors for this request"""
+        if self.rate is not None:
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._refilled) * self.rate
+            )
+            self._refilled = now
+            if self._tokens < 1:
+                wait = (1 - self._tokens) / self.rate
+                retry = {"retry-after": f"{wait:.3f}"}
+                raise ApiError(429, "rate limited", retry)
+            self._tokens -= 1
+        status = None
+        if self._faults:
+            status = self._faults.popleft()
+        elif self.error_rate and self.random.random() < self.error_rate:
+            status = self.random.choice(ERROR_STATUSES)
+        if status is not None:
+            headers = {"retry-after": "0"} if status == 429 else None
+            raise ApiError(status, "injected error", headers)
+
+    def _delay(self) -> float:
+        return self.latency + (
+            self.random.uniform(0, self.jitter) if self.jitter else 0
+        )
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        """Answer a request after the latency, an httpx.MockTransport handler"""
+        time.sleep(self._delay())
+        return self.respond(request)
+
+    async def handle_async(self, request: httpx.Request) -> httpx.Response:
+        """Async version of handle that awaits the latency"""
+        await asyncio.sleep(self._delay())
+        return self.respond(request)
+
+    def transport(self) -> httpx.MockTransport:
+        """An httpx transport that sends requests to this workspace"""
+        return httpx.MockTransport(self.handle)
+
+    def async_transport(self) -> httpx.MockTransport:
+        """An httpx transport for async clients"""
+        return httpx.MockTransport(self.handle_async)
+
+    def client(self, **options) -> Client:
+        """
+        A notion_client.Client for this workspace, options are passed to the
+        client e.g. retry=False
+        """
+        return Client(client=httpx.Client(transport=self.transport()), **options)
+
+    def async_client(self, **options) -> AsyncClient:
+        """A notion_client.AsyncClient for this workspace"""
+        transport = self.async_transport()
+        return AsyncClient(client=httpx.AsyncClient(transport=transport), **options)
+
+    def serve(self, host: str = "127.0.0.1", port: int = 0) -> ThreadingHTTPServer:
+        """
+        Serve this workspace over http from a background thread.
+
+        Pass base_url=f"http://{host}:{server.server_port}" to a notion_client
+        and call server.shutdown() when done.
+        """
+        server = ThreadingHTTPServer((host, port), _handler(self))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+    # handlers of the api routes, returning the json of a response
+
+    def _page(self, id: str) -> dict:
+        page = self.pages.get(_id(id))
+        if page is None:
+            raise ApiError(404, f"Could not find page with ID: {id}.")
+        return page
+
+    def _block(self, id: str) -> dict:
+        block = self.blocks.get(_id(id))
+        if block is None:
+            raise ApiError(404, f"Could not find block with ID: {id}.")
+        return block
+
+    def _paginate(self, ids: list, params: dict, type: str) -> dict:
+        page_size = int(params.get("page_size") or MAX_PAGE_SIZE)
+        if not 0 < page_size <= MAX_PAGE_SIZE:
+            raise ApiError(400, f"page_size should be at most {MAX_PAGE_SIZE}")
+        try:
+            start = int(params.get("start_cursor") or 0)
+        except ValueError as error:
+            raise ApiError(400, "start_cursor is not valid") from error
+        end = start + page_size
+        return {
+            "object": "list",
+            "results": ids[start:end],
+            "next_cursor": str(end) if end < len(ids) else None,
+            "has_more": end < len(ids),
+            "type": type,
+            type: {},
+            "request_id": self.new_id(),
+        }
+
+    def _retrieve_page(self, body: dict, params: dict, id: str) -> dict:
+        return self._page(id)
+
+    def _create_page(self, body: dict, params: dict) -> dict:
+        children = body.pop("children", [])
+        now = _now()
+        page = {
+            "object": "page",
+            "created_time": now,
+            "last_edited_time": now,
+            "archived": False,
+            "in_trash": False,
+            "properties": {},
+            **body,
+        }
+        id = self.add(page)
+        for child in children:
+            self.add(child, id)
+        return self.pages[id]
+
+    def _update_page(self, body: dict, params: dict, id: str) -> dict:
+        page = self._page(id)
+        page["properties"] = {**page["properties"], **body.pop("properties", {})}
+        page.update(body, last_edited_time=_now())
+        return page
+
+    def _retrieve_block(self, body: dict, params: dict, id: str) -> dict:
+        return self._block(id)
+
+    def _update_block(self, body: dict, params: dict, id: str) -> dict:
+        block = self._block(id)
+        block.update(body, last_edited_time=_now())
+        return block
+
+    def _delete_block(self, body: dict, params: dict, id: str) -> dict:
+        block = self._block(id)
+        block.update(archived=True, in_trash=True, last_edited_time=_now())
+        return block
+
+    def _list_children(self, body: dict, params: dict, id: str) -> dict:
+        id = _id(id)
+        if id not in self.children and id not in self.blocks and id not in self.pages:
+            raise ApiError(404, f"Could not find block with ID: {id}.")
+        live = [
+            self.blocks[child]
+            for child in self.children.get(id, [])
+            if not self.blocks[child].get("in_trash")
+        ]
+        return self._paginate(live, params, "block")
+
+    def _append_children(self, body: dict, params: dict, id: str) -> dict:
+        id = _id(id)
+        if id not in self.blocks and id not in self.pages:
+            raise ApiError(404, f"Could not find block with ID: {id}.")
+        children = body.get("children") or []
+        _check_children(children)
+        added = [self.blocks[self.add(child, id)] for child in children]
+        return self._paginate(added, {}, "block")
+
+    def _retrieve_database(self, body: dict, params: dict, id: str) -> dict:
+        database = self.databases.get(_id(id))
+        if database is None:
+            raise ApiError(404, f"Could not find database with ID: {id}.")
+        return database
+
+    def _query_database(self, body: dict, params: dict, id: str) -> dict:
+        return self._query(body, id, "database_id", "page_or_database")
+
+    def _query_data_source(self, body: dict, params: dict, id: str) -> dict:
+        return self._query(body, id, "data_source_id", "page_or_data_source")
+
+    def _query(self, body: dict, id: str, key: str, type: str) -> dict:
+        id = _id(id)
+        rows = [
+            page
+            for page in self.pages.values()
+            if _parent(page, key) == id and not page.get("in_trash")
+        ]
+        if body.get("filter"):
+            rows = [page for page in rows if _matches(page, body["filter"])]
+        for sort in reversed(body.get("sorts") or []):
+            if sort.get("timestamp") not in _TIMESTAMPS:
+                raise ApiError(400, "the fake api only sorts by timestamp")
+            rows.sort(
+                key=lambda page: page[sort["timestamp"]],
+                reverse=sort.get("direction") == "descending",
+            )
+        return self._paginate(rows, body, type)
+
+
+def _check_children(children: list[dict], depth: int = 0) -> None:
+    """Reject children that the API would not append"""
+    if len(children) > MAX_PAGE_SIZE:
+        raise ApiError(400, f"children should have at most {MAX_PAGE_SIZE} items")
+    for child in children:
+        type = child.get("type", "")
+        data = child.get(type)
+        nested = data.get("children") if isinstance(data, dict) else None
+        if nested:
+            if depth >= MAX_NESTING:
+                raise ApiError(400, "children can be nested at most two levels deep")
+            _check_children(nested, depth + 1)
+        elif type in INLINE_CHILDREN_TYPES:
+            raise ApiError(400, f"a {type} block must be created with its children")
+
+
+def _parent(page: dict, key: str) -> str | None:
+    """The id of the database or data source of a page, named by key"""
+    parent = page.get("parent") or {}
+    # pages from API versions before data sources only name their database
+    parent_id = parent.get(key) or parent.get("database_id")
+    return None if parent_id is None else _id(parent_id)
+
+
+def _matches(page: dict, filter: dict) -> bool:
+    """Whether a page matches a timestamp filter or a compound of them"""
+    if "and" in filter:
+        return all(_matches(page, part) for part in filter["and"])
+    if "or" in filter:
+        return any(_matches(page, part) for part in filter["or"])
+    timestamp = filter.get("timestamp")
+    if timestamp not in _TIMESTAMPS:
+        raise ApiError(400, "the fake api only filters by timestamp")
+    value = datetime.fromisoformat(page[timestamp].replace("Z", "+00:00"))
+    for condition, bound in filter[timestamp].items():
+        bound = datetime.fromisoformat(bound.replace("Z", "+00:00"))
+        if bound.tzinfo is None:
+            bound = bound.replace(tzinfo=timezone.utc)
+        compare = {
+            "equals": value == bound,
+            "before": value < bound,
+            "after": value > bound,
+            "on_or_before": value <= bound,
+            "on_or_after": value >= bound,
+        }
+        if condition not in compare:
+            raise ApiError(400, f"unsupported condition {condition}")
+        if not compare[condition]:
+            return False
+    return True
+
+
+def _handler(fake: FakeNotion) -> type[BaseHTTPRequestHandler]:
+    """A request handler class for http.server that answers from fake"""
+
+    class Handler(BaseHTTPRequestHandler):
+        def _answer(self) -> None:
+            length = int(self.headers.get("content-length") or 0)
+            request = httpx.Request(
+                self.command,
+                f"http://{self.headers.get('host', 'localhost')}{self.path}",
+                content=self.rfile.read(length),
+            )
+            response = fake.handle(request)
+            self.send_response(response.status_code)
+            for name, value in response.headers.items():
+                if name.lower() != "content-length":
+                    self.send_header(name, value)
+            self.send_header("content-length", str(len(response.content)))
+            self.end_headers()
+            self.wfile.write(response.content)
+
+        do_GET = do_POST = do_PATCH = do_DELETE = _answer
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+    return Handler
@@ -10,12 +10,12 @@ from typing import Annotated, Literal, TypeAlias, Union
 from pydantic import Field
 
 from .rich_text import RichText
-from .root import Root
+from .root import OPTIONAL, Root
 
 
 class _FileCommon(Root):
-    caption: list[RichText] | None = None
-    name: str | None = None
+    caption: list[RichText] | None = OPTIONAL
+    name: str | None = OPTIONAL
 
 
 class FileUrl(_FileCommon):
@@ -4,7 +4,7 @@ Classes for identifying data in Notion.
 
 from typing import Literal
 
-from .regex import ID
+from .regex import ID, NotionId
 from .root import Root
 
 
@@ -12,4 +12,4 @@ class NotionUser(Root):
     """A Notion user object"""
 
     object: Literal["user"] = "user"
-    id: str = ID
+    id: NotionId = ID
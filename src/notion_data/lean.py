@@ -0,0 +1,124 @@
+"""
+Validate models with less memory, for holding large workspaces in memory.
+
+A LeanValidator prepares the json before validating it so that objects that
+repeat across a workspace are shared instead of copied into every model:
+
+- rich text with the same annotations shares one frozen Annotations, so
+  the usual all default annotations are held once
+- plain_text shares the string of the text content it duplicates
+- the users that created and last edited blocks and pages, and timestamps,
+  are shared between all the blocks and pages that reference them
+- ids of objects, parents and users are shared, so trees that reference
+  the same parents and users many times hold one copy of each id
+- link urls and hrefs are interned
+
+The shared Annotations and users are frozen, so assigning to them raises an
+error; replace them with a new model instead. Objects are only shared between
+models validated by the same LeanValidator.
+
+Preparing the json costs time, so validation is slower than validating with
+the models directly; normal validation is unchanged.
+"""
+
+import json
+import sys
+from datetime import datetime
+from typing import Any
+
+from pydantic import ConfigDict, TypeAdapter
+
+from .identify import NotionUser
+from .rich_text import Annotations
+
+_datetime = TypeAdapter(datetime)
+
+USER_FIELDS = ("created_by", "last_edited_by")
+# the objects whose USER_FIELDS are NotionUser, unlike page properties of the
+# same names, which hold a page.User
+USER_OBJECTS = ("block", "page")
+TIME_FIELDS = ("created_time", "last_edited_time")
+ID_FIELDS = ("id", "page_id", "block_id", "database_id", "data_source_id")
+
+
+class _SharedAnnotations(Annotations):
+    """Annotations shared by many rich text objects"""
+
+    model_config = ConfigDict(frozen=True)
+
+
+class _SharedUser(NotionUser):
+    """A user shared by the blocks and pages that reference it"""
+
+    model_config = ConfigDict(frozen=True)
+
+
+class LeanValidator:
+    """
+    Validate json into models, sharing repeated values between the models
+    """
+
+    def __init__(self):
+        self._shared: dict[tuple, Any] = {}
+        self._adapters: dict[Any, TypeAdapter] = {}
+
+    def validate(self, model: Any, data: Any) -> Any:
+        """
+        Validate data with model, a TypeAdapter or any type a TypeAdapter
+        accepts. data is json text or the json already parsed.
+        """
+        if isinstance(data, (str, bytes, bytearray)):
+            data = json.loads(data)
+        data = self.share(data)
+        if isinstance(model, TypeAdapter):
+            return model.validate_python(data)
+        if model not in self._adapters:
+            self._adapters[model] = TypeAdapter(model)
+        return self._adapters[model].validate_python(data)
+
+    def share(self, data: Any) -> Any:
+        """A copy of parsed json with repeated values replaced by shared objects"""
+        if type(data) is list:
+            return [self.share(item) for item in data]
+        if type(data) is dict:
+            return self._share_object({k: self.share(v) for k, v in data.items()})
+        return data
+
+    def _get(self, key: tuple, make, *args, **kwargs) -> Any:
+        shared = self._shared.get(key)
+        if shared is None:
+            shared = self._shared[key] = make(*args, **kwargs)
+        return shared
+
+    def _share_object(self, data: dict) -> dict:
+        for name in ID_FIELDS:
+            id = data.get(name)
+            if type(id) is str:
+                data[name] = self._shared.setdefault(("id", id), id)
+        annotations = data.get("annotations")
+        if type(annotations) is dict:
+            styles = tuple(annotations.items())
+            data["annotations"] = self._get(
+                ("annotations", styles), _SharedAnnotations, **annotations
+            )
+        if data.get("object") in USER_OBJECTS:
+            for name in USER_FIELDS:
+                user = data.get(name)
+                if type(user) is dict and user.keys() <= {"object", "id"}:
+                    user_id = user.get("id")
+                    data[name] = self._get(("user", user_id), _SharedUser, **user)
+        for name in TIME_FIELDS:
+            time = data.get(name)
+            if type(time) is str:
+                data[name] = self._get(("time", time), _datetime.validate_python, time)
+        href = data.get("href")
+        if type(href) is str:
+            data["href"] = sys.intern(href)
+        text = data.get("text")
+        if type(text) is dict and "plain_text" in data:
+            if data["plain_text"] == text.get("content"):
+                data["plain_text"] = text["content"]
+        link = data.get("link")
+        if type(link) is dict and type(link.get("url")) is str:
+            link["url"] = sys.intern(link["url"])
+        return data
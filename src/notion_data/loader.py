@@ -0,0 +1,137 @@
+"""
+Load a whole tree of blocks by following has_children.
+
+https://developers.notion.com/reference/get-block-children
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+
+from .block import BlockUnion, get_children, set_children
+from .paginate import MAX_PAGE_SIZE, aiter_blocks
+from .tree import BlockTree
+
+# blocks whose children are the content of another page or database
+SKIP_TYPES = {"child_page", "child_database"}
+
+
+def synced_source(block: BlockUnion) -> str | None:
+    """
+    The id of the original block holding the content of a synced block, or
+    None for other blocks
+    """
+    if block.type != "synced_block":
+        return None
+    synced_from = block.synced_block.synced_from
+    return block.id if synced_from is None else synced_from.block_id
+
+
+@dataclass
+class LevelTiming:
+    """Timing of the blocks.children.list calls made at one depth of a tree"""
+
+    calls: int = 0
+    blocks: int = 0
+    start: float = 0.0
+    end: float = 0.0
+
+    @property
+    def seconds(self) -> float:
+        """Wall clock time from the first call starting to the last one ending"""
+        return self.end - self.start
+
+
+class TreeLoader:
+    """
+    Fetch a block tree with an asyncio notion_client.AsyncClient.
+
+    The subtrees of sibling blocks are fetched concurrently, with at most
+    concurrency blocks.children.list walks in flight at once. Fetched children
+    are placed in the children field of their parent block's data.
+
+    The content of a synced block is fetched once for each original block, by
+    the first reference to it or the original itself, and every other
+    reference waits for that fetch. All of them then share the same list of
+    child blocks, so a change to one is seen through all of them.
+    """
+
+    def __init__(
+        self, client, concurrency: int = 8, page_size: int = MAX_PAGE_SIZE
+    ) -> None:
+        self.client = client
+        self.concurrency = concurrency
+        self.page_size = page_size
+        self.timings: dict[int, LevelTiming] = {}
+        # the fetch of the content of each original synced block
+        self._synced: dict[str, asyncio.Future] = {}
+
+    async def load(self, block_id: str) -> list[BlockUnion]:
+        """
+        Fetch all the descendants of a block or page.
+
+        timings is reset and then filled in with a LevelTiming per depth,
+        where the direct children of block_id are depth 0.
+
+        returns: the direct children of block_id
+        """
+        self.timings = {}
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._synced = {}
+        return await self._load(block_id, 0)
+
+    async def resolve_synced(self, blocks: list[BlockUnion]) -> int:
+        """
+        Fetch the content of the synced block references in a tree that has
+        none, e.g. a tree read from a cache, sharing it between references.
+
+        returns: the number of original blocks fetched
+        """
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._synced = {}
+        missing = [
+            block
+            for block in BlockTree(blocks).of_type("synced_block")
+            if get_children(block) is None
+        ]
+        await asyncio.gather(*(self._load_children(block, 0) for block in missing))
+        return len(self._synced)
+
+    async def _load(self, block_id: str, depth: int) -> list[BlockUnion]:
+        async with self._semaphore:
+            start = time.perf_counter()
+            children = [
+                block
+                async for block in aiter_blocks(self.client, block_id, self.page_size)
+            ]
+            self._record(depth, start, len(children))
+
+        await asyncio.gather(
+            *(
+                self._load_children(block, depth + 1)
+                for block in children
+                if block.has_children and block.type not in SKIP_TYPES
+            )
+        )
+        return children
+
+    async def _load_children(self, block: BlockUnion, depth: int) -> None:
+        source = synced_source(block)
+        if source is None:
+            children = await self._load(block.id, depth)
+        else:
+            task = self._synced.get(source)
+            if task is None:
+                task = asyncio.ensure_future(self._load(source, depth))
+                self._synced[source] = task
+            children = await task
+        set_children(block, children)
+
+    def _record(self, depth: int, start: float, blocks: int) -> None:
+        timing = self.timings.get(depth)
+        if timing is None:
+            timing = self.timings[depth] = LevelTiming(start=start)
+        timing.calls += 1
+        timing.blocks += blocks
+        timing.start = min(timing.start, start)
+        timing.end = max(timing.end, time.perf_counter())
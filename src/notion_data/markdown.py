@@ -0,0 +1,362 @@
+"""
+Compile Markdown into blocks and upload them with the fewest append calls.
+
+https://developers.notion.com/reference/patch-block-children
+
+Notion limits a blocks.children.append request to 100 blocks in any children
+array, two levels of nesting and 1000 blocks in total, and each rich text run
+to 2000 characters. plan_batches packs blocks into requests within those
+limits, deferring the children of any block whose subtree does not fit so that
+they can be appended once the block has been created.
+"""
+
+import asyncio
+import re
+from collections.abc import Iterator
+from typing import Any, NamedTuple
+
+from .block import Block, BlocksList, BlockUnion, get_children
+from .enums import Language
+from .root import notion_dict
+
+MAX_CHILDREN = 100
+MAX_NESTING = 2
+MAX_BLOCKS = 1000
+MAX_TEXT = 2000
+
+_LANGUAGES = {language.value for language in Language}
+_LANGUAGE_ALIASES = {
+    "": "plain text",
+    "js": "javascript",
+    "py": "python",
+    "sh": "shell",
+    "ts": "typescript",
+    "yml": "yaml",
+}
+
+# emphasis must not have whitespace just inside its delimiters, and _ does not
+# emphasise within a word, so "2 * 3 * 4" and "my_var_name" are plain text
+_INLINE = re.compile(
+    r"\*\*(?P<bold>[^\s*](?:.*?[^\s*])?)\*\*"
+    r"|~~(?P<strikethrough>.+?)~~"
+    r"|`(?P<code>[^`]+)`"
+    r"|\[(?P<link>[^\]]+)\]\((?P<url>[^)\s]+)\)"
+    r"|\*(?P<italic>[^\s*](?:[^*]*[^\s*])?)\*"
+    r"|(?<!\w)_(?P<underscore>[^\s_](?:[^_]*[^\s_])?)_(?!\w)"
+)
+_LIST_ITEM = re.compile(r"(?P<indent> *)(?P<marker>[-*+]|\d+[.)]) (?P<text>.*)")
+_TODO = re.compile(r"\[(?P<check>[ xX])\] (?P<text>.*)")
+_HEADING = re.compile(r"(?P<hashes>#{1,6}) (?P<text>.*)")
+_DIVIDER = re.compile(r"(\*{3,}|-{3,}|_{3,})\s*")
+_TABLE_DELIMITER = re.compile(r"\|?(\s*:?-+:?\s*\|)*\s*:?-+:?\s*\|?")
+# a cell boundary is a | that is not escaped as \|
+_TABLE_CELL = re.compile(r"(?<!\\)\|")
+
+
+def _text(content: str, link: str | None = None, **annotations) -> list[dict]:
+    """Rich text json for content, split into runs of at most MAX_TEXT"""
+    runs = []
+    for start in range(0, max(len(content), 1), MAX_TEXT):
+        run: dict[str, Any] = {
+            "type": "text",
+            "text": {"content": content[start : start + MAX_TEXT]},
+        }
+        if link:
+            run["text"]["link"] = {"url": link}
+        if annotations:
+            run["annotations"] = annotations
+        runs.append(run)
+    return runs
+
+
+def parse_inline(text: str) -> list[dict]:
+    """
+    Parse bold, italic, strikethrough, code and links into rich text json
+    """
+    rich_text: list[dict] = []
+    position = 0
+    for match in _INLINE.finditer(text):
+        if match.start() > position:
+            rich_text += _text(text[position : match.start()])
+        kind = match.lastgroup
+        if kind == "url":
+            rich_text += _text(match["link"], link=match["url"])
+        elif kind == "underscore":
+            rich_text += _text(match[kind], italic=True)
+        else:
+            rich_text += _text(match[kind], **{kind: True})  # type: ignore
+        position = match.end()
+    if position < len(text) or not rich_text:
+        rich_text += _text(text[position:])
+    return rich_text
+
+
+def _block(kind: str, text: str | None = None, **data) -> dict:
+    if text is not None:
+        data["rich_text"] = parse_inline(text)
+    return {"type": kind, kind: data}
+
+
+def _cells(row: str) -> list[str]:
+    """The cell text of a table row with leading and trailing pipes"""
+    row = row.removeprefix("|")
+    if row.endswith("|") and not row.endswith("\\|"):
+        row = row[:-1]
+    return [cell.strip().replace("\\|", "|") for cell in _TABLE_CELL.split(row)]
+
+
+def _table(rows: list[str]) -> dict:
+    """A table block from the rows of a table, the second of which is a delimiter"""
+    cells = [_cells(row) for i, row in enumerate(rows) if i != 1]
+    width = len(cells[0])
+    return {
+        "type": "table",
+        "table": {
+            "table_width": width,
+            "has_column_header": True,
+            "has_row_header": False,
+            "children": [
+                {
+                    "type": "table_row",
+                    "table_row": {
+                        "cells": [
+                            parse_inline(cell) for cell in (row + [""] * width)[:width]
+                        ]
+                    },
+                }
+                for row in cells
+            ],
+        },
+    }
+
+
+def _language(name: str) -> str:
+    name = name.strip().lower()
+    name = _LANGUAGE_ALIASES.get(name, name)
+    return name if name in _LANGUAGES else "plain text"
+
+
+def parse_markdown(text: str) -> list[BlockUnion]:
+    """
+    Compile Markdown into a list of blocks.
+
+    Supports headings, paragraphs, bulleted, numbered and to-do lists nested
+    by indentation, block quotes, fenced code, dividers, tables whose rows
+    start with | and inline bold, italic, strikethrough, code and links.
+    Cells beyond the width of the header row are dropped and column
+    alignment is ignored.
+    """
+    blocks: list[dict] = []
+    # open list items as (indent, block json) for nesting by indentation
+    items: list[tuple[int, dict]] = []
+    paragraph: list[str] = []
+    # consecutive lines starting with |, a table if the second is a delimiter
+    rows: list[str] = []
+    lines = iter(text.splitlines())
+
+    def add(block: dict, indent: int | None = None) -> None:
+        if indent is None:
+            items.clear()
+        else:
+            while items and items[-1][0] >= indent:
+                items.pop()
+            if items:
+                parent = items[-1][1]
+                parent[parent["type"]].setdefault("children", []).append(block)
+                items.append((indent, block))
+                return
+            items.append((indent, block))
+        blocks.append(block)
+
+    def end_paragraph() -> None:
+        if paragraph:
+            add(_block("paragraph", " ".join(paragraph)))
+            paragraph.clear()
+
+    def end_table() -> None:
+        if len(rows) > 1 and _TABLE_DELIMITER.fullmatch(rows[1]):
+            add(_table(rows))
+        else:
+            paragraph.extend(rows)
+        rows.clear()
+
+    for line in lines:
+        stripped = line.strip()
+        if stripped.startswith("|"):
+            if not rows:
+                end_paragraph()
+            rows.append(stripped)
+            continue
+        end_table()
+        if not stripped:
+            end_paragraph()
+            continue
+        if stripped.startswith("```"):
+            end_paragraph()
+            code = []
+            for code_line in lines:
+                if code_line.strip().startswith("```"):
+                    break
+                code.append(code_line)
+            source = "\n".join(code)
+            add(
+                {
+                    "type": "code",
+                    "code": {
+                        "rich_text": _text(source),
+                        "caption": [],
+                        "language": _language(stripped[3:]),
+                    },
+                }
+            )
+            continue
+
+        heading = _HEADING.fullmatch(stripped)
+        item = _LIST_ITEM.fullmatch(line)
+        if heading:
+            end_paragraph()
+            level = min(len(heading["hashes"]), 3)
+            add(_block(f"heading_{level}", heading["text"]))
+        elif _DIVIDER.fullmatch(stripped):
+            end_paragraph()
+            add({"type": "divider", "divider": {}})
+        elif stripped.startswith(">"):
+            end_paragraph()
+            quote = stripped[1:].strip()
+            if blocks and blocks[-1]["type"] == "quote" and not items:
+                rich_text = blocks[-1]["quote"]["rich_text"]
+                rich_text += _text("\n") + parse_inline(quote)
+            else:
+                add(_block("quote", quote))
+        elif item:
+            end_paragraph()
+            todo = _TODO.fullmatch(item["text"])
+            if todo and not item["marker"][0].isdigit():
+                block = _block("to_do", todo["text"], checked=todo["check"] != " ")
+            elif item["marker"][0].isdigit():
+                block = _block("numbered_list_item", item["text"])
+            else:
+                block = _block("bulleted_list_item", item["text"])
+            add(block, len(item["indent"]))
+        elif items and line.startswith(" "):
+            # a continuation line of the last list item
+            block = items[-1][1]
+            block[block["type"]]["rich_text"] += parse_inline(" " + stripped)
+        else:
+            items.clear()
+            paragraph.append(stripped)
+    end_table()
+    end_paragraph()
+
+    return [Block.validate_python(block) for block in blocks]
+
+
+def _subtree_size(block: BlockUnion, depth: int = 0) -> int | None:
+    """The number of blocks in a subtree, or None if it cannot be sent at depth"""
+    children = get_children(block) or []
+    if not children:
+        return 1
+    if depth >= MAX_NESTING or len(children) > MAX_CHILDREN:
+        return None
+    size = 1
+    for child in children:
+        child_size = _subtree_size(child, depth + 1)
+        if child_size is None:
+            return None
+        size += child_size
+    return size
+
+
+def _with_children(block: BlockUnion, children: list[BlockUnion] | None) -> BlockUnion:
+    data = getattr(block, block.type)
+    if isinstance(data, dict):
+        data = {key: value for key, value in data.items() if key != "children"}
+        if children:
+            data["children"] = children
+    else:
+        data = data.model_copy()
+        data.children = children or None
+    return block.model_copy(update={block.type: data})
+
+
+class AppendBatch(NamedTuple):
+    """The blocks for one blocks.children.append call"""
+
+    blocks: BlocksList
+    # for each block, the children to append once it has been created
+    deferred: list[list[BlockUnion] | None]
+
+
+def plan_batches(blocks: list[BlockUnion]) -> Iterator[AppendBatch]:
+    """
+    Pack blocks into as few append calls as Notion's limits allow.
+
+    Blocks are sent with their children whenever the whole subtree fits in
+    the current request, otherwise the children are deferred. A table cannot
+    be created without rows, so it is sent with its first MAX_CHILDREN rows
+    and only the rest are deferred.
+    """
+    batch: list[BlockUnion] = []
+    deferred: list[list[BlockUnion] | None] = []
+    total = 0
+    for block in blocks:
+        size = _subtree_size(block)
+        children = None
+        if size is None or size > MAX_BLOCKS:
+            children = get_children(block) or []
+            keep = MAX_CHILDREN if block.type == "table" else 0
+            block = _with_children(block, children[:keep])
+            children = children[keep:]
+            size = 1 + keep
+        if len(batch) == MAX_CHILDREN or total + size > MAX_BLOCKS:
+            yield AppendBatch(BlocksList(batch), deferred)
+            batch, deferred, total = [], [], 0
+        batch.append(block)
+        deferred.append(children)
+        total += size
+    if batch:
+        yield AppendBatch(BlocksList(batch), deferred)
+
+
+class Uploader:
+    """
+    Append blocks with a notion_client.AsyncClient, pipelining the requests.
+
+    Batches for one parent are appended in order, while the deferred children
+    of blocks that have been created are uploaded concurrently with the
+    following batches, with at most concurrency requests in flight.
+    """
+
+    def __init__(self, client, concurrency: int = 3) -> None:
+        self.client = client
+        self.concurrency = concurrency
+        self.calls = 0
+
+    async def upload(self, parent_id: str, blocks: list[BlockUnion]) -> int:
+        """
+        Append blocks and all of their children to a page or block
+
+        returns: the number of append calls made
+        """
+        self.calls = 0
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        await self._upload(parent_id, blocks)
+        return self.calls
+
+    async def _upload(self, parent_id: str, blocks: list[BlockUnion]) -> None:
+        tasks = []
+        for batch in plan_batches(blocks):
+            async with self._semaphore:
+                result = await self.client.blocks.children.append(
+                    block_id=parent_id,
+                    children=notion_dict(batch.blocks),
+                )
+            self.calls += 1
+            for created, children in zip(
+                result["results"], batch.deferred, strict=True
+            ):
+                if children:
+                    tasks.append(
+                        asyncio.create_task(self._upload(created["id"], children))
+                    )
+        await asyncio.gather(*tasks)
@@ -0,0 +1,359 @@
+"""
+Export and import pages and their block trees as newline delimited json.
+
+Each line of an export is one record:
+
+    {"kind": "page", "parent": null, "data": <page json>}
+    {"kind": "block", "parent": <id of parent page or block>, "data": <block json>}
+
+Blocks follow their page depth first, so every block comes after its parent.
+Exports and imports stream one record at a time and files with a .gz suffix
+are gzip compressed.
+"""
+
+import gzip
+import json
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import IO, Any, NamedTuple
+
+from .block import INLINE_CHILDREN_TYPES, READ_ONLY_BLOCK_TYPES, Block, BlockUnion
+from .loader import SKIP_TYPES
+from .markdown import MAX_BLOCKS, MAX_NESTING
+from .page import READ_ONLY_PROPERTY_TYPES, Page
+from .paginate import MAX_PAGE_SIZE, iter_blocks
+from .parent import PageParent
+from .root import Root
+
+# the bottom frame of the import stack holds the pages rather than a parent block
+_ROOT = ""
+
+
+def open_text(path: Path, mode: str) -> IO[str]:
+    """Open an ndjson export as text, through gzip when its suffix is .gz"""
+    if path.suffix == ".gz":
+        return gzip.open(path, mode, encoding="utf-8")  # type: ignore
+    return path.open(mode, encoding="utf-8")
+
+
+def _read_checkpoint(checkpoint: Path | None, default: dict) -> dict:
+    if checkpoint is None or not checkpoint.exists():
+        return default
+    return json.loads(checkpoint.read_text())
+
+
+def _write_checkpoint(checkpoint: Path | None, state: dict) -> None:
+    if checkpoint is None:
+        return
+    # write then rename so that a crash never leaves a partial checkpoint
+    temp = checkpoint.with_name(checkpoint.name + ".tmp")
+    temp.write_text(json.dumps(state))
+    temp.replace(checkpoint)
+
+
+def _write(stream: IO[str], kind: str, parent: str | None, model: Root) -> None:
+    data = model.model_dump(mode="json", by_alias=True, exclude_unset=True)
+    stream.write(json.dumps({"kind": kind, "parent": parent, "data": data}))
+    stream.write("\n")
+
+
+def walk_blocks(client, block_id: str) -> Iterator[tuple[str, BlockUnion]]:
+    """
+    Yield (parent id, block) for every descendant of a block or page, depth first
+    """
+    for block in iter_blocks(client, block_id):
+        yield block_id, block
+        if block.has_children and block.type not in SKIP_TYPES:
+            yield from walk_blocks(client, block.id)  # type: ignore
+
+
+def export_pages(
+    client, page_ids: Iterable[str], path: Path, checkpoint: Path | None = None
+) -> int:
+    """
+    Export pages and their block trees to an ndjson file.
+
+    With a checkpoint file an interrupted export resumes after the last page
+    that was completely written. Each page is written as a separate gzip member
+    so that a partially written page can be truncated away.
+
+    returns: the number of records written
+    """
+    state = _read_checkpoint(checkpoint, {"done": [], "offset": 0})
+    if path.exists():
+        with path.open("r+b") as f:
+            f.truncate(state["offset"])
+
+    count = 0
+    for page_id in page_ids:
+        if page_id in state["done"]:
+            continue
+        with open_text(path, "at") as stream:
+            page = Page(**client.pages.retrieve(page_id=page_id))
+            _write(stream, "page", None, page)
+            count += 1
+            for parent, block in walk_blocks(client, page.id):
+                _write(stream, "block", parent, block)
+                count += 1
+        state["done"].append(page_id)
+        state["offset"] = path.stat().st_size
+        _write_checkpoint(checkpoint, state)
+    return count
+
+
+def writable_page(page: Page, parent_id: str | None = None) -> dict[str, Any]:
+    """
+    Make the arguments for api call pages.create from a fetched page.
+
+    Read only properties are dropped. If parent_id is given the page is
+    created under that page, which only accepts a title property.
+    """
+    values = page.properties
+    if isinstance(values, Root):
+        # a model from validate_properties rather than the declared dict
+        values = values.model_dump(mode="json", by_alias=True, exclude_unset=True)
+    properties = {
+        name: value
+        for name, value in values.items()
+        if value.get("type") not in READ_ONLY_PROPERTY_TYPES
+    }
+    if parent_id is None:
+        parent = page.parent.model_dump(mode="json", by_alias=True)
+    else:
+        parent = PageParent(page_id=parent_id).model_dump(mode="json")
+        titles = [value for value in properties.values() if value["type"] == "title"]
+        properties = {"title": titles[0]} if titles else {}
+
+    payload = {"parent": parent, "properties": properties}
+    for field in ("icon", "cover"):
+        if getattr(page, field) is not None:
+            payload[field] = getattr(page, field).model_dump(
+                mode="json", by_alias=True, exclude_unset=True
+            )
+    return payload
+
+
+def writable_block(block: BlockUnion) -> dict[str, Any]:
+    """
+    Make the json for a block in api call blocks.children.append.
+
+    Only the type and the type's data are kept, without any children.
+    """
+    data = getattr(block, block.type)
+    if isinstance(data, Root):
+        data = data.model_dump(mode="json", by_alias=True, exclude_unset=True)
+    data = {key: value for key, value in data.items() if key != "children"}
+    return {"type": block.type, block.type: data}
+
+
+class _Inline(NamedTuple):
+    """The children sent in the same request as a block in INLINE_CHILDREN_TYPES"""
+
+    blocks: list[BlockUnion]
+    # the json of the blocks, which is the children list in the block's json
+    children: list[dict[str, Any]]
+    # the nesting of the block in the request, 0 for a block appended directly
+    depth: int
+
+
+class _Importer:
+    """
+    Recreates the records of an export, keeping the state needed to resume.
+
+    frames is a stack of (old parent id, {old child id: new child id}) for the
+    ancestors of the current record. Only children that have children of their
+    own are mapped, so memory is bounded by the depth and width of the tree
+    rather than the size of the export. Blocks sent inline under a table or
+    column list are mapped in the frame of the block appended directly.
+
+    A table or column list is sent with its whole subtree as far as the API's
+    nesting allows. The records of deeper descendants, which come between its
+    children in the export, are held back until the request has been sent.
+    A column whose first block is a table or column list cannot be sent and
+    is rejected by the API.
+    """
+
+    def __init__(self, client, parent_id: str | None, state: dict) -> None:
+        self.client = client
+        self.parent_id = parent_id
+        self.frames: list[tuple[str, dict[str, str]]] = [
+            (parent, children) for parent, children in state["frames"]
+        ]
+        self.pending: list[tuple[BlockUnion, dict[str, Any]]] = []
+        self.pending_parent = ("", "")
+        # the number of blocks in the pending request, including inline children
+        self.size = 0
+        self.inline: dict[str, _Inline] = {}
+        # records held back until the pending request is sent, the ids of the
+        # blocks whose children must be held back too, and of those that
+        # already have a child held back, so that the rest follow in order
+        self.deferred: list[tuple[str, BlockUnion]] = []
+        self.held: set[str] = set()
+        self.closed: set[str] = set()
+        self.count = 0
+
+    def page(self, page: Page) -> None:
+        result = self.client.pages.create(**writable_page(page, self.parent_id))
+        self.frames = [(_ROOT, {page.id: result["id"]})]  # type: ignore
+        self.count += 1
+
+    def block(self, parent: str, block: BlockUnion) -> bool:
+        """
+        Queue a block to be appended to its new parent.
+
+        returns: True if the pending blocks were flushed first
+        """
+        if block.type in READ_ONLY_BLOCK_TYPES:
+            if parent in self.held:
+                self.held.add(block.id)  # type: ignore
+            return False
+
+        inline = self.inline.get(parent)
+        if (
+            inline is not None
+            and parent not in self.closed
+            and len(inline.blocks) < MAX_PAGE_SIZE
+            and self.size < MAX_BLOCKS
+        ):
+            data = self._writable(block, inline.depth + 1)
+            if data is not None:
+                inline.blocks.append(block)
+                inline.children.append(data)
+                self.held.add(block.id)  # type: ignore
+                self.size += 1
+                return False
+
+        if parent in self.held:
+            self.deferred.append((parent, block))
+            self.held.add(block.id)  # type: ignore
+            self.closed.add(parent)
+            return False
+
+        if (
+            self.pending
+            and parent == self.pending_parent[0]
+            and len(self.pending) < MAX_PAGE_SIZE
+            and self.size < MAX_BLOCKS
+        ):
+            self.pending.append((block, self._writable(block, 0)))  # type: ignore
+            self.size += 1
+            return False
+
+        flushed = self.flush()
+        new_parent = self._resolve(parent)
+        if new_parent is not None:
+            self.pending = [(block, self._writable(block, 0))]  # type: ignore
+            self.pending_parent = (parent, new_parent)
+            self.size = 1
+        return flushed
+
+    def _writable(self, block: BlockUnion, depth: int) -> dict[str, Any] | None:
+        """
+        The json of a block at depth in the pending request, or None if it
+        must be sent with its children and they would be nested too deeply
+        """
+        data = writable_block(block)
+        if block.type in INLINE_CHILDREN_TYPES and block.has_children:
+            if depth >= MAX_NESTING:
+                return None
+            children: list[dict[str, Any]] = []
+            data[block.type]["children"] = children
+            self.inline[block.id] = _Inline([], children, depth)  # type: ignore
+            self.held.add(block.id)  # type: ignore
+        return data
+
+    def flush(self) -> bool:
+        """
+        Append the pending blocks in one api call, then any records that were
+        held back for it
+        """
+        if not self.pending:
+            return False
+        parent, new_parent = self.pending_parent
+        result = self.client.blocks.children.append(
+            block_id=new_parent,
+            children=[data for _, data in self.pending],
+        )
+        children: dict[str, str] = {}
+        for (block, _), new in zip(self.pending, result["results"], strict=True):
+            if block.has_children:
+                children[block.id] = new["id"]  # type: ignore
+                self._map_inline(block, new["id"], children)
+        if self.frames[-1][0] == parent:
+            self.frames[-1][1].update(children)
+        else:
+            self.frames.append((parent, children))
+        self.count += self.size
+        self.pending = []
+        self.inline = {}
+        self.size = 0
+
+        deferred, self.deferred = self.deferred, []
+        self.held, self.closed = set(), set()
+        for parent, block in deferred:
+            self.block(parent, block)
+        self.flush()
+        return True
+
+    def _map_inline(
+        self, block: BlockUnion, new_id: str, children: dict[str, str]
+    ) -> None:
+        """Map the blocks with children that were created inline under block"""
+        inline = self.inline.get(block.id)  # type: ignore
+        if inline is None or not any(child.has_children for child in inline.blocks):
+            return
+        created = iter_blocks(self.client, new_id)
+        for child, new in zip(inline.blocks, created, strict=True):
+            if child.has_children:
+                children[child.id] = new.id  # type: ignore
+                self._map_inline(child, new.id, children)  # type: ignore
+
+    def _resolve(self, parent: str) -> str | None:
+        # records are depth first so once we are back at a parent's frame all
+        # of the frames above it are complete
+        for index in reversed(range(len(self.frames))):
+            new_id = self.frames[index][1].get(parent)
+            if new_id is not None:
+                del self.frames[index + 1 :]
+                return new_id
+        return None
+
+    def state(self, line: int) -> dict:
+        return {"line": line, "frames": self.frames}
+
+
+def import_pages(
+    client, path: Path, parent_id: str | None = None, checkpoint: Path | None = None
+) -> int:
+    """
+    Recreate the pages and block trees of an ndjson export.
+
+    Pages are created under parent_id if given, otherwise under their
+    original parent. Consecutive sibling blocks are appended in batches of up
+    to 100. Tables and column lists are sent with their rows and columns, and
+    columns with their content, as the API requires. Blocks that the API
+    cannot create are skipped along with their descendants. With a checkpoint
+    file an interrupted import resumes after the last batch that was appended.
+
+    returns: the number of pages and blocks created
+    """
+    state = _read_checkpoint(checkpoint, {"line": 0, "frames": []})
+    importer = _Importer(client, parent_id, state)
+
+    with open_text(path, "rt") as stream:
+        for line, text in enumerate(stream):
+            if line < state["line"]:
+                continue
+            record = json.loads(text)
+            if record["kind"] == "page":
+                importer.flush()
+                importer.page(Page(**record["data"]))
+                _write_checkpoint(checkpoint, importer.state(line + 1))
+            else:
+                block = Block.validate_python(record["data"])
+                if importer.block(record["parent"], block):
+                    _write_checkpoint(checkpoint, importer.state(line))
+        if importer.flush():
+            _write_checkpoint(checkpoint, importer.state(line + 1))
+
+    return importer.count
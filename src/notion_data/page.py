@@ -9,16 +9,31 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Annotated, Literal, Sequence, TypeAlias, Union
 
-from pydantic import Field, field_serializer, field_validator
-
-from .dynamic import dict_model_instance
+from pydantic import (
+    BaseModel,
+    Field,
+    SerializationInfo,
+    create_model,
+    field_serializer,
+    field_validator,
+)
+
+from .dynamic import dict_model_instance, field_name
 from .enums import Color
 from .file import FileUnion
 from .identify import NotionUser
 from .parent import _ParentUnion
-from .regex import ID
+from .profile import profiled
+from .regex import ID, NotionId
 from .rich_text import RichText
-from .root import Root, format_datetime
+from .root import (
+    NOTION_CONTEXT,
+    OPTIONAL,
+    Root,
+    format_datetime,
+    notion_dict,
+    null_for_notion,
+)
 
 
 class Icon(Root):
@@ -29,7 +44,7 @@ class Icon(Root):
 
 class PageProperty(Root):
     # id and type are returned in get's but not required for post / patch
-    id: str | None = None
+    id: str | None = OPTIONAL
 
 
 class Checkbox(PageProperty):
@@ -42,12 +57,12 @@ class User(Root):
         email: str
 
     object: Literal["user"] = "user"
-    id: str = ID
-    name: str | None = None
-    avatar_url: str | None = None
-    type: str | None = None
-    bot: dict | None = None
-    person: _Person | None = None
+    id: NotionId = ID
+    name: str | None = OPTIONAL
+    avatar_url: str | None = OPTIONAL
+    type: str | None = OPTIONAL
+    bot: dict | None = OPTIONAL
+    person: _Person | None = OPTIONAL
 
 
 class CreatedBy(PageProperty):
@@ -67,8 +82,8 @@ class CreatedTime(PageProperty):
 class Date(PageProperty):
     class _DateData(Root):
         start: datetime
-        end: datetime | None = None
-        time_zone: str | None = None
+        end: datetime | None = OPTIONAL
+        time_zone: str | None = OPTIONAL
 
         @field_serializer("start", "end")
         def validate_time(self, time: datetime, _info):
@@ -126,7 +141,7 @@ class LastEditedTime(PageProperty):
 class MultiSelect(PageProperty):
     class _MultiSelectData(Root):
         color: Color = Color.DEFAULT
-        id: str = ID  # TODO the docs imply this may not be a UUID
+        id: NotionId = ID  # TODO the docs imply this may not be a UUID
         # https://developers.notion.com/reference/page-property-values#example-multi_select-page-property-value-as-returned-in-a-get-page-request
         name: str
 
@@ -146,16 +161,16 @@ class People(PageProperty):
 
 class Relation(PageProperty):
     class _RelationData(Root):
-        id: str = ID
+        id: NotionId = ID
 
     type: Literal["relation"] = "relation"
-    has_more: bool | None = None
+    has_more: bool | None = OPTIONAL
     relation: list[_RelationData]
 
 
 class Status(PageProperty):
     class _StatusData(Root):
-        id: str | None = ID
+        id: NotionId | None = ID
         name: str
         color: Color = Color.DEFAULT
 
@@ -180,20 +195,20 @@ class Page(Root):
     """A page in Notion"""
 
     object: Literal["page"] = "page"
-    id: str = ID
-    created_time: datetime | None = None
-    last_edited_time: datetime | None = None
-    created_by: NotionUser | None = None
-    last_edited_by: NotionUser | None = None
-    cover: FileUnion | None = None
-    icon: Icon | None = None
+    id: NotionId = ID
+    created_time: datetime | None = OPTIONAL
+    last_edited_time: datetime | None = OPTIONAL
+    created_by: NotionUser | None = OPTIONAL
+    last_edited_by: NotionUser | None = OPTIONAL
+    cover: FileUnion | None = OPTIONAL
+    icon: Icon | None = OPTIONAL
     has_children: bool = False
     parent: _ParentUnion
     archived: bool = False
     in_trash: bool = False
-    request_id: str | None = ID
-    url: str | None = None
-    public_url: str | None = None
+    request_id: NotionId | None = ID
+    url: str | None = OPTIONAL
+    public_url: str | None = OPTIONAL
     # Properties' keys are the column names from parent database
     # Therefore dynamic - model is created by validate_properties below
     # TODO: model this as title: TitleClass | dynamic properties
@@ -203,6 +218,86 @@ class Page(Root):
     def validate_time(self, time: datetime, _info):
         return format_datetime(time)
 
+    @field_serializer("properties", mode="wrap")
+    def serialize_properties(self, properties, handler, info: SerializationInfo):
+        if not isinstance(properties, BaseModel):
+            return handler(properties)
+        # a model from validate_properties rather than the declared dict
+        with profiled(type(properties).__name__, serialize=True):
+            if info.context == NOTION_CONTEXT:
+                return notion_dict(properties)
+            return properties.model_dump(
+                mode=info.mode,
+                by_alias=info.by_alias,
+                exclude_unset=info.exclude_unset,
+                exclude_defaults=info.exclude_defaults,
+                exclude_none=info.exclude_none,
+            )
+
     @field_validator("properties", mode="after")
     def validate_properties(cls, properties, _info):
+        if not isinstance(properties, dict):
+            # already typed by a model from database_page_model
+            return properties
         return dict_model_instance("properties", properties)
+
+
+class Pages(Root):
+    """
+    A page of the rows of a data source returned by api call
+    data_sources.query, or by databases.query in API versions before 2025-09-03
+    """
+
+    object: Literal["list"] = "list"
+    type: Literal["page_or_data_source", "page_or_database"] = "page_or_data_source"
+    results: list[Page]
+    next_cursor: str | None = OPTIONAL
+    request_id: NotionId | None = ID
+    page_or_data_source: dict = {}
+    page_or_database: dict = {}
+    has_more: bool = False
+
+
+READ_ONLY_PROPERTY_TYPES = {
+    "created_by",
+    "created_time",
+    "formula",
+    "last_edited_by",
+    "last_edited_time",
+    "rollup",
+    "unique_id",
+}
+""" Property types that are computed by Notion and cannot be sent in an update """
+
+
+PROPERTY_TYPES: dict[str, type[PageProperty]] = {
+    cls.model_fields["type"].default: cls for cls in PageProperty.__subclasses__()
+}
+""" Map of the property type names used by Notion to the property classes """
+
+
+def database_page_model(schema: dict, name: str = "DatabasePage") -> type[Page]:
+    """
+    Compile a Page subclass with typed properties from a database schema.
+
+    schema is the response of api call databases.retrieve, or just its
+    properties dictionary. Each property becomes an optional field of its
+    concrete property class, aliased to the property name, so that rows of
+    the database validate without building a model per page. Property types
+    that are not modelled yet fall back to PropertyUnion.
+
+    returns: a Page subclass to validate the database's rows into
+    """
+    if schema.get("object") == "database":
+        schema = schema["properties"]
+
+    fields = {
+        field_name(key): Annotated[
+            PROPERTY_TYPES.get(prop["type"], PropertyUnion) | None,  # type: ignore
+            Field(default=None, description=key, alias=key, exclude_if=null_for_notion),
+        ]
+        for key, prop in schema.items()
+    }
+    properties = create_model(f"{name}Properties", **fields, __base__=Root)  # type: ignore
+
+    return create_model(name, properties=(properties, ...), __base__=Page)  # type: ignore
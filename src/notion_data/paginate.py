@@ -0,0 +1,159 @@
+"""
+Iterate over the paginated results of list api calls in Notion.
+
+https://developers.notion.com/reference/intro#pagination
+"""
+
+import asyncio
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any
+
+from pydantic import TypeAdapter
+
+from .block import Block, BlockUnion
+from .page import Page
+
+# the largest page size that the Notion API allows
+MAX_PAGE_SIZE = 100
+
+
+def iter_results(
+    fetch: Callable[..., Any],
+    adapter: TypeAdapter,
+    page_size: int = MAX_PAGE_SIZE,
+    **kwargs,
+) -> Iterator[Any]:
+    """
+    Yield validated results one at a time from a paginated api call.
+
+    fetch is a list endpoint such as client.blocks.children.list and kwargs are
+    passed to every call. The next page is requested in a background thread
+    while the results of the current page are validated and consumed.
+    """
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        future: Future | None = executor.submit(fetch, page_size=page_size, **kwargs)
+        while future is not None:
+            response = future.result()
+            future = None
+            if response.get("has_more"):
+                future = executor.submit(
+                    fetch,
+                    start_cursor=response["next_cursor"],
+                    page_size=page_size,
+                    **kwargs,
+                )
+            for result in response["results"]:
+                yield adapter.validate_python(result)
+
+
+async def aiter_results(
+    fetch: Callable[..., Awaitable[Any]],
+    adapter: TypeAdapter,
+    page_size: int = MAX_PAGE_SIZE,
+    **kwargs,
+) -> AsyncIterator[Any]:
+    """
+    Async version of iter_results for use with notion_client.AsyncClient.
+
+    The next page is requested in a background task while the results of the
+    current page are validated and consumed.
+    """
+    task: asyncio.Future | None = asyncio.ensure_future(
+        fetch(page_size=page_size, **kwargs)
+    )
+    try:
+        while task is not None:
+            response = await task
+            task = None
+            if response.get("has_more"):
+                task = asyncio.ensure_future(
+                    fetch(
+                        start_cursor=response["next_cursor"],
+                        page_size=page_size,
+                        **kwargs,
+                    )
+                )
+            for result in response["results"]:
+                yield adapter.validate_python(result)
+    finally:
+        if task is not None:
+            task.cancel()
+
+
+def iter_blocks(
+    client, block_id: str, page_size: int = MAX_PAGE_SIZE
+) -> Iterator[BlockUnion]:
+    """
+    Yield the child blocks of a block or page from api call blocks.children.list
+    """
+    return iter_results(
+        client.blocks.children.list, Block, page_size=page_size, block_id=block_id
+    )
+
+
+def aiter_blocks(
+    client, block_id: str, page_size: int = MAX_PAGE_SIZE
+) -> AsyncIterator[BlockUnion]:
+    """
+    Async version of iter_blocks for use with notion_client.AsyncClient
+    """
+    return aiter_results(
+        client.blocks.children.list, Block, page_size=page_size, block_id=block_id
+    )
+
+
+def _query_args(data_source_id: str, filter: dict | None, sorts: list | None) -> dict:
+    # only send filter and sorts when given, the api rejects them as null
+    kwargs: dict[str, Any] = {"data_source_id": data_source_id}
+    if filter is not None:
+        kwargs["filter"] = filter
+    if sorts is not None:
+        kwargs["sorts"] = sorts
+    return kwargs
+
+
+def iter_query(
+    client,
+    data_source_id: str,
+    filter: dict | None = None,
+    sorts: list | None = None,
+    model: type[Page] = Page,
+    page_size: int = MAX_PAGE_SIZE,
+) -> Iterator[Page]:
+    """
+    Yield the rows of a data source from api call data_sources.query
+
+    https://developers.notion.com/reference/query-a-data-source
+
+    A data source is one table of a database, and since API version
+    2025-09-03 rows are queried from it rather than from the database.
+    filter and sorts are passed to the query as they are. model validates each
+    row, e.g. a model from database_page_model. Only one page of rows is held
+    at a time, so this streams data sources of any size.
+    """
+    return iter_results(
+        client.data_sources.query,
+        TypeAdapter(model),
+        page_size=page_size,
+        **_query_args(data_source_id, filter, sorts),
+    )
+
+
+def aiter_query(
+    client,
+    data_source_id: str,
+    filter: dict | None = None,
+    sorts: list | None = None,
+    model: type[Page] = Page,
+    page_size: int = MAX_PAGE_SIZE,
+) -> AsyncIterator[Page]:
+    """
+    Async version of iter_query for use with notion_client.AsyncClient
+    """
+    return aiter_results(
+        client.data_sources.query,
+        TypeAdapter(model),
+        page_size=page_size,
+        **_query_args(data_source_id, filter, sorts),
+    )
@@ -8,7 +8,7 @@ from typing import Annotated, Literal, TypeAlias
 
 from pydantic import Field
 
-from .regex import ID
+from .regex import ID, NotionId
 from .root import Root
 
 
@@ -16,14 +16,25 @@ class DatabaseParent(Root):
     """A database parent object in Notion"""
 
     type: Literal["database_id"] = "database_id"
-    database_id: str = ID
+    database_id: NotionId = ID
+
+
+class DataSourceParent(Root):
+    """
+    A data source parent object in Notion, of the rows of a database from API
+    version 2025-09-03
+    """
+
+    type: Literal["data_source_id"] = "data_source_id"
+    data_source_id: NotionId = ID
+    database_id: NotionId | None = ID
 
 
 class PageParent(Root):
     """A page parent object in Notion"""
 
     type: Literal["page_id"] = "page_id"
-    page_id: str = ID
+    page_id: NotionId = ID
 
 
 class WorkspaceParent(Root):
@@ -37,12 +48,11 @@ class BlockParent(Root):
     """A block parent object in Notion"""
 
     type: Literal["block_id"] = "block_id"
-    id: str = ID
-    block: bool = True
+    block_id: NotionId = ID
 
 
 _ParentUnion: TypeAlias = Annotated[  # type: ignore
-    DatabaseParent | PageParent | WorkspaceParent | BlockParent,
+    DatabaseParent | DataSourceParent | PageParent | WorkspaceParent | BlockParent,
     Field(discriminator="type", description="union of arg types"),
 ]
 """ Parent is union of all parent types, discriminated by `type` literal """
@@ -1,9 +1,59 @@
 """
-Some regex patterns for fields in the Notion API.
+Patterns and types for id fields in the Notion API.
 """
 
-from pydantic import Field
+from typing import Annotated, Union
 
-UUIDv4 = r"([0-9a-z]{8}(-[0-9a-z]{4}){3}-[0-9a-z]{12})|([0-9a-z]{27})"
+from pydantic import AfterValidator, Field, StringConstraints
 
-ID: Field = Field(default=None, description="Identifier", pattern=UUIDv4)  # type: ignore
+from .root import null_for_notion
+
+NOTION_ID = (
+    r"^(?:[0-9a-z]{8}-[0-9a-z]{4}-[0-9a-z]{4}-[0-9a-z]{4}-[0-9a-z]{12}|[0-9a-z]{27})$"
+)
+""" Notion's lower case dashed UUIDs and older 27 character ids """
+
+
+def parse_id(value: str) -> str:
+    """
+    Validate a Notion id without a regex and return its canonical form.
+
+    Dashed and undashed UUIDs are accepted and returned in Notion's lower case
+    dashed format, as are the older 27 character ids.
+    """
+    compact = value.replace("-", "")
+    if not (compact.isascii() and compact.isalnum()):
+        raise ValueError(f"{value!r} is not a Notion id")
+    if len(value) == 36 and len(compact) == 32:
+        if not value[8] == value[13] == value[18] == value[23] == "-":
+            raise ValueError(f"{value!r} is not a Notion id")
+        return value.lower()
+    if "-" in value:
+        # only the 36 character form of a UUID is dashed
+        raise ValueError(f"{value!r} is not a Notion id")
+    if len(compact) == 32:
+        compact = compact.lower()
+        return (
+            f"{compact[:8]}-{compact[8:12]}-{compact[12:16]}-"
+            f"{compact[16:20]}-{compact[20:]}"
+        )
+    if len(compact) == 27:
+        return compact.lower()
+    raise ValueError(f"{value!r} is not a Notion id")
+
+
+NotionId = Annotated[
+    Union[
+        Annotated[str, StringConstraints(pattern=NOTION_ID)],
+        Annotated[str, AfterValidator(parse_id)],
+    ],
+    Field(union_mode="left_to_right"),
+]
+"""
+A Notion id. Ids already in the canonical form are matched by pydantic-core
+and only other forms are canonicalized by parse_id.
+"""
+
+ID: Field = Field(  # type: ignore
+    default=None, description="Identifier", exclude_if=null_for_notion
+)
@@ -0,0 +1,198 @@
+"""
+Render block trees as plain text or Markdown.
+
+Rendering is a generator that yields the output a line at a time as blocks
+arrive, so it can consume iter_blocks or a large export without building the
+whole document in memory.
+"""
+
+from collections.abc import Iterable, Iterator, Sequence
+
+from .block import BlockUnion, get_children
+from .rich_text import Equation, RichText, TextObject
+
+LIST_TYPES = {"bulleted_list_item", "numbered_list_item", "to_do"}
+LINK_TYPES = {"bookmark", "embed", "file", "image", "video"}
+CONTAINER_TYPES = {"column_list", "column", "synced_block"}
+
+
+def plain_text(rich_text: Sequence[RichText]) -> str:
+    """
+    Join the text of a run of rich text objects, without any formatting
+    """
+    return "".join(_plain(text) for text in rich_text)
+
+
+def _plain(text: RichText) -> str:
+    if text.plain_text is not None:
+        return text.plain_text
+    if isinstance(text, TextObject):
+        return text.text.content
+    if isinstance(text, Equation):
+        return text.equation.get("expression", "")
+    return ""
+
+
+def markdown_text(rich_text: Sequence[RichText]) -> str:
+    """
+    Join a run of rich text objects as Markdown, keeping annotations and links
+    """
+    return "".join(_markdown(text) for text in rich_text)
+
+
+def _markdown(text: RichText) -> str:
+    if isinstance(text, Equation):
+        return f"${_plain(text)}$"
+
+    content = _plain(text)
+    if not content:
+        return content
+    annotations = text.annotations
+    if annotations is not None:
+        if annotations.code:
+            content = f"`{content}`"
+        if annotations.bold:
+            content = f"**{content}**"
+        if annotations.italic:
+            content = f"*{content}*"
+        if annotations.strikethrough:
+            content = f"~~{content}~~"
+    link = text.href
+    if isinstance(text, TextObject) and text.text.link is not None:
+        link = text.text.link.url
+    if link:
+        content = f"[{content}]({link})"
+    return content
+
+
+class _Renderer:
+    """Render blocks, keeping the state of numbered lists at each depth"""
+
+    def __init__(self, markdown: bool) -> None:
+        self.markdown = markdown
+        self.text = markdown_text if markdown else plain_text
+
+    def blocks(self, blocks: Iterable[BlockUnion], indent: str = "") -> Iterator[str]:
+        previous = None
+        number = 0
+        for block in blocks:
+            # lists are kept tight, everything else is separated by a blank line
+            if previous is not None and not (
+                block.type in LIST_TYPES and previous in LIST_TYPES
+            ):
+                yield self.blank(indent)
+            number = number + 1 if block.type == "numbered_list_item" else 0
+            yield from self.block(block, indent, number)
+            previous = block.type
+
+    def block(self, block: BlockUnion, indent: str, number: int) -> Iterator[str]:
+        data = getattr(block, block.type)
+        children = get_children(block)
+        child_indent = indent + "  "
+        kind = block.type
+
+        if kind in ("paragraph", "callout"):
+            yield from self.lines(indent, self.text(data.rich_text))
+        elif kind.startswith("heading_"):
+            hashes = "#" * int(kind[-1]) + " " if self.markdown else ""
+            yield from self.lines(indent, hashes + self.text(data.rich_text))
+        elif kind == "bulleted_list_item":
+            yield from self.lines(indent, "- " + self.text(data.rich_text))
+        elif kind == "numbered_list_item":
+            yield from self.lines(indent, f"{number}. " + self.text(data.rich_text))
+            child_indent = indent + " " * (len(str(number)) + 2)
+        elif kind == "to_do":
+            check = "[x]" if data.checked else "[ ]"
+            yield from self.lines(indent, f"- {check} " + self.text(data.rich_text))
+            child_indent = indent + "      "
+        elif kind == "toggle":
+            if self.markdown:
+                # indenting inside html would turn the children into code blocks
+                child_indent = indent
+                yield f"{indent}<details>\n"
+                yield f"{indent}<summary>{self.text(data.rich_text)}</summary>\n\n"
+            else:
+                yield from self.lines(indent, self.text(data.rich_text))
+        elif kind == "quote":
+            child_indent = indent + "> "
+            yield from self.lines(child_indent, self.text(data.rich_text))
+        elif kind == "code":
+            yield from self.code(data, indent)
+        elif kind == "equation":
+            fence = "$$" if self.markdown else ""
+            yield from self.lines(indent, f"{fence}{data.expression}{fence}")
+        elif kind == "divider":
+            yield f"{indent}---\n"
+        elif kind == "table":
+            yield from self.table(data, children or [], indent)
+            children = None
+        elif kind in ("child_page", "child_database"):
+            yield from self.lines(indent, data.title)
+        elif kind in LINK_TYPES:
+            yield from self.link(kind, data, indent)
+        elif kind in CONTAINER_TYPES:
+            # containers have no content of their own
+            child_indent = indent
+
+        if children:
+            if kind not in LIST_TYPES | CONTAINER_TYPES and kind != "toggle":
+                yield self.blank(child_indent)
+            yield from self.blocks(children, child_indent)
+        if kind == "toggle" and self.markdown:
+            yield f"\n{indent}</details>\n"
+
+    def blank(self, indent: str) -> str:
+        # a blank line inside a quote keeps its > marker
+        return indent.rstrip() + "\n"
+
+    def lines(self, indent: str, text: str) -> Iterator[str]:
+        for line in text.split("\n"):
+            yield f"{indent}{line}\n"
+
+    def code(self, data, indent: str) -> Iterator[str]:
+        language = "" if data.language == "plain text" else data.language
+        if self.markdown:
+            yield f"{indent}```{language}\n"
+        yield from self.lines(indent, plain_text(data.rich_text))
+        if self.markdown:
+            yield f"{indent}```\n"
+
+    def table(self, data, rows: list[BlockUnion], indent: str) -> Iterator[str]:
+        for index, row in enumerate(rows):
+            if row.type != "table_row":
+                continue
+            cells = [self.text(cell) for cell in row.table_row.cells]  # type: ignore
+            if not self.markdown:
+                yield indent + "\t".join(cells) + "\n"
+                continue
+            cells = [cell.replace("|", "\\|").replace("\n", " ") for cell in cells]
+            yield f"{indent}| " + " | ".join(cells) + " |\n"
+            if index == 0:
+                yield f"{indent}|" + " --- |" * len(cells) + "\n"
+
+    def link(self, kind: str, data, indent: str) -> Iterator[str]:
+        if kind in ("bookmark", "embed"):
+            url = data.url
+            caption = getattr(data, "caption", None)
+        else:
+            file = data if kind == "file" else data.file
+            url = file.external.url if file.type == "external" else file.file.url
+            caption = file.caption
+        text = self.text(caption) if caption else url
+        if self.markdown:
+            text = f"![{text}]({url})" if kind == "image" else f"[{text}]({url})"
+        yield from self.lines(indent, text)
+
+
+def iter_text(blocks: Iterable[BlockUnion]) -> Iterator[str]:
+    """
+    Render blocks and their children as plain text, yielding one line at a time
+    """
+    return _Renderer(markdown=False).blocks(blocks)
+
+
+def iter_markdown(blocks: Iterable[BlockUnion]) -> Iterator[str]:
+    """
+    Render blocks and their children as Markdown, yielding one line at a time
+    """
+    return _Renderer(markdown=True).blocks(blocks)
@@ -10,28 +10,28 @@ from typing import Annotated, Literal
 
 from pydantic import Field
 
-from .root import Root
+from .root import OPTIONAL, Root
 
 # TODO href should be typed ??
 
 
 class Url(Root):
-    type: Literal["url"] | None = None
+    type: Literal["url"] | None = OPTIONAL
     url: str
 
 
 class _BaseRichText(Root):
     """A base class for all rich text objects"""
 
-    annotations: Annotations | None = None
-    plain_text: str | None = None
-    href: str | None = None
+    annotations: Annotations | None = OPTIONAL
+    plain_text: str | None = OPTIONAL
+    href: str | None = OPTIONAL
 
 
 class TextObject(_BaseRichText):
     class _TextObjectData(Root):
         content: str = ""
-        link: Url | None = None
+        link: Url | None = OPTIONAL
 
     type: Literal["text"] = "text"
     text: _TextObjectData
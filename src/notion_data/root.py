@@ -5,9 +5,26 @@ Uses pydantic model and defines the common attributes for all Notion data
 classes.
 """
 
+from contextvars import ContextVar
 from datetime import datetime
+from typing import Any, Self
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
+
+# serialization context that nested dynamic models check for, see notion_json
+NOTION_CONTEXT = {"notion": True}
+
+# set while notion_json or notion_dict serialize a model
+_for_notion: ContextVar[bool] = ContextVar("for_notion", default=False)
+
+
+def null_for_notion(value: Any) -> bool:
+    """Whether a field is None while serializing for the Notion write API"""
+    return value is None and _for_notion.get()
+
+
+OPTIONAL: Any = Field(default=None, exclude_if=null_for_notion)
+""" The default of fields that notion_json leaves out when they are None """
 
 
 def format_datetime(date: datetime) -> str:
@@ -24,8 +41,52 @@ class Root(BaseModel):
         use_enum_values=True,
         ser_json_timedelta="iso8601",
         populate_by_name=True,
+        defer_build=True,
     )
 
+    @classmethod
+    def from_json_bytes(cls, data: bytes | str) -> Self:
+        """
+        Validate a raw json response from the Notion API.
+
+        The json is parsed and validated in one pass by pydantic-core without
+        building an intermediate dict.
+        """
+        return cls.model_validate_json(data)
+
+
+def notion_json(model: BaseModel) -> bytes:
+    """
+    Serialize a model as json bytes for the Notion write API.
+
+    Unset fields are left out, as are fields set to None where None is the
+    default, so there is no need to call unset_none on the model first. Those
+    are the fields declared with OPTIONAL, which pydantic-core leaves out while
+    this runs, so the model's own compiled serializer is used.
+    """
+    token = _for_notion.set(True)
+    try:
+        return model.__pydantic_serializer__.to_json(
+            model, by_alias=True, exclude_unset=True, context=NOTION_CONTEXT
+        )
+    finally:
+        _for_notion.reset(token)
+
+
+def notion_dict(model: BaseModel) -> Any:
+    """Serialize a model as json compatible python for the Notion write API"""
+    token = _for_notion.set(True)
+    try:
+        return model.__pydantic_serializer__.to_python(
+            model,
+            mode="json",
+            by_alias=True,
+            exclude_unset=True,
+            context=NOTION_CONTEXT,
+        )
+    finally:
+        _for_notion.reset(token)
+
 
 def unset_none(model: BaseModel):
     """
@@ -33,6 +94,9 @@ def unset_none(model: BaseModel):
     to be registered in model_fields_set set. This in turn cause it to serialize
     with nil for each of those fields. This breaks the Notion API and here
     we 'un-set' any None fields to fix that..
+
+    notion_json and notion_dict do this for every level of a model when
+    serializing, without changing the model.
     """
     remove = []
     for field in model.model_fields_set:
@@ -0,0 +1,285 @@
+"""
+Schedule requests to the Notion API within its rate limits.
+
+https://developers.notion.com/reference/request-limits
+
+Notion allows an average of three requests per second for each integration
+and answers with 429 and a Retry-After header when that is exceeded. A
+Scheduler is shared by every client in a process so that they draw on one
+token bucket, requests are released in priority order and throttled or failed
+requests are retried with jittered back off. The scheduler plugs into
+notion_client as an httpx transport, so it works with any client including
+RawClient and the from_json_bytes entry points of the models:
+
+    scheduler = Scheduler()
+    client = RawClient(
+        auth=os.getenv("NOTION_SECRET"),
+        client=httpx.Client(transport=RateLimitTransport(scheduler)),
+    )
+    with scheduler.priority(Priority.HIGH):
+        page = Page.from_json_bytes(client.pages.retrieve(page_id=page_id))
+"""
+
+import asyncio
+import heapq
+import itertools
+import random
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from enum import IntEnum
+
+import httpx
+
+# Notion's average request rate for an integration
+REQUESTS_PER_SECOND = 3.0
+RETRY_STATUS = {429, 500, 502, 503, 504}
+# server errors are only retried for methods that are safe to repeat
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "DELETE"}
+
+
+class Priority(IntEnum):
+    """Requests with a lower value are sent first"""
+
+    HIGH = 0
+    NORMAL = 1
+    LOW = 2
+
+
+_priority: ContextVar[Priority] = ContextVar("priority", default=Priority.NORMAL)
+
+
+@dataclass
+class Metrics:
+    """Counters and recent latencies of the requests through a Scheduler"""
+
+    requests: int = 0
+    retries: int = 0
+    throttled: int = 0
+    queue_depth: int = 0
+    max_queue_depth: int = 0
+    # seconds from a request being queued to its final response, most recent last
+    latencies: deque[float] = field(default_factory=lambda: deque(maxlen=1000))
+
+    def latency(self, percentile: float) -> float:
+        """The latency below which percentile percent of recent requests fell"""
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        index = round(percentile / 100 * (len(ordered) - 1))
+        return ordered[index]
+
+
+class Scheduler:
+    """
+    A token bucket and priority queue shared by all requests to the API.
+
+    rate tokens are added per second up to burst, and each attempt at a
+    request takes one. Waiting requests are released highest priority first,
+    then in the order they arrived. A 429 response pauses every request for
+    its Retry-After, and requests are retried up to max_retries times.
+
+    callback, if given, is called with the metrics after each completed
+    request, e.g. to publish them to a metrics system.
+    """
+
+    def __init__(
+        self,
+        rate: float = REQUESTS_PER_SECOND,
+        burst: int = 3,
+        max_retries: int = 5,
+        backoff: float = 1.0,
+        max_backoff: float = 60.0,
+        callback: Callable[[Metrics], None] | None = None,
+    ) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.callback = callback
+        self.metrics = Metrics()
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._waiting: list[tuple[int, int]] = []
+        self._order = itertools.count()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def priority(self, priority: Priority) -> Iterator[None]:
+        """Send the requests made in this context with priority"""
+        token = _priority.set(priority)
+        try:
+            yield
+        finally:
+            _priority.reset(token)
+
+    def _enqueue(self) -> tuple[int, int]:
+        entry = (_priority.get(), next(self._order))
+        with self._lock:
+            heapq.heappush(self._waiting, entry)
+            self.metrics.queue_depth = len(self._waiting)
+            self.metrics.max_queue_depth = max(
+                self.metrics.max_queue_depth, self.metrics.queue_depth
+            )
+        return entry
+
+    def _dequeue(self, entry: tuple[int, int]) -> None:
+        """Remove entry if it is still waiting, e.g. after its wait was cancelled"""
+        with self._lock:
+            if entry in self._waiting:
+                self._waiting.remove(entry)
+                heapq.heapify(self._waiting)
+                self.metrics.queue_depth = len(self._waiting)
+
+    def _try_acquire(self, entry: tuple[int, int]) -> float:
+        """Take a token for entry, or return the seconds to wait before retrying"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            if now < self._paused_until:
+                return self._paused_until - now
+            if self._waiting[0] == entry and self._tokens >= 1:
+                self._tokens -= 1
+                heapq.heappop(self._waiting)
+                self.metrics.queue_depth = len(self._waiting)
+                return 0.0
+            return max((1 - self._tokens) / self.rate, 1e-3)
+
+    def acquire(self) -> None:
+        """Block until this thread's request may be sent"""
+        entry = self._enqueue()
+        try:
+            delay = self._try_acquire(entry)
+            while delay:
+                time.sleep(delay)
+                delay = self._try_acquire(entry)
+        finally:
+            # an entry left at the head of the queue would block every request
+            self._dequeue(entry)
+
+    async def acquire_async(self) -> None:
+        """Wait until this task's request may be sent"""
+        entry = self._enqueue()
+        try:
+            delay = self._try_acquire(entry)
+            while delay:
+                await asyncio.sleep(delay)
+                delay = self._try_acquire(entry)
+        finally:
+            self._dequeue(entry)
+
+    def retry_delay(
+        self, request: httpx.Request, response: httpx.Response, attempt: int
+    ) -> float | None:
+        """
+        The seconds to wait before retrying request, or None to return response
+        """
+        if response.status_code not in RETRY_STATUS or attempt >= self.max_retries:
+            return None
+        if response.status_code != 429 and request.method not in IDEMPOTENT_METHODS:
+            return None
+
+        backoff = min(self.max_backoff, self.backoff * 2**attempt)
+        with self._lock:
+            self.metrics.retries += 1
+            retry_after = _retry_after(response)
+            if response.status_code == 429:
+                self.metrics.throttled += 1
+                self._tokens = 0.0
+            if retry_after is not None:
+                # spread the retries of the waiting requests over one back off
+                self._paused_until = max(
+                    self._paused_until, time.monotonic() + retry_after
+                )
+                return retry_after + random.uniform(0, self.backoff)
+        return random.uniform(backoff / 2, backoff)
+
+    def record(self, start: float) -> None:
+        """Count a completed request that was first queued at start"""
+        with self._lock:
+            self.metrics.requests += 1
+            self.metrics.latencies.append(time.monotonic() - start)
+        if self.callback is not None:
+            self.callback(self.metrics)
+
+
+def _retry_after(response: httpx.Response) -> float | None:
+    value = response.headers.get("retry-after")
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+class RateLimitTransport(httpx.BaseTransport):
+    """
+    An httpx transport that sends requests through a Scheduler.
+
+    Pass it to the httpx.Client of a notion_client.Client. Disable the
+    client's own retries where it has them, e.g. retry=False in notion_client
+    3, so that retries are only made here.
+    """
+
+    def __init__(
+        self, scheduler: Scheduler, transport: httpx.BaseTransport | None = None
+    ) -> None:
+        self.scheduler = scheduler
+        self.transport = transport or httpx.HTTPTransport()
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        start = time.monotonic()
+        for attempt in itertools.count():
+            self.scheduler.acquire()
+            response = self.transport.handle_request(request)
+            delay = self.scheduler.retry_delay(request, response, attempt)
+            if delay is None:
+                break
+            response.close()
+            time.sleep(delay)
+        self.scheduler.record(start)
+        return response
+
+    def close(self) -> None:
+        self.transport.close()
+
+
+class AsyncRateLimitTransport(httpx.AsyncBaseTransport):
+    """Async version of RateLimitTransport for notion_client.AsyncClient"""
+
+    def __init__(
+        self, scheduler: Scheduler, transport: httpx.AsyncBaseTransport | None = None
+    ) -> None:
+        self.scheduler = scheduler
+        self.transport = transport or httpx.AsyncHTTPTransport()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        start = time.monotonic()
+        for attempt in itertools.count():
+            await self.scheduler.acquire_async()
+            response = await self.transport.handle_async_request(request)
+            delay = self.scheduler.retry_delay(request, response, attempt)
+            if delay is None:
+                break
+            await response.aclose()
+            await asyncio.sleep(delay)
+        self.scheduler.record(start)
+        return response
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
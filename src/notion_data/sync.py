@@ -0,0 +1,156 @@
+"""
+Mirror Notion databases into SQLite, fetching only the rows that changed.
+
+https://developers.notion.com/reference/query-a-data-source
+
+Rows are queried from a data source, one table of a database. Each data source
+has a watermark, the last_edited_time of the newest row synced.
+A sync queries for rows edited on or after the watermark, oldest first, and
+advances the watermark as each row is stored, so an interrupted sync resumes
+where it stopped. The query includes the watermark itself because Notion
+rounds last_edited_time to the minute; rows seen again are upserted unchanged.
+
+Rows that come back archived or in the trash are removed from the store.
+Notion's query leaves out trashed rows, so a row trashed since the last sync
+is only noticed by reconcile, which lists every row id in the data source.
+"""
+
+import sqlite3
+from dataclasses import dataclass
+from pathlib import Path
+
+from .page import Page
+from .paginate import MAX_PAGE_SIZE, iter_query
+from .regex import parse_id
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS watermarks (
+    data_source_id TEXT PRIMARY KEY,
+    edited TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS pages (
+    id TEXT PRIMARY KEY,
+    data_source_id TEXT NOT NULL,
+    edited TEXT NOT NULL,
+    data BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS pages_data_source ON pages (data_source_id);
+"""
+
+
+@dataclass
+class SyncResult:
+    """The changes applied by one sync of a data source"""
+
+    upserted: int = 0
+    removed: int = 0
+    watermark: str | None = None
+
+
+class DatabaseSync:
+    """
+    Keep local copies of the pages in Notion databases up to date.
+
+    client is a notion_client.Client and path the SQLite file that holds the
+    pages and the watermark of each data source.
+    """
+
+    def __init__(
+        self, client, path: Path | str, page_size: int = MAX_PAGE_SIZE
+    ) -> None:
+        self.client = client
+        self.page_size = page_size
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def watermark(self, data_source_id: str) -> str | None:
+        row = self.connection.execute(
+            "SELECT edited FROM watermarks WHERE data_source_id = ?",
+            (parse_id(data_source_id),),
+        ).fetchone()
+        return None if row is None else row[0]
+
+    def sync(self, data_source_id: str) -> SyncResult:
+        """Fetch and store the rows edited since the last sync of a data source"""
+        data_source_id = parse_id(data_source_id)
+        result = SyncResult(watermark=self.watermark(data_source_id))
+        filter = None
+        if result.watermark is not None:
+            filter = {
+                "timestamp": "last_edited_time",
+                "last_edited_time": {"on_or_after": result.watermark},
+            }
+
+        pages = iter_query(
+            self.client,
+            data_source_id,
+            filter=filter,
+            sorts=[{"timestamp": "last_edited_time", "direction": "ascending"}],
+            page_size=self.page_size,
+        )
+        for page in pages:
+            edited = page.last_edited_time.isoformat()  # type: ignore
+            with self.connection:
+                if page.archived or page.in_trash:
+                    result.removed += self._delete(page.id)
+                else:
+                    self.connection.execute(
+                        "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?)",
+                        (
+                            page.id,
+                            data_source_id,
+                            edited,
+                            page.model_dump_json(by_alias=True, exclude_unset=True),
+                        ),
+                    )
+                    result.upserted += 1
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO watermarks VALUES (?, ?)",
+                    (data_source_id, edited),
+                )
+            result.watermark = edited
+        return result
+
+    def reconcile(self, data_source_id: str) -> int:
+        """
+        Remove stored rows that are no longer in a data source.
+
+        This reads every row of the data source, so run it occasionally rather
+        than on every sync.
+
+        returns: the number of rows removed
+        """
+        data_source_id = parse_id(data_source_id)
+        pages = iter_query(self.client, data_source_id, page_size=self.page_size)
+        live = {page.id for page in pages if not (page.archived or page.in_trash)}
+        removed = 0
+        with self.connection:
+            for (id,) in self.connection.execute(
+                "SELECT id FROM pages WHERE data_source_id = ?", (data_source_id,)
+            ).fetchall():
+                if id not in live:
+                    removed += self._delete(id)
+        return removed
+
+    def _delete(self, id: str) -> int:
+        return self.connection.execute("DELETE FROM pages WHERE id = ?", (id,)).rowcount
+
+    def page(self, id: str) -> Page | None:
+        """The stored copy of a page"""
+        row = self.connection.execute(
+            "SELECT data FROM pages WHERE id = ?", (parse_id(id),)
+        ).fetchone()
+        return None if row is None else Page.from_json_bytes(row[0])
+
+    def pages(self, data_source_id: str) -> list[Page]:
+        """The stored copies of the pages in a data source, oldest edit first"""
+        return [
+            Page.from_json_bytes(data)
+            for (data,) in self.connection.execute(
+                "SELECT data FROM pages WHERE data_source_id = ? ORDER BY edited",
+                (parse_id(data_source_id),),
+            )
+        ]
@@ -0,0 +1,188 @@
+"""
+An index over a fetched tree of blocks for repeated lookups.
+
+A tree fetched with TreeLoader or parsed from markdown is a list of blocks
+whose children are nested in the children field of each block's data. A
+BlockTree indexes such a tree once so that finding a block by id, its parent,
+ancestors and depth, or every block of a type, does not walk the tree. Blocks
+inserted or deleted through the BlockTree update the indexes and the nested
+children lists together, so the blocks stay ready to serialize.
+"""
+
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+
+from .block import BlockUnion, get_children, set_children
+from .regex import parse_id
+
+
+def _is_reference(block: BlockUnion) -> bool:
+    return block.type == "synced_block" and block.synced_block.synced_from is not None
+
+
+@dataclass(eq=False)
+class BlockNode:
+    """A block in a BlockTree with links to its parent and children"""
+
+    block: BlockUnion
+    parent: "BlockNode | None"
+    depth: int
+    children: list["BlockNode"] = field(default_factory=list)
+
+    @property
+    def id(self) -> str | None:
+        return self.block.id
+
+    @property
+    def type(self) -> str:
+        return self.block.type
+
+    def ancestors(self) -> Iterator["BlockNode"]:
+        """The parent, grandparent and so on up to a top level block"""
+        node = self.parent
+        while node is not None:
+            yield node
+            node = node.parent
+
+
+class BlockTree:
+    """
+    Index a list of blocks and all of their descendants by id and by type.
+
+    blocks is the top level list, e.g. the children of a page, and is updated
+    in place by insert and delete. Blocks without an id, such as those made
+    locally, are indexed by type but cannot be looked up by id.
+
+    The content of a synced block reference belongs to its original block and
+    may be shared with other references, so it is not indexed; the reference
+    itself is.
+    """
+
+    def __init__(self, blocks: list[BlockUnion]) -> None:
+        self.blocks = blocks
+        self.roots: list[BlockNode] = []
+        self._ids: dict[str, BlockNode] = {}
+        # an ordered set of the nodes of each type
+        self._types: dict[str, dict[BlockNode, None]] = {}
+        for block in blocks:
+            self.roots.append(self._index(block, None))
+
+    def _index(self, block: BlockUnion, parent: BlockNode | None) -> BlockNode:
+        node = BlockNode(block, parent, 0 if parent is None else parent.depth + 1)
+        if block.id is not None:
+            if block.id in self._ids:
+                raise ValueError(f"block {block.id} is already in the tree")
+            self._ids[block.id] = node
+        self._types.setdefault(block.type, {})[node] = None
+        if _is_reference(block):
+            return node
+        for child in get_children(block) or []:
+            node.children.append(self._index(child, node))
+        return node
+
+    def _unindex(self, node: BlockNode) -> None:
+        if node.id is not None:
+            del self._ids[node.id]
+        del self._types[node.type][node]
+        for child in node.children:
+            self._unindex(child)
+
+    def __len__(self) -> int:
+        return sum(len(nodes) for nodes in self._types.values())
+
+    def __contains__(self, id: str) -> bool:
+        return parse_id(id) in self._ids
+
+    def __iter__(self) -> Iterator[BlockUnion]:
+        """All the blocks depth first, in document order"""
+        stack = list(reversed(self.roots))
+        while stack:
+            node = stack.pop()
+            yield node.block
+            stack.extend(reversed(node.children))
+
+    def node(self, id: str) -> BlockNode:
+        """The node of the block with id, raising KeyError if it is not here"""
+        return self._ids[parse_id(id)]
+
+    def get(self, id: str) -> BlockUnion | None:
+        """The block with id, or None"""
+        node = self._ids.get(parse_id(id))
+        return None if node is None else node.block
+
+    def parent(self, id: str) -> BlockUnion | None:
+        """The parent of the block with id, or None for a top level block"""
+        parent = self.node(id).parent
+        return None if parent is None else parent.block
+
+    def ancestors(self, id: str) -> list[BlockUnion]:
+        """The ancestors of the block with id, its parent first"""
+        return [node.block for node in self.node(id).ancestors()]
+
+    def depth(self, id: str) -> int:
+        """The depth of the block with id, 0 for a top level block"""
+        return self.node(id).depth
+
+    def of_type(self, *types: str) -> list[BlockUnion]:
+        """
+        The blocks of the given types, e.g. "child_page", in the order they
+        were indexed
+        """
+        return [node.block for type in types for node in self._types.get(type, ())]
+
+    def insert(
+        self, block: BlockUnion, parent_id: str | None = None, index: int | None = None
+    ) -> BlockNode:
+        """
+        Add a block and its descendants as a child of the block parent_id, or
+        at the top level, before position index or else last.
+
+        raises: ValueError if the parent cannot hold children or the block is
+        already in the tree
+        """
+        for descendant in BlockTree([block]):
+            if descendant.id is not None and descendant.id in self._ids:
+                raise ValueError(f"block {descendant.id} is already in the tree")
+        if parent_id is None:
+            parent, siblings, nodes = None, self.blocks, self.roots
+        else:
+            parent = self.node(parent_id)
+            if _is_reference(parent.block):
+                raise ValueError("the content of a synced block is in its original")
+            children = get_children(parent.block)
+            if children is None:
+                children = []
+                if not set_children(parent.block, children):
+                    raise ValueError(f"a {parent.type} block cannot hold children")
+            siblings = children
+            nodes = parent.children
+        node = self._index(block, parent)
+        position = len(nodes) if index is None else index
+        nodes.insert(position, node)
+        siblings.insert(position, block)
+        if parent is not None:
+            parent.block.has_children = True
+        return node
+
+    def delete(self, id: str) -> BlockUnion:
+        """Remove the block with id and its descendants, returning the block"""
+        node = self.node(id)
+        if node.parent is None:
+            nodes, siblings = self.roots, self.blocks
+        else:
+            nodes = node.parent.children
+            siblings = get_children(node.parent.block) or []
+        position = nodes.index(node)
+        del nodes[position]
+        del siblings[position]
+        if node.parent is not None and not nodes:
+            node.parent.block.has_children = False
+        self._unindex(node)
+        return node.block
+
+    def extend(
+        self, blocks: Iterable[BlockUnion], parent_id: str | None = None
+    ) -> None:
+        """Insert blocks as the last children of parent_id"""
+        for block in blocks:
+            self.insert(block, parent_id)
@@ -1,5 +1,8 @@
+import asyncio
 import os
+import uuid
 from pathlib import Path
+from types import SimpleNamespace
 
 import pytest
 from notion_client import Client
@@ -37,3 +40,111 @@ def ids():
         user_id = "cbb991ef-0db4-4c20-a298-ce5aad994d09"
 
     return Ids()
+
+
+def _make_block(text: str, has_children: bool = False, type: str = "paragraph"):
+    """Make the json for a text block as returned by blocks.children.list"""
+    return {
+        "object": "block",
+        "id": str(uuid.uuid4()),
+        "has_children": has_children,
+        "type": type,
+        type: {
+            "rich_text": [
+                {"type": "text", "text": {"content": text}, "plain_text": text}
+            ],
+        },
+    }
+
+
+class FakeClient:
+    """A stand-in for notion_client.Client that serves blocks from memory"""
+
+    def __init__(self, children: dict[str, list[dict]], pages: dict | None = None):
+        self.children = children
+        self.page_data = pages or {}
+        self.calls: list[tuple[str, str | None]] = []
+        self.appends: list[tuple[str, int]] = []
+        self.blocks = SimpleNamespace(
+            children=SimpleNamespace(list=self.list, append=self.append)
+        )
+        self.pages = SimpleNamespace(retrieve=self.retrieve, create=self.create)
+
+    def retrieve(self, page_id: str):
+        return self.page_data[page_id]
+
+    def create(self, parent: dict, properties: dict, **kwargs):
+        page = {"object": "page", "id": str(uuid.uuid4()), "parent": parent}
+        page.update(properties=properties, **kwargs)
+        self.page_data[page["id"]] = page
+        return page
+
+    def append(self, block_id: str, children: list[dict]):
+        self.appends.append((block_id, len(children)))
+        results = [
+            {"object": "block", "id": str(uuid.uuid4()), "has_children": False} | child
+            for child in children
+        ]
+        self.children.setdefault(block_id, []).extend(results)
+        return {"object": "list", "results": results}
+
+    def list(self, block_id: str, start_cursor: str | None = None, page_size=100):
+        self.calls.append((block_id, start_cursor))
+        return self._page_of(self.children.get(block_id, []), start_cursor, page_size)
+
+    def _page_of(self, results, start_cursor: str | None = None, page_size=100):
+        start = int(start_cursor or 0)
+        end = start + page_size
+        return {
+            "object": "list",
+            "type": "block",
+            "block": {},
+            "results": results[start:end],
+            "next_cursor": str(end) if end < len(results) else None,
+            "has_more": end < len(results),
+        }
+
+
+class FakeAsyncClient(FakeClient):
+    """A stand-in for notion_client.AsyncClient that serves blocks from memory"""
+
+    def __init__(
+        self, children: dict[str, list[dict]], pages: dict | None = None, delay=0.0
+    ):
+        super().__init__(children, pages)
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def append(self, block_id: str, children: list[dict]):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            return super().append(block_id, children)
+        finally:
+            self.in_flight -= 1
+
+    async def list(self, block_id: str, start_cursor: str | None = None, page_size=100):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            return super().list(block_id, start_cursor, page_size)
+        finally:
+            self.in_flight -= 1
+
+
+@pytest.fixture
+def make_block():
+    return _make_block
+
+
+@pytest.fixture
+def fake_client():
+    return FakeClient
+
+
+@pytest.fixture
+def fake_async_client():
+    return FakeAsyncClient
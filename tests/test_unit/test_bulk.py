@@ -0,0 +1,93 @@
+"""
+Test validating dumps across a process pool.
+"""
+
+import json
+import pickle
+
+import pytest
+
+from notion_data.__main__ import main
+from notion_data.bulk import validate_dump
+from notion_data.page import Page
+
+
+@pytest.fixture
+def dump(tmp_path, data_folder):
+    """An ndjson export of a page and many blocks, with one invalid block"""
+    page = json.loads((data_folder / "page2.json").read_text())
+    block = json.loads((data_folder / "code.json").read_text())
+    records = [{"kind": "page", "parent": None, "data": page}]
+    records += [{"kind": "block", "parent": page["id"], "data": block}] * 40
+    records[17] = {"kind": "block", "parent": None, "data": {"type": "nonsense"}}
+    path = tmp_path / "dump.ndjson"
+    path.write_text("".join(json.dumps(record) + "\n" for record in records))
+    return path
+
+
+def test_validate_ndjson(dump):
+    results = list(validate_dump(dump, workers=2, chunk_size=3))
+
+    assert [result.position for result in results] == list(range(41))
+    assert isinstance(results[0].model, Page)
+    assert results[1].model.type == "code"
+    assert results[17].model is None
+    assert results[17].errors
+
+
+def test_unordered_without_models(dump):
+    results = list(
+        validate_dump(dump, workers=2, chunk_size=3, ordered=False, keep_models=False)
+    )
+
+    assert sorted(result.position for result in results) == list(range(41))
+    assert all(result.model is None for result in results)
+    assert [result.position for result in results if result.errors] == [17]
+
+
+def test_validate_directory(tmp_path, data_folder, make_block):
+    (tmp_path / "a.json").write_text((data_folder / "page1.json").read_text())
+    listing = {"object": "list", "results": [make_block("one"), make_block("two")]}
+    (tmp_path / "b.json").write_text(json.dumps(listing))
+
+    results = list(validate_dump(tmp_path, workers=1))
+
+    assert [(r.position, r.item, r.kind) for r in results] == [
+        (0, 0, "page"),
+        (1, 0, "block"),
+        (1, 1, "block"),
+    ]
+
+
+def test_records_not_objects(tmp_path, data_folder):
+    block = (data_folder / "code.json").read_text()
+    dump = tmp_path / "dump.ndjson"
+    record = {"kind": "block", "parent": None, "data": json.loads(block)}
+    lines = ["1", "[]", json.dumps({"kind": [], "data": {}}), json.dumps(record)]
+    dump.write_text("".join(line + "\n" for line in lines))
+    folder = tmp_path / "folder"
+    folder.mkdir()
+    (folder / "a.json").write_text("[1, 2]")
+    (folder / "b.json").write_text('{"object": "list", "results": [1]}')
+    (folder / "c.json").write_text(block)
+
+    results = list(validate_dump(dump, workers=1))
+    assert [bool(result.errors) for result in results] == [True, True, True, False]
+    results = list(validate_dump(folder, workers=1))
+    assert [bool(result.errors) for result in results] == [True, True, False]
+
+
+def test_page_pickles(data_folder):
+    # models are returned from the workers by pickling, including the
+    # properties models created at runtime
+    page = Page(**json.loads((data_folder / "page2.json").read_text()))
+    assert pickle.loads(pickle.dumps(page)) == page
+
+
+def test_cli(dump, capsys):
+    with pytest.raises(SystemExit) as exit:
+        main(["validate", str(dump), "-j", "2"])
+    assert exit.value.code == 1
+    output = capsys.readouterr().out
+    assert "line 18" in output
+    assert "40 valid, 1 invalid" in output
@@ -0,0 +1,84 @@
+"""
+Test the SQLite cache of pages and block trees.
+"""
+
+import json
+import uuid
+
+import pytest
+
+from notion_data.cache import CachedReader, ModelCache
+from notion_data.page import Page
+
+
+@pytest.fixture
+def workspace(data_folder, make_block):
+    page = json.loads((data_folder / "page1.json").read_text())
+    toggle = make_block("toggle", True, "toggle")
+    children = {
+        page["id"]: [make_block("first"), toggle],
+        toggle["id"]: [make_block("inner")],
+    }
+    return children, {page["id"]: page}
+
+
+def test_reader(tmp_path, workspace, fake_client):
+    client = fake_client(*workspace)
+    page_id = next(iter(client.page_data))
+    cache = ModelCache(tmp_path / "cache.db")
+    reader = CachedReader(client, cache)
+
+    blocks = reader.blocks(page_id)
+    assert [block.type for block in blocks.root] == ["paragraph", "toggle"]
+    assert len(client.calls) == 2
+
+    # unchanged pages are served from the cache, even by a new cache object
+    cache.close()
+    reader = CachedReader(client, ModelCache(tmp_path / "cache.db"))
+    assert reader.blocks(page_id) == blocks
+    assert len(client.calls) == 2
+
+    # an edited page has its blocks fetched again
+    client.page_data[page_id]["last_edited_time"] = "2030-01-01T00:00:00.000Z"
+    reader.blocks(page_id)
+    assert len(client.calls) == 4
+
+
+def test_max_age(tmp_path, workspace, fake_client, monkeypatch):
+    client = fake_client(*workspace)
+    page_id = next(iter(client.page_data))
+    retrieved = []
+    retrieve = client.pages.retrieve
+    monkeypatch.setattr(
+        client.pages,
+        "retrieve",
+        lambda page_id: retrieved.append(1) or retrieve(page_id),
+    )
+    reader = CachedReader(client, ModelCache(tmp_path / "cache.db"), max_age=60)
+
+    first = reader.page(page_id)
+    assert reader.page(page_id.replace("-", "")) == first
+    assert len(retrieved) == 1
+
+
+def test_put_and_evict(tmp_path, data_folder):
+    page = Page(**json.loads((data_folder / "page1.json").read_text()))
+    cache = ModelCache(tmp_path / "cache.db", max_bytes=10_000_000)
+
+    assert cache.put(page)
+    assert not cache.put(page)
+    assert cache.is_current(page.id, page.last_edited_time)  # type: ignore
+    assert cache.page(page.id) == page
+
+    edited = page.model_copy(update={"last_edited_time": None})
+    assert cache.put(edited)
+    assert not cache.is_current(page.id, page.last_edited_time)  # type: ignore
+
+    # copies of the page under other ids overflow the cache, evicting the oldest
+    cache.max_bytes = cache.size * 3
+    ids = [str(uuid.UUID(int=i)) for i in range(1, 6)]
+    for id in ids:
+        cache.put(page.model_copy(update={"id": id}))
+    assert cache.size <= cache.max_bytes
+    assert cache.page(page.id) is None
+    assert cache.page(ids[-1]) is not None
@@ -0,0 +1,73 @@
+"""
+Test extracting database rows into numpy columns.
+"""
+
+import copy
+import json
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from notion_data.columns import page_columns  # noqa: E402
+from notion_data.page import Page, database_page_model  # noqa: E402
+
+
+@pytest.fixture
+def rows(data_folder):
+    """Three rows of a database, as json, with some empty properties"""
+    page = json.loads((data_folder / "page2.json").read_text())
+    page["properties"]["Estimate"] = {"id": "a", "type": "number", "number": 2.5}
+    page["properties"]["Done"] = {"id": "b", "type": "checkbox", "checkbox": True}
+    page["properties"]["Tags"] = {
+        "id": "c",
+        "type": "multi_select",
+        "multi_select": [{"name": "ui"}, {"name": "api"}],
+    }
+    rows = [copy.deepcopy(page) for _ in range(3)]
+    rows[1]["properties"]["Status"]["status"]["name"] = "Done"
+    rows[1]["properties"]["Due date"]["date"]["start"] = "2023-03-01T09:30:00+01:00"
+    rows[1]["properties"]["Title"]["title"][0]["plain_text"] = "Triage"
+    rows[1]["properties"]["Tags"]["multi_select"] = [{"name": "ui"}]
+    rows[2]["properties"]["Tags"]["multi_select"] = []
+    rows[2]["properties"]["Done"]["checkbox"] = False
+    del rows[2]["properties"]["Estimate"]
+    del rows[2]["properties"]["Status"]
+    return rows
+
+
+def _check(columns):
+    assert list(columns) == ["Due date", "Status", "Title", "Estimate", "Done", "Tags"]
+    np.testing.assert_array_equal(columns["Estimate"], [2.5, 2.5, np.nan])
+    assert columns["Done"].tolist() == [True, True, False]
+    assert columns["Due date"].dtype == np.dtype("datetime64[us]")
+    assert columns["Due date"][1] == np.datetime64("2023-03-01T08:30:00")
+    assert columns["Status"].categories == ["Done", "Not started"]
+    assert columns["Status"].codes.tolist() == [1, 0, -1]
+    assert list(columns["Title"]) == ["Bug bash", "Triage", "Bug bash"]
+    assert columns["Tags"].categories == ["api", "ui"]
+    assert columns["Tags"].members.tolist() == [
+        [True, True],
+        [False, True],
+        [False, False],
+    ]
+
+
+def test_database_model(rows):
+    schema = {
+        name: {"type": value["type"]} for name, value in rows[0]["properties"].items()
+    }
+    model = database_page_model(schema)
+    _check(page_columns(model(**row) for row in rows))
+
+
+def test_dynamic_pages(rows):
+    # without a database model each row has its own properties, so the
+    # missing properties of the last row are absent rather than None
+    _check(page_columns([Page(**row) for row in rows]))
+
+
+def test_select_names(rows):
+    columns = page_columns([Page(**row) for row in rows], names=["Done"])
+    assert list(columns) == ["Done"]
+    assert page_columns([]) == {}
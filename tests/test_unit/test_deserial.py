@@ -25,6 +25,24 @@ def test_block(data_folder):
     pprint(block.model_dump())
 
 
+def test_block_parent(data_folder):
+    """
+    example: https://developers.notion.com/reference/parent-object
+    """
+    p = data_folder / "block.json"
+    with p.open() as f:
+        data = json.load(f)
+    data["parent"] = {
+        "type": "block_id",
+        "block_id": "7d50a184-5bbe-4d90-8f29-6bec57ed817b",
+    }
+
+    block = Block.validate_python(data)
+    assert block.parent.type == "block_id"
+    assert block.parent.block_id == "7d50a184-5bbe-4d90-8f29-6bec57ed817b"
+    assert block.model_dump(by_alias=True)["parent"] == data["parent"]
+
+
 def test_bookmark(data_folder):
     """
     example: https://developers.notion.com/reference/block
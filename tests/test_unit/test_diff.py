@@ -0,0 +1,61 @@
+"""
+Test making minimal update payloads from edited pages and blocks.
+"""
+
+import json
+
+import pytest
+
+from notion_data.block import Block
+from notion_data.diff import block_update, page_update
+from notion_data.page import Page
+
+
+@pytest.fixture
+def page(data_folder):
+    return Page(**json.loads((data_folder / "page2.json").read_text()))
+
+
+def test_unchanged(page):
+    assert page_update(page, page.model_copy(deep=True)) == {}
+
+
+def test_page_update(page):
+    edited = page.model_copy(deep=True)
+    edited.properties.Title.title[0].text.content = "Renamed"  # type: ignore
+    edited.in_trash = False
+
+    payload = page_update(page, edited)
+
+    assert set(payload) == {"properties", "in_trash"}
+    assert list(payload["properties"]) == ["Title"]
+    title = payload["properties"]["Title"]
+    assert "id" not in title
+    assert title["title"][0]["text"]["content"] == "Renamed"
+
+
+def test_read_only_properties(data_folder):
+    data = json.loads((data_folder / "page2.json").read_text())
+    data["properties"]["Created"] = {
+        "id": "abc",
+        "type": "created_time",
+        "created_time": "2024-01-01T00:00:00.000Z",
+    }
+    page = Page(**data)
+
+    # a read only property that differs is never sent
+    data["properties"]["Created"]["created_time"] = "2025-01-01T00:00:00.000Z"
+    assert page_update(page, Page(**data)) == {}
+
+
+def test_block_update(data_folder):
+    block = Block.validate_python(json.loads((data_folder / "code.json").read_text()))
+    edited = block.model_copy(deep=True)
+    edited.code.language = "rust"  # type: ignore
+
+    assert block_update(block, edited) == {"code": {"language": "rust"}}
+    assert block_update(block, block) == {}
+
+    other = Block.validate_python(json.loads((data_folder / "block.json").read_text()))
+    with pytest.raises(ValueError):
+        block_update(block, other)
@@ -0,0 +1,57 @@
+"""
+Tests for the runtime property models created for database pages.
+"""
+
+import json
+
+from notion_data.dynamic import model_cache_clear, model_cache_info
+from notion_data.page import Date, Page, Status, database_page_model
+
+
+def test_pages_share_property_model(data_folder):
+    p = data_folder / "page2.json"
+    with p.open() as f:
+        data = json.load(f)
+
+    model_cache_clear()
+    page1 = Page(**data)
+    page2 = Page(**data)
+
+    assert type(page1.properties) is type(page2.properties)
+    info = model_cache_info()
+    assert info.misses == 1
+    assert info.hits == 1
+
+
+def test_property_model_per_schema(data_folder):
+    with (data_folder / "page1.json").open() as f:
+        data1 = json.load(f)
+    with (data_folder / "page2.json").open() as f:
+        data2 = json.load(f)
+
+    model_cache_clear()
+    page1 = Page(**data1)
+    page2 = Page(**data2)
+
+    assert type(page1.properties) is not type(page2.properties)
+    assert model_cache_info().currsize == 2
+
+
+def test_database_page_model(data_folder):
+    with (data_folder / "database.json").open() as f:
+        schema = json.load(f)
+    with (data_folder / "page2.json").open() as f:
+        data = json.load(f)
+
+    DatabasePage = database_page_model(schema)
+    model_cache_clear()
+    page = DatabasePage(**data)
+
+    assert isinstance(page, Page)
+    assert isinstance(page.properties.Due_date, Date)
+    assert isinstance(page.properties.Status, Status)
+    assert page.properties.Title.title[0].plain_text == "Bug bash"
+    assert model_cache_info().misses == 0
+
+    dumped = page.properties.model_dump(by_alias=True, exclude_unset=True)
+    assert list(dumped) == ["Due date", "Status", "Title"]
@@ -0,0 +1,142 @@
+"""
+Test the in-process fake of the Notion API.
+"""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+from notion_client import APIResponseError, Client
+
+from notion_data.block import Blocks
+from notion_data.fake_server import FakeNotion
+from notion_data.page import Page
+from notion_data.paginate import aiter_blocks, iter_blocks
+from notion_data.scheduler import RateLimitTransport, Scheduler
+
+PAGE_ID = "be633bf1-dfa0-436d-b259-571129a590e5"
+DATABASE_ID = "a1d8501e-1ac1-43e9-a6bd-ea9fe6c8822b"
+# the page that the block fixtures belong to
+PARENT_ID = "59833787-2cf9-4fdf-8782-e53db20768a5"
+
+
+@pytest.fixture
+def fake(data_folder):
+    return FakeNotion.from_folder(data_folder)
+
+
+def test_retrieve(fake):
+    client = fake.client(retry=False)
+
+    page = Page(**client.pages.retrieve(page_id=PAGE_ID.replace("-", "")))
+    assert page.id == PAGE_ID
+    children = Blocks(**client.blocks.children.list(block_id=PARENT_ID))
+    assert [block.type for block in children.results][:2] == ["heading_2", "bookmark"]
+
+    with pytest.raises(APIResponseError) as error:
+        client.pages.retrieve(page_id=PARENT_ID)
+    assert error.value.status == 404
+
+
+def test_pagination_and_append(fake, make_block):
+    client = fake.client(retry=False)
+    page = client.pages.create(
+        parent={"page_id": PAGE_ID},
+        properties={},
+        children=[make_block(f"block {i}") for i in range(30)],
+    )
+    client.blocks.children.append(
+        block_id=page["id"], children=[make_block("last", type="quote")]
+    )
+
+    blocks = list(iter_blocks(client, page["id"], page_size=7))
+
+    assert len(blocks) == 31
+    assert blocks[-1].type == "quote"
+    assert fake.calls["GET blocks/{id}/children"] == 5
+
+    with pytest.raises(APIResponseError):
+        client.blocks.children.list(block_id=page["id"], page_size=101)
+
+
+def test_query(fake):
+    row = fake.add({**fake.pages[PAGE_ID], "id": None, "in_trash": False})
+    fake.pages[row]["last_edited_time"] = "2024-01-01T00:00:00.000Z"
+    client = fake.client(retry=False)
+
+    def query(**body):
+        return client.request(f"databases/{DATABASE_ID}/query", "POST", body=body)
+
+    # the fixture page is in the trash, so only the new row is listed
+    assert [page["id"] for page in query()["results"]] == [row]
+    since = {"on_or_after": "2024-06-01T00:00:00Z"}
+    filter = {"timestamp": "last_edited_time", "last_edited_time": since}
+    assert query(filter=filter)["results"] == []
+
+
+def test_rate_limit(data_folder):
+    fake = FakeNotion.from_folder(data_folder, rate=20, burst=2)
+    client = fake.client(retry=False)
+
+    client.pages.retrieve(page_id=PAGE_ID)
+    client.pages.retrieve(page_id=PAGE_ID)
+    with pytest.raises(APIResponseError) as error:
+        client.pages.retrieve(page_id=PAGE_ID)
+    assert error.value.status == 429
+
+    # the scheduler waits for the Retry-After and tries again
+    scheduler = Scheduler(rate=100, burst=10)
+    transport = RateLimitTransport(scheduler, fake.transport())
+    http = httpx.Client(transport=transport, base_url="https://api.notion.com/v1/")
+    for _ in range(6):
+        assert http.get(f"pages/{PAGE_ID}").status_code == 200
+    assert scheduler.metrics.throttled > 0
+
+
+def test_errors(fake):
+    client = fake.client(retry=False)
+    fake.fail_next(503, count=2)
+
+    for _ in range(2):
+        with pytest.raises(APIResponseError) as error:
+            client.pages.retrieve(page_id=PAGE_ID)
+        assert error.value.status == 503
+    client.pages.retrieve(page_id=PAGE_ID)
+
+    fake.error_rate = 0.5
+    for _ in range(40):
+        fake.handle(httpx.Request("GET", f"https://api.notion.com/v1/pages/{PAGE_ID}"))
+    assert fake.statuses[200] > 10
+    assert sum(fake.statuses[status] for status in (500, 502, 503)) > 10
+
+
+def test_async_latency(fake):
+    fake.latency = 0.1
+    client = fake.async_client(retry=False)
+
+    async def fetch():
+        return await asyncio.gather(
+            *(client.pages.retrieve(page_id=PAGE_ID) for _ in range(5)),
+            _collect(aiter_blocks(client, PARENT_ID)),
+        )
+
+    start = time.monotonic()
+    *pages, blocks = asyncio.run(fetch())
+    # the requests wait for their latency concurrently
+    assert time.monotonic() - start < 0.5
+    assert len(pages) == 5 and len(blocks) == 7
+
+
+async def _collect(iterator):
+    return [item async for item in iterator]
+
+
+def test_serve(fake):
+    server = fake.serve()
+    try:
+        client = Client(retry=False, base_url=f"http://127.0.0.1:{server.server_port}")
+        assert client.pages.retrieve(page_id=PAGE_ID)["id"] == PAGE_ID
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,35 @@
+"""
+Test the validation of Notion ids.
+"""
+
+import pytest
+from pydantic import ValidationError
+
+from notion_data.identify import NotionUser
+from notion_data.parent import PageParent
+
+
+def test_dashed_and_undashed_ids():
+    dashed = PageParent(page_id="da6398fd-2105-4091-9fc0-bd70e33f18c7")
+    undashed = PageParent(page_id="DA6398FD210540919FC0BD70E33F18C7")
+
+    assert undashed.page_id == "da6398fd-2105-4091-9fc0-bd70e33f18c7"
+    assert undashed.model_dump_json() == dashed.model_dump_json()
+
+
+@pytest.mark.parametrize(
+    "bad_id",
+    [
+        "",
+        "not an id",
+        "da6398fd2105-4091-9fc0-bd70e33f18c7a",
+        "da6398fd-2105-4091-9fc0-bd70e33f18c",
+        "da6398fd-2105-4091-9fc0-bd70e33f18c7-",
+        "da6398fd-2105-4091-9fc0-bd70e33f18c!",
+        "da6398fd-2105-4091-9fc0-bd70e33f",
+        "abcdefghij-klmnopqrstuvwxyz",
+    ],
+)
+def test_invalid_ids(bad_id):
+    with pytest.raises(ValidationError):
+        NotionUser(id=bad_id)
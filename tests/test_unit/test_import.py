@@ -0,0 +1,50 @@
+"""
+Test that importing the models stays fast by deferring schema construction.
+"""
+
+import subprocess
+import sys
+
+# seconds allowed to import the model modules, once pydantic itself is imported
+IMPORT_BUDGET = 0.5
+
+IMPORT_TIME = """
+import time
+import pydantic
+start = time.perf_counter()
+import notion_data.block, notion_data.helpers, notion_data.page
+print(time.perf_counter() - start)
+"""
+
+SCHEMAS_BUILT = """
+from pydantic import BaseModel
+from notion_data import block, helpers, page
+
+def subclasses(cls):
+    for sub in cls.__subclasses__():
+        yield sub
+        yield from subclasses(sub)
+
+built = [
+    cls.__name__
+    for cls in subclasses(BaseModel)
+    if cls.__module__.startswith("notion_data") and cls.__pydantic_complete__
+]
+if block.Block.pydantic_complete:
+    built.append("Block")
+print(built)
+"""
+
+
+def run(code: str) -> str:
+    return subprocess.check_output([sys.executable, "-c", code]).decode().strip()
+
+
+def test_import_time():
+    # take the best of a few runs to ignore noise from a busy machine
+    elapsed = min(float(run(IMPORT_TIME)) for _ in range(3))
+    assert elapsed < IMPORT_BUDGET
+
+
+def test_import_defers_schemas():
+    assert run(SCHEMAS_BUILT) == "[]"
@@ -0,0 +1,53 @@
+"""
+Test validating raw json bytes straight into models.
+"""
+
+import json
+
+import httpx
+import pytest
+from notion_client import APIResponseError
+
+from notion_data.block import Blocks, BlocksList, block_from_json_bytes
+from notion_data.client import RawClient
+from notion_data.page import Page
+
+
+def test_page_from_json_bytes(data_folder):
+    raw = (data_folder / "page2.json").read_bytes()
+
+    page = Page.from_json_bytes(raw)
+
+    assert page == Page(**json.loads(raw))
+    assert page.properties.Title.title[0].plain_text == "Bug bash"
+
+
+def test_blocks_from_json_bytes(data_folder):
+    raw = (data_folder / "code.json").read_bytes()
+
+    block = block_from_json_bytes(raw)
+    blocks = Blocks.from_json_bytes(b'{"results": [%s]}' % raw)
+    blocks_list = BlocksList.from_json_bytes(b"[%s]" % raw)
+
+    assert block.code.language == "javascript"
+    assert blocks.results == [block]
+    assert blocks_list.root == [block]
+
+
+def test_raw_client(data_folder):
+    raw = (data_folder / "page1.json").read_bytes()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("missing"):
+            body = {"object": "error", "code": "object_not_found", "message": "no"}
+            return httpx.Response(404, json=body)
+        return httpx.Response(200, content=raw)
+
+    transport = httpx.MockTransport(handler)
+    client = RawClient(auth="secret", client=httpx.Client(transport=transport))
+
+    result = client.pages.retrieve(page_id="8e0d8f87b513486f8a3cea085ce5c308")
+    assert result == raw
+    assert Page.from_json_bytes(result).id == "8e0d8f87-b513-486f-8a3c-ea085ce5c308"
+    with pytest.raises(APIResponseError):
+        client.pages.retrieve(page_id="missing")
@@ -0,0 +1,39 @@
+"""
+Test the lazy validation of block lists.
+"""
+
+import json
+
+import pytest
+from pydantic import ValidationError
+
+from notion_data.block import Blocks, LazyBlocks
+
+
+def test_lazy_blocks(data_folder, make_block):
+    with (data_folder / "block.json").open() as f:
+        heading = json.load(f)
+    child_page = make_block("", True, "child_page")
+    # invalid child_page data is not noticed until the block is used
+    blocks = LazyBlocks(results=[heading, child_page], has_more=False)
+
+    assert [b.type for b in blocks.results] == ["heading_2", "child_page"]
+    assert blocks.results[0].id == "c02fc1d3-db8b-45c5-a222-27595b15aea7"
+    assert not any(b.is_validated for b in blocks.results)
+
+    assert blocks.results[0].heading_2.rich_text[0].plain_text == "Lacinato kale"
+    assert blocks.results[0].is_validated
+    with pytest.raises(ValidationError):
+        blocks.results[1].child_page  # noqa: B018
+
+
+def test_lazy_blocks_dump(data_folder):
+    with (data_folder / "block.json").open() as f:
+        heading = json.load(f)
+    lazy = LazyBlocks(results=[heading])
+    eager = Blocks(results=[heading])
+
+    # unvalidated blocks serialize as their raw json
+    assert Blocks(**lazy.model_dump(by_alias=True, exclude_unset=True)) == eager
+    lazy.results[0].heading_2.color = "red"
+    assert lazy.model_dump()["results"][0]["heading_2"]["color"] == "red"
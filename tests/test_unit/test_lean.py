@@ -0,0 +1,102 @@
+"""
+Test validating models in lean mode.
+"""
+
+import json
+
+import pytest
+from pydantic import ValidationError
+
+from notion_data.block import Block, Blocks
+from notion_data.lean import LeanValidator
+from notion_data.page import Page
+from notion_data.root import notion_json
+
+ANNOTATIONS = {
+    "bold": False,
+    "italic": False,
+    "strikethrough": False,
+    "underline": False,
+    "code": False,
+    "color": "default",
+}
+USER = {"object": "user", "id": "c2f20311-9e54-4d11-8c79-7398424ae41e"}
+
+
+def _blocks(make_block, count: int) -> list[dict]:
+    blocks = []
+    for i in range(count):
+        block = make_block(f"text {i}")
+        block["paragraph"]["rich_text"][0]["annotations"] = dict(ANNOTATIONS)
+        block["created_by"] = dict(USER)
+        block["created_time"] = "2023-03-08T18:25:00.000Z"
+        blocks.append(block)
+    return blocks
+
+
+def test_values_shared(make_block):
+    data = _blocks(make_block, 3)
+    lean = LeanValidator()
+    blocks = [lean.validate(Block, block) for block in data]
+
+    first, second, _ = blocks
+    text = first.paragraph.rich_text[0]
+    assert text.annotations is second.paragraph.rich_text[0].annotations
+    assert first.created_by is second.created_by
+    assert first.created_time is second.created_time
+    assert text.plain_text is text.text.content
+
+
+def test_ids_shared(data_folder):
+    data = json.loads((data_folder / "block.json").read_text())
+    lean = LeanValidator()
+    blocks = [lean.validate(Block, json.dumps(data)) for _ in range(3)]
+
+    assert blocks[0].created_by.id is blocks[2].last_edited_by.id
+    assert blocks[0].parent.page_id is blocks[1].parent.page_id
+
+
+def test_json_text(make_block):
+    data = json.dumps({"results": _blocks(make_block, 2)})
+    blocks = LeanValidator().validate(Blocks, data).results
+
+    assert blocks[0].created_by is blocks[1].created_by
+    assert blocks[1].paragraph.rich_text[0].plain_text == "text 1"
+
+
+def test_not_shared_between_validators(make_block):
+    data = _blocks(make_block, 1)
+    first = LeanValidator().validate(Block, data[0])
+    second = LeanValidator().validate(Block, data[0])
+
+    assert first.created_by is not second.created_by
+
+
+def test_same_output(make_block, data_folder):
+    data = _blocks(make_block, 2)
+    page = json.loads((data_folder / "page2.json").read_text())
+    # user properties hold a page.User rather than the users of the page itself
+    page["properties"].update(
+        Creator={"id": "a", "type": "created_by", "created_by": dict(USER)},
+        Editor={"id": "b", "type": "last_edited_by", "last_edited_by": dict(USER)},
+        Owners={"id": "c", "type": "people", "people": [dict(USER)]},
+    )
+    normal = [Block.validate_python(block) for block in data] + [Page(**page)]
+    validator = LeanValidator()
+    lean = [validator.validate(Block, block) for block in data]
+    lean.append(validator.validate(Page, page))
+
+    for expected, model in zip(normal, lean):
+        assert model.model_dump(by_alias=True) == expected.model_dump(by_alias=True)
+        assert notion_json(model) == notion_json(expected)
+    # the page itself shares its creator with the blocks
+    assert lean[-1].created_by is lean[0].created_by
+
+
+def test_shared_frozen(make_block):
+    block = LeanValidator().validate(Block, _blocks(make_block, 1)[0])
+
+    with pytest.raises(ValidationError):
+        block.paragraph.rich_text[0].annotations.bold = True
+    with pytest.raises(ValidationError):
+        block.created_by.id = USER["id"]
@@ -0,0 +1,116 @@
+"""
+Test fetching block trees concurrently.
+"""
+
+import asyncio
+import uuid
+
+from notion_data.block import Block, get_children
+from notion_data.loader import TreeLoader
+from notion_data.tree import BlockTree
+
+
+def make_tree(make_block, width: int, depth: int):
+    """Make blocks.children.list json for a tree of toggles with leaf paragraphs"""
+    children = {}
+
+    def add(parent: str, level: int):
+        blocks = []
+        for i in range(width):
+            if level < depth:
+                block = make_block(f"toggle {level}.{i}", True, "toggle")
+                add(block["id"], level + 1)
+            else:
+                block = make_block(f"leaf {i}")
+            blocks.append(block)
+        children[parent] = blocks
+
+    add("page", 1)
+    return children
+
+
+def test_load_tree(fake_async_client, make_block):
+    client = fake_async_client(make_tree(make_block, width=3, depth=3))
+    loader = TreeLoader(client)
+
+    blocks = asyncio.run(loader.load("page"))
+
+    assert len(blocks) == 3
+    grandchildren = get_children(get_children(blocks[0])[1])
+    assert [b.paragraph.rich_text[0].text.content for b in grandchildren] == [
+        "leaf 0",
+        "leaf 1",
+        "leaf 2",
+    ]
+    assert sorted(loader.timings) == [0, 1, 2]
+    assert [loader.timings[d].calls for d in range(3)] == [1, 3, 9]
+    assert loader.timings[2].blocks == 27
+    assert all(timing.seconds >= 0 for timing in loader.timings.values())
+
+
+def test_load_tree_concurrency(fake_async_client, make_block):
+    client = fake_async_client(make_tree(make_block, width=6, depth=2), delay=0.01)
+    loader = TreeLoader(client, concurrency=2)
+
+    asyncio.run(loader.load("page"))
+
+    assert len(client.calls) == 7
+    assert client.max_in_flight == 2
+
+
+def test_load_skips_child_pages(fake_async_client, make_block):
+    child_page = make_block("", True, "child_page")
+    child_page["child_page"] = {"title": "Sub page"}
+    client = fake_async_client({"page": [child_page], child_page["id"]: []})
+
+    asyncio.run(TreeLoader(client).load("page"))
+
+    assert client.calls == [("page", None)]
+
+
+def _synced(make_block, source: str | None):
+    block = make_block("", True, "synced_block")
+    synced_from = None if source is None else {"block_id": source}
+    block["synced_block"] = {"synced_from": synced_from}
+    return block
+
+
+def test_synced_blocks_fetched_once(fake_async_client, make_block):
+    original = _synced(make_block, None)
+    external = str(uuid.uuid4())
+    page = [original] + [_synced(make_block, original["id"]) for _ in range(3)]
+    page += [_synced(make_block, external) for _ in range(2)]
+    client = fake_async_client(
+        {
+            "page": page,
+            original["id"]: [make_block("shared")],
+            external: [make_block("external")],
+        },
+        delay=0.01,
+    )
+
+    blocks = asyncio.run(TreeLoader(client).load("page"))
+
+    assert sorted(block_id for block_id, _ in client.calls) == sorted(
+        ["page", original["id"], external]
+    )
+    contents = [get_children(block) for block in blocks]
+    assert all(children is contents[0] for children in contents[:4])
+    assert contents[4] is contents[5]
+    assert contents[5][0].paragraph.rich_text[0].text.content == "external"
+    # the shared content is only indexed under the original
+    assert len(BlockTree(blocks)) == 7
+
+
+def test_resolve_synced(fake_async_client, make_block):
+    external = str(uuid.uuid4())
+    data = [_synced(make_block, external) for _ in range(3)]
+    blocks = [Block.validate_python(block) for block in data]
+    client = fake_async_client({external: [make_block("external")]})
+
+    fetched = asyncio.run(TreeLoader(client).resolve_synced(blocks))
+
+    assert fetched == 1
+    assert client.calls == [(external, None)]
+    assert get_children(blocks[0]) is get_children(blocks[2])
+    assert len(get_children(blocks[1])) == 1
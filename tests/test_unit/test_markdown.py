@@ -0,0 +1,169 @@
+"""
+Test compiling Markdown into blocks and uploading them in batches.
+"""
+
+import asyncio
+
+from notion_data.markdown import (
+    MAX_BLOCKS,
+    MAX_CHILDREN,
+    MAX_TEXT,
+    Uploader,
+    parse_inline,
+    parse_markdown,
+    plan_batches,
+)
+from notion_data.render import iter_markdown, plain_text
+
+DOCUMENT = """\
+# Title
+
+Some **bold** and *italic* text
+over two lines with `code` and a [link](https://example.com).
+
+- one
+  - one a
+    - one a i
+- two
+- [ ] todo
+- [x] done
+
+1. first
+2. second
+
+> quoted ~~text~~
+
+---
+
+```py
+print("hello")
+```
+"""
+
+
+def test_parse_markdown():
+    blocks = parse_markdown(DOCUMENT)
+
+    assert [block.type for block in blocks] == [
+        "heading_1",
+        "paragraph",
+        "bulleted_list_item",
+        "bulleted_list_item",
+        "to_do",
+        "to_do",
+        "numbered_list_item",
+        "numbered_list_item",
+        "quote",
+        "divider",
+        "code",
+    ]
+    paragraph = blocks[1].paragraph.rich_text  # type: ignore
+    assert [text.annotations and text.annotations.bold for text in paragraph][:2] == [
+        None,
+        True,
+    ]
+    assert paragraph[-2].text.link.url == "https://example.com"  # type: ignore
+    one = blocks[2].bulleted_list_item.children  # type: ignore
+    assert one[0].bulleted_list_item.children[0].type == "bulleted_list_item"
+    assert blocks[5].to_do.checked  # type: ignore
+    assert blocks[10].code.language == "python"  # type: ignore
+
+
+def test_markdown_round_trip():
+    rendered = "".join(iter_markdown(parse_markdown(DOCUMENT)))
+
+    assert rendered.startswith("# Title\n\nSome **bold** and *italic* text over")
+    assert "- one\n  - one a\n    - one a i\n- two\n- [ ] todo\n" in rendered
+    assert '```python\nprint("hello")\n```' in rendered
+
+
+def test_emphasis_flanking():
+    def runs(text):
+        return [
+            (run["text"]["content"], run.get("annotations"))
+            for run in parse_inline(text)
+        ]
+
+    assert runs("call my_var_name now") == [("call my_var_name now", None)]
+    assert runs("2 * 3 * 4") == [("2 * 3 * 4", None)]
+    assert runs("_a_, *b* and ** c **") == [
+        ("a", {"italic": True}),
+        (", ", None),
+        ("b", {"italic": True}),
+        (" and ** c **", None),
+    ]
+
+
+def test_parse_table():
+    text = "| Name | Pipe \\| |\n|:-----|---:|\n| **kale** | 1 |\n| chard |\n"
+    (table,) = parse_markdown(text)
+
+    assert table.table.table_width == 2  # type: ignore
+    assert table.table.has_column_header  # type: ignore
+    rows = [
+        [plain_text(cell) for cell in row.table_row.cells]  # type: ignore
+        for row in table.table.children  # type: ignore
+    ]
+    assert rows == [["Name", "Pipe |"], ["kale", "1"], ["chard", ""]]
+    assert "".join(iter_markdown([table])).startswith("| Name | Pipe \\| |\n")
+
+    # without a delimiter row the lines are a paragraph
+    (paragraph,) = parse_markdown("| not | a table |\nafter")
+    assert plain_text(paragraph.paragraph.rich_text) == "| not | a table | after"  # type: ignore
+
+
+def test_long_text_is_split():
+    (block,) = parse_markdown("x" * (MAX_TEXT * 2 + 1))
+
+    runs = block.paragraph.rich_text  # type: ignore
+    assert [len(run.text.content) for run in runs] == [MAX_TEXT, MAX_TEXT, 1]
+
+
+def test_plan_batches_limits():
+    many = parse_markdown("\n\n".join(f"paragraph {i}" for i in range(250)))
+    assert [len(batch.blocks.root) for batch in plan_batches(many)] == [100, 100, 50]
+
+    # a list item with more children than one request allows has them deferred
+    wide = parse_markdown("- parent\n" + "".join(f"  - {i}\n" for i in range(150)))
+    (batch,) = plan_batches(wide)
+    assert batch.blocks.root[0].bulleted_list_item.children is None  # type: ignore
+    assert len(batch.deferred[0]) == 150  # type: ignore
+
+    # subtrees deeper than the nesting limit are deferred too
+    deep = parse_markdown("- a\n  - b\n    - c\n      - d\n")
+    (batch,) = plan_batches(deep)
+    assert batch.deferred == [deep[0].bulleted_list_item.children]  # type: ignore
+
+
+def test_plan_batches_long_table():
+    text = "| n |\n| - |\n" + "".join(f"| {i} |\n" for i in range(150))
+    (batch,) = plan_batches(parse_markdown(text))
+
+    # a table is created with its first rows and the rest appended to it
+    assert len(batch.blocks.root[0].table.children) == MAX_CHILDREN  # type: ignore
+    assert len(batch.deferred[0]) == 151 - MAX_CHILDREN  # type: ignore
+
+
+def test_plan_batches_total():
+    # ten items with 99 children each fill a request of MAX_BLOCKS
+    assert MAX_BLOCKS == 10 * MAX_CHILDREN
+    text = "".join(
+        f"- item {i}\n" + "".join(f"  - {j}\n" for j in range(99)) for i in range(11)
+    )
+    batches = list(plan_batches(parse_markdown(text)))
+
+    assert [len(batch.blocks.root) for batch in batches] == [10, 1]
+    assert all(deferred is None for deferred in batches[0].deferred)
+
+
+def test_upload(fake_async_client):
+    client = fake_async_client({}, delay=0.01)
+    wide = "".join(f"- item {i}\n" + "  - deep\n" * 150 for i in range(3))
+    blocks = parse_markdown(DOCUMENT + wide)
+
+    calls = asyncio.run(Uploader(client, concurrency=3).upload("page", blocks))
+
+    # one call for the document, then one for each deferred list of children
+    assert calls == len(client.appends) == 1 + 3 * 2
+    assert client.max_in_flight == 3
+    assert len(client.children["page"]) == len(blocks)
@@ -0,0 +1,178 @@
+"""
+Test exporting and importing pages and block trees as ndjson.
+"""
+
+import json
+
+import pytest
+
+from notion_data.__main__ import main
+from notion_data.fake_server import FakeNotion
+from notion_data.ndjson import export_pages, import_pages
+
+PARENT_ID = "20276f6f-26c3-40c5-8581-ad12cff73f8e"
+
+
+@pytest.fixture
+def workspace(data_folder, make_block):
+    """Two pages, the first with a nested tree of blocks"""
+    page1 = json.loads((data_folder / "page1.json").read_text())
+    page2 = json.loads((data_folder / "page2.json").read_text())
+    toggle = make_block("toggle", True, "toggle")
+    inner = make_block("inner", True, "toggle")
+    children = {
+        page1["id"]: [make_block("first"), toggle, make_block("last")],
+        toggle["id"]: [inner] + [make_block(f"child {i}") for i in range(3)],
+        inner["id"]: [make_block("innermost")],
+    }
+    return children, {page1["id"]: page1, page2["id"]: page2}
+
+
+def texts(client, block_id):
+    """Nested lists of the text of a block tree held by a fake client"""
+    result = []
+    for block in client.children.get(block_id, []):
+        content = block[block["type"]]["rich_text"][0]["text"]["content"]
+        result.append(content)
+        if block["id"] in client.children:
+            result.append(texts(client, block["id"]))
+    return result
+
+
+def test_export_import(tmp_path, workspace, fake_client):
+    source = fake_client(*workspace)
+    page_ids = list(source.page_data)
+    path = tmp_path / "export.ndjson.gz"
+
+    assert export_pages(source, page_ids, path) == 10
+
+    target = fake_client({})
+    assert import_pages(target, path, parent_id=PARENT_ID) == 10
+
+    new_ids = list(target.page_data)
+    assert len(new_ids) == 2
+    new_page = target.page_data[new_ids[0]]
+    assert new_page["parent"] == {"type": "page_id", "page_id": PARENT_ID}
+    assert list(new_page["properties"]) == ["title"]
+    assert texts(target, new_ids[0]) == texts(source, page_ids[0])
+    # siblings without children in between are appended together
+    assert [count for _, count in target.appends] == [2, 1, 1, 3, 1]
+
+
+def test_export_resume(tmp_path, workspace, fake_client):
+    source = fake_client(*workspace)
+    page_ids = list(source.page_data)
+    path = tmp_path / "export.ndjson"
+    checkpoint = tmp_path / "export.checkpoint"
+
+    export_pages(source, page_ids[:1], path, checkpoint)
+    with path.open("a") as f:
+        f.write('{"kind": "page", "partial')
+
+    assert export_pages(source, page_ids, path, checkpoint) == 1
+    lines = path.read_text().splitlines()
+    assert len(lines) == 10
+    assert [json.loads(line)["kind"] for line in lines].count("page") == 2
+
+
+def test_import_resume(tmp_path, workspace, fake_client):
+    path = tmp_path / "export.ndjson"
+    checkpoint = tmp_path / "import.checkpoint"
+    source = fake_client(*workspace)
+    page_ids = list(source.page_data)
+    export_pages(source, page_ids[:1], path)
+
+    target = fake_client({})
+    append = target.blocks.children.append
+
+    def failing_append(block_id, children):
+        if len(target.appends) == 2:
+            raise ConnectionError("lost connection")
+        return append(block_id=block_id, children=children)
+
+    target.blocks.children.append = failing_append
+    with pytest.raises(ConnectionError):
+        import_pages(target, path, PARENT_ID, checkpoint)
+
+    target.blocks.children.append = append
+    import_pages(target, path, PARENT_ID, checkpoint)
+
+    new_id = list(target.page_data)[0]
+    assert texts(target, new_id) == texts(source, page_ids[0])
+
+
+def types(fake, block_id):
+    """Nested lists of the types of a block tree held by a FakeNotion"""
+    result = []
+    for child in fake.children.get(block_id, []):
+        result.append(fake.blocks[child]["type"])
+        if child in fake.children:
+            result.append(types(fake, child))
+    return result
+
+
+def test_import_skips_read_only(tmp_path, data_folder, make_block, fake_client):
+    page = json.loads((data_folder / "page1.json").read_text())
+    child_page = make_block("child")
+    del child_page["paragraph"]
+    child_page.update(type="child_page", child_page={"title": "child"})
+    children = {page["id"]: [make_block("first"), child_page, make_block("last")]}
+    path = tmp_path / "export.ndjson"
+    export_pages(fake_client(children, {page["id"]: page}), [page["id"]], path)
+
+    target = fake_client({})
+    assert import_pages(target, path, PARENT_ID) == 3
+
+    (new_id,) = target.page_data
+    assert target.appends == [(new_id, 2)]
+    assert [block["type"] for block in target.children[new_id]] == ["paragraph"] * 2
+
+
+def test_import_tables_and_columns(tmp_path, data_folder, make_block):
+    """Tables and columns are created with their children in one request"""
+    page = json.loads((data_folder / "page1.json").read_text())
+    cell = [{"type": "text", "text": {"content": "cell"}, "plain_text": "cell"}]
+    table = {
+        "type": "table",
+        "table": {
+            "table_width": 1,
+            "has_column_header": False,
+            "has_row_header": False,
+            "children": [{"type": "table_row", "table_row": {"cells": [cell]}}] * 3,
+        },
+    }
+    toggle = make_block("toggle", True, "toggle")
+    toggle["toggle"]["children"] = [make_block("inside")]
+    columns = {
+        "type": "column_list",
+        "column_list": {
+            "children": [
+                {"type": "column", "column": {"children": [toggle]}},
+                {"type": "column", "column": {"children": [make_block("right")]}},
+            ]
+        },
+    }
+    source = FakeNotion()
+    source.add(page)
+    for block in (make_block("first"), table, columns, make_block("last")):
+        source.add(block, page["id"])
+    path = tmp_path / "export.ndjson"
+    assert export_pages(source.client(), [page["id"]], path) == 13
+
+    target = FakeNotion()
+    assert import_pages(target.client(), path, PARENT_ID) == 13
+
+    (new_id,) = target.pages
+    assert types(target, new_id) == types(source, page["id"])
+    # the toggle's child is appended once the columns have been created
+    assert target.calls["PATCH blocks/{id}/children"] == 2
+
+
+def test_cli_export(tmp_path, workspace, fake_client, monkeypatch):
+    source = fake_client(*workspace)
+    monkeypatch.setattr("notion_data.__main__._client", lambda: source)
+    path = tmp_path / "cli.ndjson"
+
+    main(["export", *source.page_data, "-o", str(path)])
+
+    assert len(path.read_text().splitlines()) == 10
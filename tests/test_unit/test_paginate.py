@@ -0,0 +1,141 @@
+"""
+Test walking the cursor of paginated api calls.
+"""
+
+import asyncio
+import copy
+import json
+import uuid
+
+import pytest
+
+from notion_data.fake_server import FakeNotion
+from notion_data.page import Page, Pages, database_page_model
+from notion_data.paginate import aiter_blocks, aiter_query, iter_blocks, iter_query
+
+
+def test_iter_blocks(fake_client, make_block):
+    blocks = [make_block(f"block {i}") for i in range(25)]
+    client = fake_client({"page": blocks})
+
+    results = list(iter_blocks(client, "page", page_size=10))
+
+    assert [b.paragraph.rich_text[0].text.content for b in results] == [
+        f"block {i}" for i in range(25)
+    ]
+    assert client.calls == [("page", None), ("page", "10"), ("page", "20")]
+
+
+def test_iter_blocks_stops_early(fake_client, make_block):
+    blocks = [make_block(f"block {i}") for i in range(25)]
+    client = fake_client({"page": blocks})
+
+    for block in iter_blocks(client, "page", page_size=10):
+        assert block.type == "paragraph"
+        break
+
+    # only the first page and the prefetch of the second have been requested
+    assert client.calls == [("page", None), ("page", "10")]
+
+
+def test_aiter_blocks(fake_async_client, make_block):
+    blocks = [make_block(f"block {i}") for i in range(25)]
+    client = fake_async_client({"page": blocks})
+
+    async def collect():
+        return [b async for b in aiter_blocks(client, "page", page_size=10)]
+
+    results = asyncio.run(collect())
+
+    assert len(results) == 25
+    assert results[-1].paragraph.rich_text[0].text.content == "block 24"
+    assert len(client.calls) == 3
+
+
+DATA_SOURCE_ID = "3e5f6a7b-1c2d-4e5f-8a9b-0c1d2e3f4a5b"
+
+
+@pytest.fixture
+def rows(data_folder):
+    """25 live rows of a data source, edited a minute apart"""
+    template = json.loads((data_folder / "page2.json").read_text())
+    template.update(archived=False, in_trash=False)
+    template["parent"] = {
+        "type": "data_source_id",
+        "data_source_id": DATA_SOURCE_ID,
+        "database_id": template["parent"]["database_id"],
+    }
+    pages = {}
+    for minute in range(25):
+        page = copy.deepcopy(template)
+        page["id"] = str(uuid.UUID(int=minute + 1))
+        page["last_edited_time"] = f"2024-01-01T00:{minute:02}:00.000Z"
+        pages[page["id"]] = page
+    return pages
+
+
+@pytest.fixture
+def fake(rows):
+    fake = FakeNotion()
+    for page in rows.values():
+        fake.add(page)
+    return fake
+
+
+def test_iter_query(fake):
+    since = {"on_or_after": "2024-01-01T00:05:00Z"}
+    filter = {"timestamp": "last_edited_time", "last_edited_time": since}
+    sorts = [{"timestamp": "last_edited_time", "direction": "descending"}]
+
+    pages = list(
+        iter_query(
+            fake.client(retry=False),
+            DATA_SOURCE_ID,
+            filter=filter,
+            sorts=sorts,
+            page_size=10,
+        )
+    )
+
+    assert len(pages) == 20
+    assert all(isinstance(page, Page) for page in pages)
+    assert pages[0].last_edited_time > pages[-1].last_edited_time  # type: ignore
+    assert pages[0].parent.data_source_id == DATA_SOURCE_ID  # type: ignore
+    assert fake.calls["POST data_sources/{id}/query"] == 2
+
+
+def test_aiter_query_model(fake):
+    schema = {
+        "Due date": {"type": "date"},
+        "Status": {"type": "status"},
+        "Title": {"type": "title"},
+    }
+    model = database_page_model(schema)
+
+    async def collect():
+        client = fake.async_client(retry=False)
+        query = aiter_query(client, DATA_SOURCE_ID, model=model)
+        return [page async for page in query]
+
+    pages = asyncio.run(collect())
+
+    assert len(pages) == 25
+    assert pages[0].properties.Title.title[0].plain_text == "Bug bash"
+    assert pages[0].properties.Status.status.name == "Not started"
+    assert fake.calls["POST data_sources/{id}/query"] == 1
+
+
+def test_pages_model(rows):
+    response = {
+        "object": "list",
+        "type": "page_or_data_source",
+        "page_or_data_source": {},
+        "results": list(rows.values())[:2],
+        "next_cursor": "abc",
+        "has_more": True,
+    }
+
+    pages = Pages(**response)
+
+    assert [page.id for page in pages.results] == list(rows)[:2]
+    assert pages.has_more and pages.next_cursor == "abc"
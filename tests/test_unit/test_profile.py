@@ -0,0 +1,54 @@
+"""
+Test profiling validation and serialization per model class.
+"""
+
+import json
+
+from notion_data.block import Block, Blocks
+from notion_data.page import Page
+from notion_data.profile import Profiler
+
+
+def test_blocks(make_block):
+    data = json.dumps({"results": [make_block(f"block {i}") for i in range(5)]})
+    profiler = Profiler()
+
+    blocks = profiler.validator(Blocks).validate_json(data)
+    dumped = profiler.serializer(Blocks).to_json(blocks, by_alias=True)
+
+    assert blocks == Blocks.model_validate_json(data)
+    assert dumped == blocks.model_dump_json(by_alias=True).encode()
+    stats = profiler.stats
+    assert stats["Blocks"].validations == stats["Blocks"].serializations == 1
+    assert stats["Paragraph"].validations == 5
+    assert stats["TextObject"].serializations == 5
+    # the time of the nested models is left out of the self time
+    assert stats["Blocks"].validate_self < stats["Blocks"].validate_time
+    assert stats["Blocks"].validate_time >= stats["Paragraph"].validate_time
+
+
+def test_dynamic_properties(data_folder):
+    data = json.loads((data_folder / "page2.json").read_text())
+    profiler = Profiler()
+
+    page = profiler.validator(Page).validate_python(data)
+    profiler.serializer(Page).to_python(page)
+    Page(**data)
+
+    assert profiler.stats["properties"].validations == 1
+    assert profiler.stats["properties"].serializations == 1
+
+
+def test_report_and_flush(make_block):
+    flushed = []
+    profiler = Profiler(callback=flushed.append)
+    profiler.validator(Block).validate_python(make_block("hello", type="quote"))
+
+    lines = profiler.report(sort="validations").splitlines()
+    assert lines[0].split()[:2] == ["model", "validations"]
+    assert {line.split()[0] for line in lines[1:]} >= {"Quote", "TextObject"}
+
+    stats = profiler.flush()
+    assert flushed == [stats]
+    assert stats["Quote"].validations == 1
+    assert profiler.stats == {}
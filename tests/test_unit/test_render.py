@@ -0,0 +1,88 @@
+"""
+Test rendering block trees as plain text and Markdown.
+"""
+
+import json
+
+from notion_data.block import Block
+from notion_data.render import iter_markdown, iter_text
+
+
+def load_blocks(data_folder, make_block):
+    code = json.loads((data_folder / "code.json").read_text())
+    row = json.loads((data_folder / "table.json").read_text())
+    heading = json.loads((data_folder / "block.json").read_text())
+    heading["heading_2"]["rich_text"][0]["annotations"]["bold"] = True
+    table = {
+        "type": "table",
+        "table": {
+            "table_width": 3,
+            "has_column_header": True,
+            "has_row_header": False,
+            "children": [row, row],
+        },
+    }
+    toggle = make_block("Toggle", True, "toggle")
+    toggle["toggle"]["children"] = [make_block("Hidden")]
+    bullet = make_block("Bullet", True, "bulleted_list_item")
+    bullet["bulleted_list_item"]["children"] = [make_block("Sub", False, "to_do")]
+    blocks = [
+        heading,
+        make_block("First", type="numbered_list_item"),
+        make_block("Second", type="numbered_list_item"),
+        bullet,
+        code,
+        table,
+        toggle,
+    ]
+    return [Block.validate_python(block) for block in blocks]
+
+
+def test_markdown(data_folder, make_block):
+    blocks = load_blocks(data_folder, make_block)
+
+    markdown = "".join(iter_markdown(blocks))
+
+    assert markdown == (
+        "## **Lacinato kale**\n"
+        "\n"
+        "1. First\n"
+        "2. Second\n"
+        "- Bullet\n"
+        "  - [ ] Sub\n"
+        "\n"
+        "```javascript\n"
+        "const a = 3\n"
+        "```\n"
+        "\n"
+        "| column 1 content | column 2 content | column 3 content |\n"
+        "| --- | --- | --- |\n"
+        "| column 1 content | column 2 content | column 3 content |\n"
+        "\n"
+        "<details>\n"
+        "<summary>Toggle</summary>\n"
+        "\n"
+        "Hidden\n"
+        "\n"
+        "</details>\n"
+    )
+
+
+def test_text(data_folder, make_block):
+    blocks = load_blocks(data_folder, make_block)
+
+    lines = list(iter_text(blocks))
+
+    assert lines[0] == "Lacinato kale\n"
+    assert "const a = 3\n" in lines
+    assert "column 1 content\tcolumn 2 content\tcolumn 3 content\n" in lines
+    assert lines[-2:] == ["Toggle\n", "  Hidden\n"]
+
+
+def test_render_streams(make_block):
+    def blocks():
+        for i in range(3):
+            yield Block.validate_python(make_block(f"block {i}"))
+        raise AssertionError("read past the first block")
+
+    assert next(iter_markdown(blocks())) == "block 0\n"
@@ -0,0 +1,157 @@
+"""
+Test scheduling requests within the rate limits of the API.
+"""
+
+import asyncio
+import json
+import time
+
+import httpx
+import pytest
+
+from notion_data.client import RawClient
+from notion_data.page import Page
+from notion_data.scheduler import (
+    AsyncRateLimitTransport,
+    Priority,
+    RateLimitTransport,
+    Scheduler,
+)
+
+
+class StubServer:
+    """An httpx handler that answers with a queue of statuses, then 200"""
+
+    def __init__(self, *statuses: int, retry_after: str | None = None, body=None):
+        self.statuses = list(statuses)
+        self.retry_after = retry_after
+        self.body = body or {"object": "list", "results": []}
+        self.requests: list[httpx.Request] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        status = self.statuses.pop(0) if self.statuses else 200
+        if status == 429:
+            headers = {"retry-after": self.retry_after} if self.retry_after else {}
+            error = {"object": "error", "status": 429, "code": "rate_limited"}
+            return httpx.Response(429, json=error, headers=headers)
+        if status != 200:
+            return httpx.Response(status, json={"object": "error", "status": status})
+        return httpx.Response(200, json=self.body)
+
+
+def _client(scheduler: Scheduler, server: StubServer) -> httpx.Client:
+    transport = RateLimitTransport(scheduler, httpx.MockTransport(server))
+    return httpx.Client(transport=transport, base_url="https://api.notion.com/v1/")
+
+
+def test_token_bucket_rate():
+    scheduler = Scheduler(rate=20, burst=2)
+    client = _client(scheduler, StubServer())
+
+    start = time.monotonic()
+    for _ in range(8):
+        client.get("users")
+    elapsed = time.monotonic() - start
+
+    # two requests go in the burst and the other six wait for tokens
+    assert elapsed >= 6 / 20 * 0.9
+    assert scheduler.metrics.requests == 8
+
+
+def test_retry_after():
+    scheduler = Scheduler(rate=100, backoff=0.01)
+    server = StubServer(429, 429, retry_after="0.1")
+    client = _client(scheduler, server)
+
+    start = time.monotonic()
+    response = client.get("users")
+
+    assert response.status_code == 200
+    assert time.monotonic() - start >= 0.2
+    assert len(server.requests) == 3
+    assert scheduler.metrics.throttled == scheduler.metrics.retries == 2
+
+
+def test_server_errors():
+    scheduler = Scheduler(rate=100, backoff=0.01, max_retries=2)
+
+    # idempotent requests are retried up to max_retries times
+    server = StubServer(500, 503, 502)
+    assert _client(scheduler, server).get("users").status_code == 502
+    assert len(server.requests) == 3
+
+    # other requests could have had side effects, so they are not retried
+    server = StubServer(500)
+    assert _client(scheduler, server).post("pages", json={}).status_code == 500
+    assert len(server.requests) == 1
+
+
+def test_priority():
+    scheduler = Scheduler(rate=50, burst=1)
+    server = StubServer()
+    transport = AsyncRateLimitTransport(scheduler, httpx.MockTransport(server))
+
+    async def fetch(client: httpx.AsyncClient, path: str, priority: Priority):
+        with scheduler.priority(priority):
+            await client.get(path)
+
+    async def main():
+        async with httpx.AsyncClient(
+            transport=transport, base_url="https://api.notion.com/v1/"
+        ) as client:
+            low = [
+                asyncio.create_task(fetch(client, f"low/{i}", Priority.LOW))
+                for i in range(5)
+            ]
+            await asyncio.sleep(0)
+            high = asyncio.create_task(fetch(client, "high", Priority.HIGH))
+            await asyncio.gather(*low, high)
+
+    asyncio.run(main())
+
+    # the first low request took the only token before the high one arrived
+    paths = [request.url.path.rsplit("/", 1)[-1] for request in server.requests]
+    assert paths[:2] == ["0", "high"]
+    assert scheduler.metrics.max_queue_depth >= 5
+    assert scheduler.metrics.queue_depth == 0
+    assert len(scheduler.metrics.latencies) == 6
+    assert scheduler.metrics.latency(50) <= scheduler.metrics.latency(100)
+
+
+def test_cancelled_wait():
+    """A cancelled request leaves the queue rather than blocking it"""
+    scheduler = Scheduler(rate=10, burst=1)
+
+    async def main():
+        await scheduler.acquire_async()
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(scheduler.acquire_async(), 0.01)
+        assert scheduler.metrics.queue_depth == 0
+        await asyncio.wait_for(scheduler.acquire_async(), 1)
+
+    asyncio.run(main())
+
+
+def test_callback():
+    published = []
+    scheduler = Scheduler(rate=100, callback=published.append)
+    client = _client(scheduler, StubServer())
+
+    client.get("users")
+    client.get("users")
+
+    assert published == [scheduler.metrics] * 2
+    assert scheduler.metrics.requests == 2
+
+
+def test_raw_client(data_folder):
+    page = json.loads((data_folder / "page1.json").read_text())
+    scheduler = Scheduler(rate=100, backoff=0.01)
+    server = StubServer(429, retry_after="0", body=page)
+    client = RawClient(auth="secret", client=_client(scheduler, server))
+
+    result = Page.from_json_bytes(client.pages.retrieve(page_id=page["id"]))
+
+    assert result.id == page["id"]
+    assert scheduler.metrics.throttled == 1
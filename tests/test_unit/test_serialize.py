@@ -0,0 +1,69 @@
+"""
+Test serializing models for the Notion write API.
+"""
+
+import json
+import warnings
+
+from notion_data.block import Paragraph
+from notion_data.page import Page
+from notion_data.rich_text import TextObject
+from notion_data.root import Root, notion_dict, notion_json, null_for_notion
+
+
+def test_none_defaults_dropped():
+    text = TextObject(text=TextObject._TextObjectData(content="hi", link=None))
+    block = Paragraph(
+        type="paragraph",
+        paragraph=Paragraph._ParagraphData(rich_text=[text], children=None),
+    )
+    # setting None marks the fields as set, so a plain dump sends nulls
+    assert block.model_dump(by_alias=True, exclude_unset=True)["paragraph"] == {
+        "rich_text": [{"text": {"content": "hi", "link": None}}],
+        "children": None,
+    }
+
+    assert json.loads(notion_json(block)) == {
+        "type": "paragraph",
+        "paragraph": {"rich_text": [{"text": {"content": "hi"}}]},
+    }
+    # the model is not changed
+    assert "children" in block.paragraph.model_fields_set
+
+
+def test_notion_dict():
+    text = TextObject(text=TextObject._TextObjectData(content="hi", link=None))
+
+    assert notion_dict(text) == {"text": {"content": "hi"}}
+    # other serialization is unchanged afterwards
+    assert text.model_dump(exclude_unset=True) == {
+        "text": {"content": "hi", "link": None}
+    }
+
+
+def test_page_properties(data_folder):
+    page = Page(**json.loads((data_folder / "page2.json").read_text()))
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        data = notion_dict(page)
+        dumped = page.model_dump(mode="json", by_alias=True, exclude_unset=True)
+
+    assert data["properties"]["Due date"]["date"] == {"start": "2023-02-23T00:00:00"}
+    assert "cover" not in data
+    assert dumped["properties"]["Due date"]["date"]["end"] is None
+
+
+def _subclasses(cls: type[Root]) -> list[type[Root]]:
+    subclasses = [cls]
+    for direct in cls.__subclasses__():
+        subclasses.extend(_subclasses(direct))
+    return subclasses
+
+
+def test_none_defaults_declared_optional():
+    """Every field that defaults to None is left out of notion_json when None"""
+    for model in _subclasses(Root):
+        for name, field in model.model_fields.items():
+            if field.default is None:
+                assert field.exclude_if is null_for_notion, f"{model.__name__}.{name}"
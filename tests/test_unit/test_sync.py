@@ -0,0 +1,100 @@
+"""
+Test incremental sync of databases into SQLite.
+"""
+
+import copy
+import json
+import uuid
+
+import pytest
+from notion_client import APIResponseError
+
+from notion_data.fake_server import FakeNotion
+from notion_data.sync import DatabaseSync
+
+DATA_SOURCE_ID = "3e5f6a7b-1c2d-4e5f-8a9b-0c1d2e3f4a5b"
+
+
+@pytest.fixture
+def rows(data_folder):
+    """Five live rows of a data source, edited a minute apart"""
+    template = json.loads((data_folder / "page2.json").read_text())
+    template.update(archived=False, in_trash=False)
+    template["parent"] = {
+        "type": "data_source_id",
+        "data_source_id": DATA_SOURCE_ID,
+        "database_id": template["parent"]["database_id"],
+    }
+    pages = {}
+    for minute in range(5):
+        page = copy.deepcopy(template)
+        page["id"] = str(uuid.UUID(int=minute + 1))
+        page["last_edited_time"] = f"2024-01-01T00:0{minute}:00.000Z"
+        pages[page["id"]] = page
+    return pages
+
+
+@pytest.fixture
+def fake(rows):
+    fake = FakeNotion()
+    for page in rows.values():
+        fake.add(page)
+    return fake
+
+
+def test_sync(tmp_path, fake, rows):
+    # a row of another data source in the same database is not synced
+    other = copy.deepcopy(next(iter(rows.values())))
+    other["parent"]["data_source_id"] = str(uuid.UUID(int=99))
+    fake.add({**other, "id": None})
+    sync = DatabaseSync(fake.client(retry=False), tmp_path / "sync.db", page_size=2)
+
+    result = sync.sync(DATA_SOURCE_ID)
+    assert (result.upserted, result.removed) == (5, 0)
+    assert result.watermark == "2024-01-01T00:04:00+00:00"
+    assert len(sync.pages(DATA_SOURCE_ID)) == 5
+
+    # only the rows edited since the watermark are fetched and stored
+    ids = list(fake.pages)
+    fake.pages[ids[1]]["last_edited_time"] = "2024-01-01T00:10:00.000Z"
+    fake.pages[ids[2]].update(
+        last_edited_time="2024-01-01T00:11:00.000Z", archived=True
+    )
+    fake.calls.clear()
+    result = sync.sync(DATA_SOURCE_ID.replace("-", ""))
+
+    assert (result.upserted, result.removed) == (2, 1)
+    assert result.watermark == "2024-01-01T00:11:00+00:00"
+    assert fake.calls["POST data_sources/{id}/query"] == 2
+    assert sync.page(ids[2]) is None
+    assert [page.id for page in sync.pages(DATA_SOURCE_ID)][-1] == ids[1]
+
+
+def test_restart_and_reconcile(tmp_path, fake, monkeypatch):
+    client = fake.client(retry=False)
+    path = tmp_path / "sync.db"
+    sync = DatabaseSync(client, path, page_size=2)
+
+    # a sync that fails part way keeps the rows stored before the failure
+    respond = fake.respond
+
+    def fail_later_pages(request):
+        if b"start_cursor" in request.content:
+            fake.fail_next(503)
+        return respond(request)
+
+    monkeypatch.setattr(fake, "respond", fail_later_pages)
+    with pytest.raises(APIResponseError):
+        sync.sync(DATA_SOURCE_ID)
+    assert sync.watermark(DATA_SOURCE_ID) == "2024-01-01T00:01:00+00:00"
+    sync.close()
+
+    monkeypatch.undo()
+    sync = DatabaseSync(client, path, page_size=2)
+    assert sync.sync(DATA_SOURCE_ID).upserted == 4
+
+    # trashed rows are left out of queries, so only reconcile notices them
+    fake.pages[next(iter(fake.pages))]["in_trash"] = True
+    assert sync.sync(DATA_SOURCE_ID).removed == 0
+    assert sync.reconcile(DATA_SOURCE_ID) == 1
+    assert len(sync.pages(DATA_SOURCE_ID)) == 4
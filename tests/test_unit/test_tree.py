@@ -0,0 +1,75 @@
+"""
+Test indexing block trees.
+"""
+
+import uuid
+
+import pytest
+
+from notion_data.block import Block, get_children
+from notion_data.tree import BlockTree
+
+
+@pytest.fixture
+def tree(make_block):
+    """A toggle holding a paragraph holding a child page, then a paragraph"""
+    page = make_block("page")
+    del page["paragraph"]
+    page.update(type="child_page", child_page={"title": "page"})
+    paragraph = make_block("inner", has_children=True)
+    paragraph["paragraph"]["children"] = [page]
+    toggle = make_block("toggle", has_children=True, type="toggle")
+    toggle["toggle"]["children"] = [paragraph]
+    blocks = [Block.validate_python(toggle), Block.validate_python(make_block("end"))]
+    return BlockTree(blocks)
+
+
+def test_lookups(tree):
+    toggle, end = tree.blocks
+    (paragraph,) = get_children(toggle)
+    (page,) = get_children(paragraph)
+
+    assert len(tree) == 4
+    assert tree.get(page.id.replace("-", "")) is page
+    assert tree.parent(page.id) is paragraph
+    assert tree.parent(toggle.id) is None
+    assert tree.ancestors(page.id) == [paragraph, toggle]
+    assert tree.depth(page.id) == 2
+    assert tree.of_type("child_page") == [page]
+    assert tree.of_type("paragraph", "toggle") == [paragraph, end, toggle]
+    assert list(tree) == [toggle, paragraph, page, end]
+    assert end.id in tree
+
+
+def test_insert_and_delete(tree, make_block):
+    toggle, end = tree.blocks
+    new = Block.validate_python(make_block("new"))
+
+    tree.insert(new, end.id)
+    assert get_children(end) == [new] and end.has_children
+    assert tree.depth(new.id) == 1
+    assert tree.ancestors(new.id) == [end]
+
+    first = Block.validate_python(make_block("first"))
+    tree.insert(first, index=0)
+    assert tree.blocks[0] is first and tree.depth(first.id) == 0
+    with pytest.raises(ValueError):
+        tree.insert(first)
+
+    (paragraph,) = get_children(toggle)
+    assert tree.delete(paragraph.id) is paragraph
+    assert get_children(toggle) == [] and not toggle.has_children
+    assert tree.of_type("child_page") == []
+    assert len(tree) == 4
+    with pytest.raises(KeyError):
+        tree.node(paragraph.id)
+
+
+def test_cannot_hold_children(tree, make_block, data_folder):
+    code = Block.validate_json((data_folder / "code.json").read_text())
+    code.id = str(uuid.uuid4())
+    tree.insert(code)
+
+    with pytest.raises(ValueError):
+        tree.insert(Block.validate_python(make_block("x")), code.id)
+    assert len(tree) == 5